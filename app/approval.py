@@ -1,6 +1,10 @@
-from dataclasses import dataclass, field
+from bisect import bisect_right
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from enum import Enum
+from threading import Lock
+from typing import Callable, ContextManager, Iterable, Iterator, Protocol
 
 from .messaging import MessageDraft
 
@@ -23,18 +27,64 @@ class DraftApproval:
     reviewed_at: datetime | None = None
 
 
+ApprovalListener = Callable[[str, list[DraftApproval]], None]
+
+
+class ApprovalBackend(Protocol):
+    def load(self) -> list[DraftApproval]:
+        """Return the persisted revisions in revision order."""
+
+    def save(self, items: list[DraftApproval]) -> None:
+        ...
+
+    def delete(self, revision_ids: list[int]) -> None:
+        ...
+
+    def transaction(self) -> ContextManager[None]:
+        """Hold the write lock shared with other processes; the workflow replays ``changes`` first."""
+
+    def changes(self) -> tuple[list[DraftApproval], list[int]]:
+        """Revisions saved and ids deleted by other processes since the previous call."""
+
+
 class ApprovalWorkflow:
     """PRD Step 4: require human approval before send."""
 
-    def __init__(self) -> None:
+    def __init__(self, backend: ApprovalBackend | None = None) -> None:
+        self._lock = Lock()
         self._next_revision_id = 1
         self._items: dict[int, DraftApproval] = {}
+        self._by_lead: dict[int, list[int]] = {}
+        self._approved_by_lead: dict[int, int] = {}
+        self._pending: set[int] = set()
+        # Submission-ordered revision ids; reviewed ids are skipped lazily and compacted away.
+        self._pending_order: list[int] = []
+        self._pending_head = 0
+        self._listeners: list[ApprovalListener] = []
+        self._backend = backend
+        if backend is not None:
+            self._apply_saved(backend.load())
+
+    def subscribe(self, listener: ApprovalListener) -> None:
+        """Call ``listener`` with ``"submitted"``/``"reviewed"``/``"removed"`` batches, replaying history first."""
+        with self._lock:
+            items = list(self._items.values())
+            if items:
+                listener("submitted", items)
+                reviewed = [item for item in items if item.status != ApprovalStatus.PENDING]
+                if reviewed:
+                    listener("reviewed", reviewed)
+            self._listeners.append(listener)
 
     def submit(self, lead_id: int, draft: MessageDraft) -> DraftApproval:
-        item = DraftApproval(lead_id=lead_id, revision_id=self._next_revision_id, draft=draft)
-        self._items[item.revision_id] = item
-        self._next_revision_id += 1
-        return item
+        with self._lock, self._transaction():
+            item = DraftApproval(lead_id=lead_id, revision_id=self._next_revision_id, draft=draft)
+            if self._backend is not None:
+                self._backend.save([item])
+            self._add(item)
+            for listener in self._listeners:
+                listener("submitted", [item])
+            return item
 
     def review(
         self,
@@ -43,20 +93,194 @@ class ApprovalWorkflow:
         approve: bool,
         review_notes: str | None = None,
     ) -> DraftApproval:
-        item = self._items.get(revision_id)
-        if item is None:
-            raise ValueError(f"revision_id {revision_id} not found")
-        if item.status != ApprovalStatus.PENDING:
-            raise ValueError(f"revision_id {revision_id} already reviewed")
-
-        item.status = ApprovalStatus.APPROVED if approve else ApprovalStatus.REJECTED
-        item.reviewer = reviewer.strip()
-        item.review_notes = review_notes
-        item.reviewed_at = datetime.now(timezone.utc)
-        return item
+        return self.review_many([revision_id], reviewer, approve, review_notes)[0]
+
+    def review_many(
+        self,
+        revision_ids: Iterable[int],
+        reviewer: str,
+        approve: bool,
+        review_notes: str | None = None,
+    ) -> list[DraftApproval]:
+        """Apply one decision to many revisions; nothing changes unless every id is reviewable."""
+        with self._lock, self._transaction():
+            items: list[DraftApproval] = []
+            seen: set[int] = set()
+            for revision_id in revision_ids:
+                item = self._items.get(revision_id)
+                if item is None:
+                    raise ValueError(f"revision_id {revision_id} not found")
+                if item.status != ApprovalStatus.PENDING or revision_id in seen:
+                    raise ValueError(f"revision_id {revision_id} already reviewed")
+                seen.add(revision_id)
+                items.append(item)
+
+            decision = {
+                "status": ApprovalStatus.APPROVED if approve else ApprovalStatus.REJECTED,
+                "reviewer": reviewer.strip(),
+                "review_notes": review_notes,
+                "reviewed_at": datetime.now(timezone.utc),
+            }
+            # Persist first: a failed save must leave the in-memory revisions pending.
+            if self._backend is not None:
+                self._backend.save([replace(item, **decision) for item in items])
+            for item in items:
+                self._apply_review(item, **decision)
+            self._compact_pending_order()
+            for listener in self._listeners:
+                listener("reviewed", items)
+            return items
+
+    def remove_leads(self, lead_ids: Iterable[int]) -> list[DraftApproval]:
+        """Erase every revision of the given leads (drafts embed their name and company)."""
+        with self._lock, self._transaction():
+            revision_ids = [revision_id for lead_id in lead_ids for revision_id in self._by_lead.get(lead_id, ())]
+            removed = self._drop(revision_ids)
+            if removed:
+                if self._backend is not None:
+                    self._backend.delete(revision_ids)
+                for listener in self._listeners:
+                    listener("removed", removed)
+            return removed
+
+    def refresh(self) -> None:
+        """Apply revisions that other processes saved to or deleted from a shared backend."""
+        if self._backend is not None:
+            with self._lock:
+                self._apply_backend_changes()
 
     def is_send_allowed(self, lead_id: int) -> bool:
-        return any(
-            item.lead_id == lead_id and item.status == ApprovalStatus.APPROVED
-            for item in self._items.values()
-        )
+        return self._approved_by_lead.get(lead_id, 0) > 0
+
+    def approved_draft(self, lead_id: int) -> DraftApproval | None:
+        """The lead's most recently submitted approved revision, the one that gets sent."""
+        with self._lock:
+            for revision_id in reversed(self._by_lead.get(lead_id, ())):
+                item = self._items[revision_id]
+                if item.status == ApprovalStatus.APPROVED:
+                    return item
+            return None
+
+    def get(self, revision_id: int) -> DraftApproval | None:
+        return self._items.get(revision_id)
+
+    def list_approvals(self, lead_id: int | None = None) -> list[DraftApproval]:
+        with self._lock:
+            if lead_id is None:
+                return list(self._items.values())
+            return [self._items[revision_id] for revision_id in self._by_lead.get(lead_id, ())]
+
+    def pending_queue(self, limit: int = 50, after_revision_id: int | None = None) -> list[DraftApproval]:
+        """Oldest-first page of pending revisions; pass the last id seen to get the next page."""
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        with self._lock:
+            order = self._pending_order
+            if after_revision_id is None:
+                while self._pending_head < len(order) and order[self._pending_head] not in self._pending:
+                    self._pending_head += 1
+                index = self._pending_head
+            else:
+                index = bisect_right(order, after_revision_id)
+            page: list[DraftApproval] = []
+            while index < len(order) and len(page) < limit:
+                revision_id = order[index]
+                if revision_id in self._pending:
+                    page.append(self._items[revision_id])
+                index += 1
+            return page
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        if self._backend is None:
+            yield
+            return
+        with self._backend.transaction():
+            self._apply_backend_changes()
+            yield
+
+    def _apply_backend_changes(self) -> None:
+        saved, deleted_ids = self._backend.changes()
+        if not saved and not deleted_ids:
+            return
+        submitted, reviewed = self._apply_saved(saved)
+        for change, items in (("submitted", submitted), ("reviewed", reviewed), ("removed", self._drop(deleted_ids))):
+            if items:
+                for listener in self._listeners:
+                    listener(change, items)
+
+    def _apply_saved(self, saved: list[DraftApproval]) -> tuple[list[DraftApproval], list[DraftApproval]]:
+        submitted: list[DraftApproval] = []
+        reviewed: list[DraftApproval] = []
+        for item in sorted(saved, key=lambda item: item.revision_id):
+            current = self._items.get(item.revision_id)
+            if current is None:
+                self._add(item)
+                submitted.append(item)
+                if item.status != ApprovalStatus.PENDING:
+                    self._mark_reviewed(item)
+                    reviewed.append(item)
+            elif current.status == ApprovalStatus.PENDING and item.status != ApprovalStatus.PENDING:
+                self._apply_review(current, item.status, item.reviewer, item.review_notes, item.reviewed_at)
+                reviewed.append(current)
+        self._compact_pending_order()
+        return submitted, reviewed
+
+    def _add(self, item: DraftApproval) -> None:
+        self._items[item.revision_id] = item
+        self._by_lead.setdefault(item.lead_id, []).append(item.revision_id)
+        self._pending.add(item.revision_id)
+        self._pending_order.append(item.revision_id)
+        self._next_revision_id = max(self._next_revision_id, item.revision_id + 1)
+
+    def _apply_review(
+        self,
+        item: DraftApproval,
+        status: ApprovalStatus,
+        reviewer: str | None,
+        review_notes: str | None,
+        reviewed_at: datetime | None,
+    ) -> None:
+        item.status = status
+        item.reviewer = reviewer
+        item.review_notes = review_notes
+        item.reviewed_at = reviewed_at
+        self._mark_reviewed(item)
+
+    def _mark_reviewed(self, item: DraftApproval) -> None:
+        self._pending.discard(item.revision_id)
+        if item.status == ApprovalStatus.APPROVED:
+            self._approved_by_lead[item.lead_id] = self._approved_by_lead.get(item.lead_id, 0) + 1
+
+    def _drop(self, revision_ids: Iterable[int]) -> list[DraftApproval]:
+        removed: list[DraftApproval] = []
+        for revision_id in revision_ids:
+            item = self._items.pop(revision_id, None)
+            if item is None:
+                continue
+            removed.append(item)
+            self._pending.discard(revision_id)
+            revisions = self._by_lead[item.lead_id]
+            revisions.remove(revision_id)
+            if not revisions:
+                del self._by_lead[item.lead_id]
+            if item.status == ApprovalStatus.APPROVED:
+                approved = self._approved_by_lead[item.lead_id] - 1
+                if approved:
+                    self._approved_by_lead[item.lead_id] = approved
+                else:
+                    del self._approved_by_lead[item.lead_id]
+        if removed:
+            self._compact_pending_order()
+        return removed
+
+    def _compact_pending_order(self) -> None:
+        if len(self._pending_order) > 2 * len(self._pending) + 1_024:
+            self._pending_order = [rid for rid in self._pending_order if rid in self._pending]
+            self._pending_head = 0
@@ -1,10 +1,13 @@
+from collections import Counter
 from dataclasses import dataclass
+from threading import Lock
 
-from .approval import DraftApproval
-from .crm import CRMOutcomeRecord
-from .delivery import DeliveryEvent
-from .governance import AuditEvent
+from .approval import ApprovalStatus, ApprovalWorkflow, DraftApproval
+from .crm import CRMOutcomeRecord, CRMOutcomeSync
+from .delivery import DeliveryEvent, DeliveryTelemetry
+from .governance import AuditEvent, AuditLog
 from .models import Lead
+from .store import LeadStore
 
 
 @dataclass(slots=True)
@@ -19,7 +22,99 @@ class ComplianceSnapshot:
 
 
 class ComplianceReporter:
-    """Step 11: compliance posture snapshot for operational readiness checks."""
+    """Step 11: compliance posture snapshot for operational readiness checks.
+
+    ``build`` recounts the given collections. Once ``attach``-ed, the reporter
+    instead keeps per-action audit counters and totals from change notifications
+    and ``snapshot`` serves a cached result that is dropped on the next mutation.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._leads = 0
+        self._pending_approvals = 0
+        self._delivery_events = 0
+        self._crm_outcomes = 0
+        self._audit_events = 0
+        self._audit_actions: Counter[str] = Counter()
+        self._cached: ComplianceSnapshot | None = None
+
+    def attach(
+        self,
+        store: LeadStore,
+        approvals: ApprovalWorkflow,
+        delivery: DeliveryTelemetry,
+        crm: CRMOutcomeSync,
+        audit: AuditLog,
+    ) -> None:
+        store.subscribe(self.on_leads)
+        approvals.subscribe(self.on_approvals)
+        delivery.subscribe(self.on_delivery_events)
+        crm.subscribe(self.on_crm_outcomes)
+        audit.subscribe(self.on_audit_events)
+
+    def on_leads(self, change: str, leads: list[Lead]) -> None:
+        with self._lock:
+            if change == "added":
+                self._leads += len(leads)
+            elif change == "removed":
+                self._leads -= len(leads)
+            else:
+                return
+            self._cached = None
+
+    def on_approvals(self, change: str, approvals: list[DraftApproval]) -> None:
+        with self._lock:
+            if change == "submitted":
+                self._pending_approvals += len(approvals)
+            elif change == "reviewed":
+                self._pending_approvals -= len(approvals)
+            elif change == "removed":
+                self._pending_approvals -= sum(1 for item in approvals if item.status == ApprovalStatus.PENDING)
+            else:
+                return
+            self._cached = None
+
+    def on_delivery_events(self, change: str, events: list[DeliveryEvent]) -> None:
+        with self._lock:
+            if change == "recorded":
+                self._delivery_events += len(events)
+            elif change == "removed":
+                self._delivery_events -= len(events)
+            else:
+                return
+            self._cached = None
+
+    def on_crm_outcomes(self, change: str, records: list[CRMOutcomeRecord]) -> None:
+        with self._lock:
+            if change == "synced":
+                self._crm_outcomes += len(records)
+            elif change == "removed":
+                self._crm_outcomes -= len(records)
+            else:
+                return
+            self._cached = None
+
+    def on_audit_events(self, change: str, events: list[AuditEvent]) -> None:
+        with self._lock:
+            if change == "appended":
+                self._audit_events += len(events)
+                self._audit_actions.update(event.action for event in events)
+                self._cached = None
+
+    def snapshot(self) -> ComplianceSnapshot:
+        with self._lock:
+            if self._cached is None:
+                self._cached = ComplianceSnapshot(
+                    total_leads=self._leads,
+                    total_audit_events=self._audit_events,
+                    dsar_deletions_recorded=self._audit_actions["lead_deleted"],
+                    retention_runs_recorded=self._audit_actions["retention_policy_enforced"],
+                    pending_approvals=self._pending_approvals,
+                    delivery_events_total=self._delivery_events,
+                    crm_outcomes_total=self._crm_outcomes,
+                )
+            return self._cached
 
     def build(
         self,
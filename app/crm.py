@@ -1,6 +1,10 @@
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
+from threading import Lock
+from typing import Callable, Iterable
+
+from .store import LeadStore
 
 
 class OutcomeStatus(str, Enum):
@@ -17,6 +21,26 @@ class CRMOutcomeRecord:
     status: OutcomeStatus
     deal_value: float | None = None
     captured_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    external_id: str | None = None
+
+
+@dataclass(slots=True)
+class CRMOutcomeChange:
+    """One deal as reported by the CRM; ``external_id`` is the CRM's own record id."""
+
+    external_id: str
+    lead_id: int
+    status: OutcomeStatus
+    deal_value: float | None = None
+
+
+@dataclass(slots=True)
+class CRMUpsertResult:
+    created: list[CRMOutcomeRecord] = field(default_factory=list)
+    updated: list[CRMOutcomeRecord] = field(default_factory=list)
+    unchanged: int = 0
+    skipped: int = 0
+    deferred: list[CRMOutcomeChange] = field(default_factory=list)
 
 
 @dataclass(slots=True)
@@ -27,13 +51,36 @@ class ScoringQualitySnapshot:
     high_score_win_rate: float
 
 
+CRMListener = Callable[[str, list[CRMOutcomeRecord]], None]
+
+
 class CRMOutcomeSync:
     """PRD Step 7: single CRM outcome sync for label feedback loops."""
 
     def __init__(self, default_crm: str = "hubspot") -> None:
         self.default_crm = default_crm
+        self._lock = Lock()
         self._next_id = 1
-        self._records: list[CRMOutcomeRecord] = []
+        self._records: dict[int, CRMOutcomeRecord] = {}
+        self._by_lead: dict[int, list[CRMOutcomeRecord]] = {}
+        self._by_external: dict[tuple[str, str], CRMOutcomeRecord] = {}
+        self._listeners: list[CRMListener] = []
+        self._store: LeadStore | None = None
+
+    def attach(self, store: LeadStore) -> None:
+        """Skip CRM changes for leads ``store`` does not hold, so re-pulls cannot revive erased leads."""
+        self._store = store
+
+    def subscribe(self, listener: CRMListener) -> None:
+        """Call ``listener("synced", records)`` for existing and future records, under the lock.
+
+        ``upsert_outcomes`` reports changed records as ``"updated"`` and ``remove_leads``
+        reports erased records as ``"removed"``.
+        """
+        with self._lock:
+            if self._records:
+                listener("synced", list(self._records.values()))
+            self._listeners.append(listener)
 
     def sync_outcome(
         self,
@@ -44,18 +91,107 @@ class CRMOutcomeSync:
     ) -> CRMOutcomeRecord:
         if deal_value is not None and deal_value < 0:
             raise ValueError("deal_value cannot be negative")
+        with self._lock:
+            record = self._new_record(lead_id, crm_name or self.default_crm, status, deal_value, None)
+            for listener in self._listeners:
+                listener("synced", [record])
+            return record
+
+    def upsert_outcomes(self, changes: Iterable[CRMOutcomeChange], crm_name: str | None = None) -> CRMUpsertResult:
+        """Apply a batch of CRM changes keyed by ``(crm_name, external_id)``; replays are no-ops.
+
+        With an attached store, changes for erased leads are counted as skipped and changes for
+        ids the store has not issued yet are returned as ``deferred`` for the caller to replay.
+        """
+        crm_name = crm_name or self.default_crm
+        changes = list(changes)
+        for change in changes:
+            if change.deal_value is not None and change.deal_value < 0:
+                raise ValueError(f"deal_value cannot be negative for CRM record {change.external_id}")
+        result = CRMUpsertResult()
+        with self._lock:
+            now = datetime.now(timezone.utc)
+            for change in changes:
+                if self._store is not None and self._store.get(change.lead_id) is None:
+                    if self._store.issued(change.lead_id):
+                        result.skipped += 1
+                    else:
+                        result.deferred.append(change)
+                    continue
+                record = self._by_external.get((crm_name, change.external_id))
+                if record is None:
+                    result.created.append(
+                        self._new_record(change.lead_id, crm_name, change.status, change.deal_value, change.external_id)
+                    )
+                elif (record.lead_id, record.status, record.deal_value) == (
+                    change.lead_id,
+                    change.status,
+                    change.deal_value,
+                ):
+                    result.unchanged += 1
+                else:
+                    if record.lead_id != change.lead_id:
+                        self._unindex_lead(record)
+                        record.lead_id = change.lead_id
+                        self._by_lead.setdefault(record.lead_id, []).append(record)
+                    record.status = change.status
+                    record.deal_value = change.deal_value
+                    record.captured_at = now
+                    result.updated.append(record)
+            for listener in self._listeners:
+                if result.created:
+                    listener("synced", result.created)
+                if result.updated:
+                    listener("updated", result.updated)
+        return result
+
+    def remove_leads(self, lead_ids: Iterable[int]) -> list[CRMOutcomeRecord]:
+        with self._lock:
+            removed: list[CRMOutcomeRecord] = []
+            for lead_id in lead_ids:
+                removed.extend(self._by_lead.pop(lead_id, ()))
+            if removed:
+                for record in removed:
+                    del self._records[record.record_id]
+                    if record.external_id is not None:
+                        self._by_external.pop((record.crm_name, record.external_id), None)
+                for listener in self._listeners:
+                    listener("removed", removed)
+            return removed
+
+    def list_outcomes(self, lead_id: int | None = None) -> list[CRMOutcomeRecord]:
+        if lead_id is None:
+            return list(self._records.values())
+        return list(self._by_lead.get(lead_id, ()))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _new_record(
+        self,
+        lead_id: int,
+        crm_name: str,
+        status: OutcomeStatus,
+        deal_value: float | None,
+        external_id: str | None,
+    ) -> CRMOutcomeRecord:
         record = CRMOutcomeRecord(
             record_id=self._next_id,
             lead_id=lead_id,
-            crm_name=(crm_name or self.default_crm),
+            crm_name=crm_name,
             status=status,
             deal_value=deal_value,
+            external_id=external_id,
         )
         self._next_id += 1
-        self._records.append(record)
+        self._records[record.record_id] = record
+        self._by_lead.setdefault(lead_id, []).append(record)
+        if external_id is not None:
+            self._by_external[(crm_name, external_id)] = record
         return record
 
-    def list_outcomes(self, lead_id: int | None = None) -> list[CRMOutcomeRecord]:
-        if lead_id is None:
-            return list(self._records)
-        return [record for record in self._records if record.lead_id == lead_id]
+    def _unindex_lead(self, record: CRMOutcomeRecord) -> None:
+        records = self._by_lead[record.lead_id]
+        records.remove(record)
+        if not records:
+            del self._by_lead[record.lead_id]
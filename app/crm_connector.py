@@ -0,0 +1,215 @@
+import http.client
+import json
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Protocol
+from urllib.parse import urlencode, urlsplit
+
+from .crm import CRMOutcomeChange, CRMOutcomeSync, OutcomeStatus
+
+
+class CRMRequestError(Exception):
+    """Raised when the CRM answers with a non-200 status, an unreadable body or a malformed feed."""
+
+
+class CursorStore(Protocol):
+    def load(self) -> str | None:
+        ...
+
+    def load_parked(self) -> list[dict[str, Any]]:
+        """Changes held back with the cursor, in the feed's own row shape."""
+
+    def save(self, cursor: str | None, parked: list[dict[str, Any]] = ()) -> None:
+        """Replace the cursor and the parked changes together."""
+
+
+class HTTPConnectionPool:
+    """Up to ``size`` keep-alive ``http.client`` connections to one host, shared across threads."""
+
+    def __init__(
+        self,
+        base_url: str,
+        size: int = 4,
+        timeout: float = 30.0,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError("size must be positive")
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError("base_url must be an http(s) URL")
+        self._connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._host = parts.hostname
+        self._port = parts.port
+        self._prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.headers = {"Accept": "application/json", **(headers or {})}
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue()
+        self.connections_opened = 0
+
+    def get_json(self, path: str, params: dict[str, Any] | None = None) -> Any:
+        target = self._prefix + path + (f"?{urlencode(params)}" if params else "")
+        with self._slots:
+            while True:
+                connection, reused = self._checkout()
+                try:
+                    connection.request("GET", target, headers=self.headers)
+                    response = connection.getresponse()
+                    body = response.read()
+                except (http.client.HTTPException, OSError):
+                    connection.close()
+                    if reused:
+                        # The server may have dropped an idle keep-alive connection; retry on a fresh one.
+                        continue
+                    raise
+                if response.will_close:
+                    connection.close()
+                else:
+                    self._idle.put(connection)
+                break
+        if response.status != 200:
+            raise CRMRequestError(f"GET {target} returned {response.status}")
+        try:
+            return json.loads(body)
+        except ValueError as exc:
+            raise CRMRequestError(f"GET {target} returned invalid JSON") from exc
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _checkout(self) -> tuple[http.client.HTTPConnection, bool]:
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            self.connections_opened += 1
+            return self._connection_class(self._host, self._port, timeout=self.timeout), False
+
+
+@dataclass(slots=True)
+class CRMPullReport:
+    pages: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    rejected: int = 0
+    parked: int = 0
+    cursor: str | None = None
+
+
+class CRMOutcomePuller:
+    """PRD Step 7: incremental outcome pull from the CRM's change feed.
+
+    ``GET {changes_path}?cursor=&limit=`` must return ``{"changes": [...],
+    "next_cursor": str, "has_more": bool}`` where each change carries ``id``,
+    ``lead_id``, ``status`` and optional ``deal_value``. Each page is upserted in
+    bulk before its cursor is saved, so a crash replays at most one page and the
+    per-record upsert makes that replay a no-op. A null ``next_cursor`` keeps the
+    saved one. Changes for leads not ingested yet are parked with the cursor and
+    retried first on every pull until their lead arrives or a newer change for the
+    same record supersedes them. A page of another shape, or one with ``has_more``
+    but no new cursor, raises ``CRMRequestError``.
+    """
+
+    def __init__(
+        self,
+        sync: CRMOutcomeSync,
+        pool: HTTPConnectionPool,
+        cursor_store: CursorStore,
+        crm_name: str | None = None,
+        changes_path: str = "/outcomes/changes",
+        page_size: int = 500,
+    ) -> None:
+        if page_size < 1:
+            raise ValueError("page_size must be positive")
+        self.sync = sync
+        self.pool = pool
+        self.cursor_store = cursor_store
+        self.crm_name = crm_name or sync.default_crm
+        self.changes_path = changes_path
+        self.page_size = page_size
+
+    def pull(self, max_pages: int | None = None, full: bool = False) -> CRMPullReport:
+        """Follow the change feed from the saved cursor, or from the start when ``full``."""
+        saved_cursor = self.cursor_store.load()
+        report = CRMPullReport(cursor=None if full else saved_cursor)
+        parked = {row["id"]: row for row in self.cursor_store.load_parked()}
+        if parked:
+            changes, _ = _parse_changes(parked.values())
+            parked = {change.external_id: _change_row(change) for change in self._apply(changes, report)}
+            self.cursor_store.save(saved_cursor, list(parked.values()))
+        while max_pages is None or report.pages < max_pages:
+            params: dict[str, Any] = {"limit": self.page_size}
+            if report.cursor is not None:
+                params["cursor"] = report.cursor
+            page = self.pool.get_json(self.changes_path, params)
+            if not isinstance(page, dict) or not isinstance(page.get("changes", []), list):
+                raise CRMRequestError(f"GET {self.changes_path} returned a malformed page")
+            changes, rejected = _parse_changes(page.get("changes", ()))
+            deferred = self._apply(changes, report)
+            report.pages += 1
+            report.rejected += rejected
+            # A newer change for a parked record replaces it, whether it applied or was parked in turn.
+            parked_changed = bool(deferred) or any(change.external_id in parked for change in changes)
+            for change in changes:
+                parked.pop(change.external_id, None)
+            for change in deferred:
+                parked[change.external_id] = _change_row(change)
+            next_cursor = page.get("next_cursor")
+            advanced = next_cursor is not None and next_cursor != report.cursor
+            if advanced:
+                report.cursor = next_cursor
+            if advanced or parked_changed:
+                self.cursor_store.save(saved_cursor if report.cursor is None else report.cursor, list(parked.values()))
+            if not page.get("has_more"):
+                break
+            if not advanced:
+                # Following it would request the same page forever; the page itself is already applied.
+                raise CRMRequestError(f"GET {self.changes_path} reported more changes without advancing the cursor")
+        report.parked = len(parked)
+        return report
+
+    def _apply(self, changes: list[CRMOutcomeChange], report: CRMPullReport) -> list[CRMOutcomeChange]:
+        result = self.sync.upsert_outcomes(changes, crm_name=self.crm_name)
+        report.created += len(result.created)
+        report.updated += len(result.updated)
+        report.unchanged += result.unchanged
+        report.skipped += result.skipped
+        return result.deferred
+
+
+def _change_row(change: CRMOutcomeChange) -> dict[str, Any]:
+    return {
+        "id": change.external_id,
+        "lead_id": change.lead_id,
+        "status": change.status.value,
+        "deal_value": change.deal_value,
+    }
+
+
+def _parse_changes(rows) -> tuple[list[CRMOutcomeChange], int]:
+    changes: list[CRMOutcomeChange] = []
+    rejected = 0
+    for row in rows:
+        try:
+            deal_value = row.get("deal_value")
+            change = CRMOutcomeChange(
+                external_id=str(row["id"]),
+                lead_id=int(row["lead_id"]),
+                status=OutcomeStatus(row["status"]),
+                deal_value=None if deal_value is None else float(deal_value),
+            )
+        except (AttributeError, KeyError, TypeError, ValueError):
+            rejected += 1
+            continue
+        if change.lead_id < 1 or (change.deal_value is not None and change.deal_value < 0):
+            rejected += 1
+            continue
+        changes.append(change)
+    return changes, rejected
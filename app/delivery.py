@@ -1,6 +1,15 @@
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
+from operator import attrgetter
+from threading import Lock
+from typing import Callable, ContextManager, Iterable, Iterator, Protocol
+
+from .store import LeadStore
 
 
 class OutboundChannel(str, Enum):
@@ -14,6 +23,13 @@ class DeliveryEventType(str, Enum):
     COMPLAINT = "complaint"
 
 
+SUPPRESSING_EVENT_TYPES = frozenset({DeliveryEventType.BOUNCED, DeliveryEventType.COMPLAINT})
+_created_at = attrgetter("created_at")
+_event_id = attrgetter("event_id")
+# Erasing more than 1/N of the events rebuilds the time index instead of deleting one by one.
+_REBUILD_FRACTION = 32
+
+
 @dataclass(slots=True)
 class DeliveryEvent:
     event_id: int
@@ -23,17 +39,136 @@ class DeliveryEvent:
     subject: str
     event_type: DeliveryEventType
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    provider_message_id: str | None = None
+
+
+@dataclass(slots=True)
+class ProviderDeliveryEvent:
+    provider_message_id: str
+    lead_id: int
+    recipient: str
+    subject: str
+    event_type: DeliveryEventType
+    channel: OutboundChannel = OutboundChannel.EMAIL
+
+
+@dataclass(slots=True)
+class WebhookIngestResult:
+    accepted: int
+    duplicates: int
+    event_ids: list[int]
+    unknown_leads: int = 0
+
+
+class RecentKeyWindow:
+    """Bounded, time-windowed set of keys for deduplicating redelivered webhooks.
+
+    Keys are remembered for ``ttl_seconds`` and at most ``max_entries`` are kept,
+    oldest first out, so memory stays fixed however long the service runs.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 72 * 3600,
+        max_entries: int = 1_000_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._seen: OrderedDict[str, float] = OrderedDict()
+
+    def add(self, key: str) -> bool:
+        """Remember ``key``; returns False if it was already seen inside the window."""
+        now = self._clock()
+        self._expire(now)
+        if key in self._seen:
+            return False
+        self._seen[key] = now
+        if len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        self._expire(self._clock())
+        return key in self._seen
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.ttl_seconds
+        seen = self._seen
+        while seen:
+            oldest_key = next(iter(seen))
+            if seen[oldest_key] > cutoff:
+                break
+            del seen[oldest_key]
+
+
+DeliveryListener = Callable[[str, list[DeliveryEvent]], None]
+
+
+class DeliveryBackend(Protocol):
+    def load(self) -> tuple[list[DeliveryEvent], dict[str, DeliveryEventType]]:
+        """Return the persisted events in id order and the suppressed recipients."""
+
+    def append(self, events: list[DeliveryEvent]) -> None:
+        """Persist ``events``; bounces and complaints also persist the recipient's suppression."""
+
+    def delete(self, event_ids: list[int]) -> None:
+        ...
+
+    def transaction(self) -> ContextManager[None]:
+        """Hold the write lock shared with other processes; telemetry replays ``changes`` first."""
+
+    def changes(self) -> tuple[list[DeliveryEvent], list[int], dict[str, DeliveryEventType]]:
+        """Events appended, event ids deleted and suppressions added by other processes since the previous call."""
 
 
 class DeliveryTelemetry:
     """PRD Step 5: outbound send + delivery telemetry events."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        webhook_window: RecentKeyWindow | None = None,
+        backend: DeliveryBackend | None = None,
+    ) -> None:
+        self._lock = Lock()
         self._next_event_id = 1
+        # Ordered by created_at (ties by insertion), which for live traffic is also id order.
         self._events: list[DeliveryEvent] = []
+        self._by_id: dict[int, DeliveryEvent] = {}
+        self._by_lead: dict[int, list[DeliveryEvent]] = {}
+        self._counts: dict[DeliveryEventType, int] = dict.fromkeys(DeliveryEventType, 0)
+        self._suppressed: dict[str, DeliveryEventType] = {}
+        self._listeners: list[DeliveryListener] = []
+        self._webhook_window = webhook_window if webhook_window is not None else RecentKeyWindow()
+        self._store: LeadStore | None = None
+        self._backend = backend
+        if backend is not None:
+            events, suppressed = backend.load()
+            self._suppressed.update(suppressed)
+            self._add(events)
+
+    def attach(self, store: LeadStore) -> None:
+        """Drop webhook events for leads ``store`` does not hold, so late callbacks cannot revive erased leads."""
+        self._store = store
+
+    def subscribe(self, listener: DeliveryListener) -> None:
+        """Call ``listener("recorded", events)`` for existing and future events, under the lock.
+
+        ``remove_leads`` later reports erased events as ``"removed"``.
+        """
+        with self._lock:
+            if self._events:
+                listener("recorded", list(self._events))
+            self._listeners.append(listener)
 
     def send_email(self, lead_id: int, recipient: str, subject: str) -> DeliveryEvent:
-        if "@" not in recipient or "." not in recipient.split("@")[-1]:
+        if not is_valid_email(recipient):
             raise ValueError("recipient must be a valid email")
         return self.record_event(
             lead_id=lead_id,
@@ -51,19 +186,201 @@ class DeliveryTelemetry:
         subject: str,
         event_type: DeliveryEventType,
     ) -> DeliveryEvent:
-        event = DeliveryEvent(
-            event_id=self._next_event_id,
-            lead_id=lead_id,
-            channel=channel,
-            recipient=recipient,
-            subject=subject,
-            event_type=event_type,
+        return self.record_events([(lead_id, channel, recipient, subject, event_type)])[0]
+
+    def record_events(
+        self,
+        events: Iterable[tuple[int, OutboundChannel, str, str, DeliveryEventType]],
+    ) -> list[DeliveryEvent]:
+        """Append a batch of ``(lead_id, channel, recipient, subject, event_type)`` under one lock."""
+        with self._lock, self._transaction():
+            return self._append([(*event, None) for event in events])
+
+    def record_provider_events(self, events: Iterable[ProviderDeliveryEvent]) -> WebhookIngestResult:
+        """Idempotent webhook ingestion: redelivered (message id, event type) pairs are dropped.
+
+        Keys enter the dedup window only once the batch is committed, so a provider retry
+        after a failed write is accepted rather than dropped as a duplicate. With an attached
+        store, events for unknown or erased leads are counted in ``unknown_leads`` and dropped.
+        """
+        with self._lock:
+            with self._transaction():
+                fresh: list[tuple[int, OutboundChannel, str, str, DeliveryEventType, str | None]] = []
+                keys: dict[str, None] = {}
+                duplicates = unknown_leads = 0
+                for event in events:
+                    key = _webhook_key(event)
+                    if key in keys or key in self._webhook_window:
+                        duplicates += 1
+                        continue
+                    if self._store is not None and self._store.get(event.lead_id) is None:
+                        unknown_leads += 1
+                        continue
+                    keys[key] = None
+                    fresh.append(
+                        (
+                            event.lead_id,
+                            event.channel,
+                            event.recipient,
+                            event.subject,
+                            event.event_type,
+                            event.provider_message_id,
+                        )
+                    )
+                created = self._append(fresh)
+            for key in keys:
+                self._webhook_window.add(key)
+        return WebhookIngestResult(
+            accepted=len(created),
+            duplicates=duplicates,
+            event_ids=[event.event_id for event in created],
+            unknown_leads=unknown_leads,
         )
-        self._next_event_id += 1
-        self._events.append(event)
-        return event
+
+    def remove_leads(self, lead_ids: Iterable[int]) -> list[DeliveryEvent]:
+        """Erase the given leads' events; suppressions stay so erased recipients are never re-contacted."""
+        with self._lock, self._transaction():
+            removed = self._drop([event.event_id for lead_id in lead_ids for event in self._by_lead.get(lead_id, ())])
+            if removed:
+                if self._backend is not None:
+                    self._backend.delete([event.event_id for event in removed])
+                for listener in self._listeners:
+                    listener("removed", removed)
+            return removed
+
+    def refresh(self) -> None:
+        """Apply events and suppressions that other processes committed to a shared backend."""
+        if self._backend is not None:
+            with self._lock:
+                self._apply_backend_changes()
 
     def list_events(self, lead_id: int | None = None) -> list[DeliveryEvent]:
-        if lead_id is None:
-            return list(self._events)
-        return [event for event in self._events if event.lead_id == lead_id]
+        with self._lock:
+            if lead_id is None:
+                return list(self._events)
+            return list(self._by_lead.get(lead_id, ()))
+
+    def list_events_between(self, start: datetime, end: datetime) -> list[DeliveryEvent]:
+        """Events with ``start <= created_at < end``, found by bisecting the time-ordered index."""
+        with self._lock:
+            lo = bisect_left(self._events, start, key=_created_at)
+            hi = bisect_left(self._events, end, lo=lo, key=_created_at)
+            return self._events[lo:hi]
+
+    def count(self, event_type: DeliveryEventType) -> int:
+        return self._counts[event_type]
+
+    def counts(self) -> dict[DeliveryEventType, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def is_suppressed(self, recipient: str) -> bool:
+        """True once the recipient has bounced or complained; checked before every send."""
+        return recipient.strip().lower() in self._suppressed
+
+    def suppression_reason(self, recipient: str) -> DeliveryEventType | None:
+        return self._suppressed.get(recipient.strip().lower())
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def _append(
+        self,
+        events: list[tuple[int, OutboundChannel, str, str, DeliveryEventType, str | None]],
+    ) -> list[DeliveryEvent]:
+        created = [
+            DeliveryEvent(
+                event_id=event_id,
+                lead_id=lead_id,
+                channel=channel,
+                recipient=recipient,
+                subject=subject,
+                event_type=event_type,
+                provider_message_id=provider_message_id,
+            )
+            for event_id, (lead_id, channel, recipient, subject, event_type, provider_message_id) in enumerate(
+                events, self._next_event_id
+            )
+        ]
+        if self._backend is not None:
+            self._backend.append(created)
+        self._next_event_id += len(created)
+        for event in created:
+            self._index(event)
+        if created:
+            for listener in self._listeners:
+                listener("recorded", created)
+        return created
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        if self._backend is None:
+            yield
+            return
+        with self._backend.transaction():
+            self._apply_backend_changes()
+            yield
+
+    def _apply_backend_changes(self) -> None:
+        saved, deleted_ids, suppressed = self._backend.changes()
+        if not saved and not deleted_ids and not suppressed:
+            return
+        for recipient, event_type in suppressed.items():
+            self._suppressed.setdefault(recipient, event_type)
+        for change, events in (("recorded", self._add(saved)), ("removed", self._drop(deleted_ids))):
+            if events:
+                for listener in self._listeners:
+                    listener(change, events)
+
+    def _add(self, events: list[DeliveryEvent]) -> list[DeliveryEvent]:
+        # Events written elsewhere also feed the webhook window, so redeliveries to any worker are dropped.
+        events = sorted(events, key=_event_id)
+        for event in events:
+            self._index(event)
+            if event.provider_message_id is not None:
+                self._webhook_window.add(_webhook_key(event))
+            self._next_event_id = max(self._next_event_id, event.event_id + 1)
+        return events
+
+    def _drop(self, event_ids: Iterable[int]) -> list[DeliveryEvent]:
+        removed = [event for event_id in event_ids if (event := self._by_id.pop(event_id, None)) is not None]
+        if not removed:
+            return removed
+        removed.sort(key=_event_id)
+        removed_ids = {event.event_id for event in removed}
+        for event in removed:
+            self._counts[event.event_type] -= 1
+        for lead_id in {event.lead_id for event in removed}:
+            kept = [event for event in self._by_lead[lead_id] if event.event_id not in removed_ids]
+            if kept:
+                self._by_lead[lead_id] = kept
+            else:
+                del self._by_lead[lead_id]
+        if len(removed) * _REBUILD_FRACTION > len(self._events):
+            self._events = [event for event in self._events if event.event_id not in removed_ids]
+        else:
+            for event in removed:
+                index = bisect_left(self._events, event.created_at, key=_created_at)
+                while self._events[index] is not event:
+                    index += 1
+                del self._events[index]
+        return removed
+
+    def _index(self, event: DeliveryEvent) -> None:
+        if self._events and event.created_at < self._events[-1].created_at:
+            insort(self._events, event, key=_created_at)
+        else:
+            self._events.append(event)
+        self._by_id[event.event_id] = event
+        self._by_lead.setdefault(event.lead_id, []).append(event)
+        self._counts[event.event_type] += 1
+        if event.event_type in SUPPRESSING_EVENT_TYPES:
+            self._suppressed.setdefault(event.recipient.strip().lower(), event.event_type)
+
+
+def _webhook_key(event: DeliveryEvent | ProviderDeliveryEvent) -> str:
+    return f"{event.provider_message_id}:{event.event_type.value}"
+
+
+def is_valid_email(recipient: str) -> bool:
+    return "@" in recipient and "." in recipient.split("@")[-1]
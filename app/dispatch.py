@@ -0,0 +1,278 @@
+import asyncio
+import smtplib
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import Iterable, Protocol
+
+from .approval import ApprovalWorkflow
+from .delivery import DeliveryEventType, DeliveryTelemetry, OutboundChannel, is_valid_email
+
+
+@dataclass(slots=True)
+class OutboundEmail:
+    lead_id: int
+    recipient: str
+    subject: str
+    body: str
+
+
+@dataclass(slots=True)
+class DispatchFailure:
+    lead_id: int
+    recipient: str
+    reason: str
+
+
+@dataclass(slots=True)
+class DispatchReport:
+    sent: int = 0
+    skipped_unapproved: int = 0
+    skipped_suppressed: int = 0
+    retries: int = 0
+    failures: list[DispatchFailure] = field(default_factory=list)
+
+
+class DeliveryError(Exception):
+    """Raised by transports; ``permanent`` failures (e.g. SMTP 5xx) are not retried.
+
+    ``bounce`` marks a permanently refused recipient, the only failure that suppresses the address.
+    """
+
+    def __init__(self, message: str, permanent: bool = False, bounce: bool = False) -> None:
+        super().__init__(message)
+        self.permanent = permanent or bounce
+        self.bounce = bounce
+
+
+class EmailTransport(Protocol):
+    async def send(self, email: OutboundEmail) -> None:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` sends per second with bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # Waiters queue on the lock, so tokens are handed out in FIFO order.
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self._updated is not None:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class SMTPConnectionPool:
+    """Up to ``size`` reusable SMTP sessions; blocking smtplib calls run in worker threads.
+
+    A semaphore counts checked-out sessions, so a discarded session or a failed connect
+    frees its slot for the next waiter instead of leaving it blocked on an empty pool.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 25,
+        sender: str = "sdr-team@localhost",
+        size: int = 4,
+        timeout: float = 30.0,
+        starttls: bool = False,
+        username: str | None = None,
+        password: str | None = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError("size must be positive")
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.size = size
+        self.timeout = timeout
+        self.starttls = starttls
+        self.username = username
+        self.password = password
+        self._idle: list[smtplib.SMTP] = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def send(self, email: OutboundEmail) -> None:
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = email.recipient
+        message["Subject"] = email.subject
+        message.set_content(email.body)
+
+        connection = await self._acquire()
+        reusable = False
+        try:
+            await asyncio.to_thread(connection.send_message, message)
+            reusable = True
+        except smtplib.SMTPRecipientsRefused as exc:
+            reusable = True
+            # RCPT answers: 5xx means the address is refused, 4xx is a deferral worth retrying.
+            refused = all(code >= 500 for code, _ in exc.recipients.values())
+            raise DeliveryError(f"recipient refused: {exc.recipients}", bounce=refused) from exc
+        except smtplib.SMTPResponseException as exc:
+            # Sender, data and auth refusals are our side's fault; they fail the send without a bounce.
+            reusable = exc.smtp_code != 421
+            raise DeliveryError(f"smtp {exc.smtp_code}: {exc.smtp_error!r}", permanent=exc.smtp_code >= 500) from exc
+        except (smtplib.SMTPException, OSError) as exc:
+            raise DeliveryError(f"smtp connection error: {exc}") from exc
+        finally:
+            if reusable:
+                self._idle.append(connection)
+                self._slots.release()
+            else:
+                await self._discard(connection)
+
+    async def close(self) -> None:
+        while self._idle:
+            await self._quit(self._idle.pop())
+
+    async def _acquire(self) -> smtplib.SMTP:
+        await self._slots.acquire()
+        if self._idle:
+            return self._idle.pop()
+        try:
+            try:
+                return await asyncio.to_thread(self._connect)
+            except (smtplib.SMTPException, OSError) as exc:
+                raise DeliveryError(f"smtp connect failed: {exc}") from exc
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            connection.starttls()
+        if self.username:
+            connection.login(self.username, self.password or "")
+        return connection
+
+    async def _discard(self, connection: smtplib.SMTP) -> None:
+        try:
+            await self._quit(connection)
+        finally:
+            self._slots.release()
+
+    async def _quit(self, connection: smtplib.SMTP) -> None:
+        try:
+            await asyncio.to_thread(connection.quit)
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+
+
+class EmailDispatcher:
+    """PRD Step 5: approval-gated async email sends with rate limits, retries and batched telemetry."""
+
+    def __init__(
+        self,
+        telemetry: DeliveryTelemetry,
+        approvals: ApprovalWorkflow,
+        transport: EmailTransport,
+        global_rate: float = 100.0,
+        per_domain_rate: float = 10.0,
+        max_concurrency: int = 32,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.5,
+        event_batch_size: int = 200,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be positive")
+        self.telemetry = telemetry
+        self.approvals = approvals
+        self.transport = transport
+        self.per_domain_rate = per_domain_rate
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.event_batch_size = event_batch_size
+        self._global_bucket = TokenBucket(global_rate)
+        self._domain_buckets: dict[str, TokenBucket] = {}
+        self._pending_events: list[tuple[int, OutboundChannel, str, str, DeliveryEventType]] = []
+
+    async def dispatch(self, recipients: Iterable[tuple[int, str]]) -> DispatchReport:
+        """Send each lead's approved draft to its ``(lead_id, recipient)`` address.
+
+        Leads without an approved draft are skipped; at most ``max_concurrency`` sends are in flight at once.
+
+        An unexpected error cancels the remaining sends and is raised in an ``ExceptionGroup``;
+        telemetry for sends that completed is still recorded.
+        """
+        report = DispatchReport()
+        slots = asyncio.Semaphore(self.max_concurrency)
+        try:
+            async with asyncio.TaskGroup() as group:
+                for lead_id, recipient in recipients:
+                    await slots.acquire()
+                    group.create_task(self._send_one(lead_id, recipient, report, slots))
+        finally:
+            self._flush_events()
+        return report
+
+    async def _send_one(self, lead_id: int, recipient: str, report: DispatchReport, slots: asyncio.Semaphore) -> None:
+        try:
+            approval = self.approvals.approved_draft(lead_id)
+            if approval is None:
+                report.skipped_unapproved += 1
+                return
+            email = OutboundEmail(lead_id, recipient, approval.draft.subject, approval.draft.body)
+            if self.telemetry.is_suppressed(email.recipient):
+                report.skipped_suppressed += 1
+                return
+            if not is_valid_email(email.recipient):
+                report.failures.append(DispatchFailure(email.lead_id, email.recipient, "invalid recipient"))
+                return
+
+            domain = email.recipient.rsplit("@", 1)[1].lower()
+            bucket = self._domain_buckets.get(domain)
+            if bucket is None:
+                bucket = self._domain_buckets[domain] = TokenBucket(self.per_domain_rate)
+            for attempt in range(self.max_retries + 1):
+                # Domain first: a send queued behind a slow domain must not hold a global token meanwhile.
+                await bucket.acquire()
+                await self._global_bucket.acquire()
+                try:
+                    await self.transport.send(email)
+                except DeliveryError as exc:
+                    if exc.permanent or attempt == self.max_retries:
+                        report.failures.append(DispatchFailure(email.lead_id, email.recipient, str(exc)))
+                        if exc.bounce:
+                            self._queue_event(email, DeliveryEventType.BOUNCED)
+                        return
+                    report.retries += 1
+                    await asyncio.sleep(self.backoff_seconds * 2**attempt)
+                else:
+                    break
+            report.sent += 1
+            self._queue_event(email, DeliveryEventType.SENT)
+        finally:
+            slots.release()
+
+    def _queue_event(self, email: OutboundEmail, event_type: DeliveryEventType) -> None:
+        self._pending_events.append(
+            (email.lead_id, OutboundChannel.EMAIL, email.recipient, email.subject, event_type)
+        )
+        if len(self._pending_events) >= self.event_batch_size:
+            self._flush_events()
+
+    def _flush_events(self) -> None:
+        if self._pending_events:
+            events, self._pending_events = self._pending_events, []
+            self.telemetry.record_events(events)
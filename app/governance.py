@@ -1,6 +1,8 @@
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any
+from threading import Lock
+from typing import Any, Callable, ContextManager, Iterator, Protocol
 
 
 @dataclass(slots=True)
@@ -11,18 +13,147 @@ class AuditEvent:
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+@dataclass(slots=True)
+class LeadErasure:
+    lead_id: int
+    drafts_removed: int = 0
+    delivery_events_removed: int = 0
+    crm_outcomes_removed: int = 0
+
+
+AuditListener = Callable[[str, list[AuditEvent]], None]
+
+
+class AuditLogBackend(Protocol):
+    def load(self) -> tuple[int, int]:
+        """Return the number of persisted events and the next event id to allocate."""
+
+    def append(self, event: AuditEvent) -> None:
+        ...
+
+    def query(
+        self,
+        actions: frozenset[str] | None,
+        start: datetime | None,
+        end: datetime | None,
+    ) -> list[AuditEvent]:
+        ...
+
+    def flush(self) -> None:
+        ...
+
+    def transaction(self) -> ContextManager[None]:
+        """Hold the write lock shared with other processes; the log replays ``changes`` first."""
+
+    def changes(self) -> list[AuditEvent]:
+        """Events appended by other processes since the previous call, in id order."""
+
+    def close(self) -> None:
+        ...
+
+
 class AuditLog:
-    """Append-only audit log for compliance and operational traceability."""
+    """Append-only audit log for compliance and operational traceability.
 
-    def __init__(self) -> None:
-        self._next_event_id = 1
+    Without a backend events live in memory; with one, ``append`` hands each event
+    to the backend and queries are answered from it.
+    """
+
+    def __init__(self, backend: AuditLogBackend | None = None) -> None:
+        self._lock = Lock()
+        self._backend = backend
         self._events: list[AuditEvent] = []
+        self._listeners: list[AuditListener] = []
+        self._count = 0
+        self._next_event_id = 1
+        if backend is not None:
+            self._count, self._next_event_id = backend.load()
+
+    def subscribe(self, listener: AuditListener) -> None:
+        """Call ``listener("appended", events)`` for existing and future events, under the lock."""
+        with self._lock:
+            if self._count:
+                events = self._backend.query(None, None, None) if self._backend is not None else list(self._events)
+                listener("appended", events)
+            self._listeners.append(listener)
 
     def append(self, action: str, payload: dict[str, Any]) -> AuditEvent:
-        event = AuditEvent(event_id=self._next_event_id, action=action, payload=dict(payload))
-        self._next_event_id += 1
-        self._events.append(event)
-        return event
+        with self._lock, self._transaction():
+            event = AuditEvent(event_id=self._next_event_id, action=action, payload=dict(payload))
+            if self._backend is not None:
+                self._backend.append(event)
+            else:
+                self._events.append(event)
+            self._next_event_id += 1
+            self._count += 1
+            for listener in self._listeners:
+                listener("appended", [event])
+            return event
 
     def list_events(self) -> list[AuditEvent]:
-        return list(self._events)
+        return self.query()
+
+    def query(
+        self,
+        actions: str | list[str] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[AuditEvent]:
+        """Events in id order with ``start <= created_at < end``, optionally limited to ``actions``."""
+        if isinstance(actions, str):
+            actions = [actions]
+        wanted = frozenset(actions) if actions is not None else None
+        if self._backend is not None:
+            # The backend reads segments under its own lock so appends are not held up.
+            return self._backend.query(wanted, start, end)
+        with self._lock:
+            return [event for event in self._events if audit_event_matches(event, wanted, start, end)]
+
+    def flush(self) -> None:
+        """Block until every appended event is durable."""
+        if self._backend is not None:
+            self._backend.flush()
+
+    def refresh(self) -> None:
+        """Count and announce events other processes appended to a shared backend."""
+        if self._backend is not None:
+            with self._lock:
+                self._apply_backend_changes()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._backend is not None:
+                self._backend.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        if self._backend is None:
+            yield
+            return
+        with self._backend.transaction():
+            self._apply_backend_changes()
+            yield
+
+    def _apply_backend_changes(self) -> None:
+        events = self._backend.changes()
+        if events:
+            self._count += len(events)
+            self._next_event_id = max(self._next_event_id, events[-1].event_id + 1)
+            for listener in self._listeners:
+                listener("appended", events)
+
+
+def audit_event_matches(
+    event: AuditEvent,
+    actions: frozenset[str] | None,
+    start: datetime | None,
+    end: datetime | None,
+) -> bool:
+    if actions is not None and event.action not in actions:
+        return False
+    if start is not None and event.created_at < start:
+        return False
+    return end is None or event.created_at < end
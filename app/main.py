@@ -1,31 +1,369 @@
-from .models import DataSource, InboundLead, IngestLeadsResponse, Lead
-from .store import LeadStore
+from array import array
+from concurrent.futures import Executor
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator
+
+from .approval import ApprovalWorkflow
+from .compliance import ComplianceReporter
+from .crm import CRMOutcomeSync
+from .delivery import DeliveryTelemetry
+from .dispatch import DispatchReport, EmailDispatcher, EmailTransport
+from .governance import AuditLog, LeadErasure
+from .messaging import (
+    DEFAULT_DRAFT_BATCH_SIZE,
+    CampaignDraft,
+    MessageDraft,
+    MessageDraftGenerator,
+    MessageGenerationControls,
+)
+from .models import (
+    DataSource,
+    DuplicatePolicy,
+    InboundLead,
+    IngestLeadsResponse,
+    IngestProgress,
+    IngestRejection,
+    Lead,
+    LeadPage,
+)
+from .predictive import DEFAULT_FEATURE_BITS, HashedLogisticScorer
+from .quality import LabeledLeads, ScoringQualityEngine, ScoringQualityReport
+from .reporting import FunnelRollups, IncrementalDashboard
+from .scoring import ICPRuleConfig, LeadScoreResult, RuleBasedScorer, ScoreCache
+from .store import LeadFilter, LeadStore, UpsertResult
+
+DEFAULT_INGEST_CHUNK_SIZE = 1_000
+DEFAULT_RETENTION_BATCH_SIZE = 1_000
+DEFAULT_LEAD_PAGE_SIZE = 100
+# A filtered page examines at most this many leads per requested row before handing back a cursor.
+LEAD_SCAN_FACTOR = 20
 
 
 class LeadIngestionService:
     """Step 1 service: compliance-first ingestion from official/vetted sources only."""
 
-    def __init__(self, store: LeadStore | None = None) -> None:
-        self.store = store or LeadStore()
+    def __init__(
+        self,
+        store: LeadStore | None = None,
+        draft_generator: MessageDraftGenerator | None = None,
+        duplicate_policy: DuplicatePolicy = DuplicatePolicy.SKIP,
+        scorer: RuleBasedScorer | None = None,
+        approvals: ApprovalWorkflow | None = None,
+        draft_executor: Executor | None = None,
+        delivery: DeliveryTelemetry | None = None,
+        crm: CRMOutcomeSync | None = None,
+        audit: AuditLog | None = None,
+        email_transport: EmailTransport | None = None,
+    ) -> None:
+        self.store = store if store is not None else LeadStore()
+        self.draft_generator = draft_generator or MessageDraftGenerator()
+        self.scorer = scorer or RuleBasedScorer(cache=ScoreCache())
+        self.approvals = approvals if approvals is not None else ApprovalWorkflow()
+        self.draft_executor = draft_executor
+        self.delivery = delivery if delivery is not None else DeliveryTelemetry()
+        self.delivery.attach(self.store)
+        self.dashboard = IncrementalDashboard()
+        self.dashboard.attach(self.store, self.approvals, self.delivery)
+        self.rollups = FunnelRollups()
+        self.rollups.attach(self.store, self.approvals, self.delivery)
+        self.email_dispatcher = (
+            EmailDispatcher(self.delivery, self.approvals, email_transport) if email_transport is not None else None
+        )
+        self.crm = crm if crm is not None else CRMOutcomeSync()
+        self.crm.attach(self.store)
+        self.audit = audit if audit is not None else AuditLog()
+        self.compliance = ComplianceReporter()
+        self.compliance.attach(self.store, self.approvals, self.delivery, self.crm, self.audit)
+        self.quality = ScoringQualityEngine(self.store, self.crm, self.scorer)
+        self.model: HashedLogisticScorer | None = None
+        self.duplicate_policy = duplicate_policy
+        self.store.subscribe(self._on_leads_changed)
 
     def ingest(self, provider_name: str, leads: list[InboundLead]) -> IngestLeadsResponse:
-        if len(provider_name.strip()) < 2:
-            raise ValueError("provider_name must be at least 2 characters")
+        """Accept the valid, previously unseen rows; report the rest per row instead of failing the batch."""
+        self._validate_provider(provider_name)
         if not leads:
             raise ValueError("at least one lead is required")
 
-        for lead in leads:
-            lead.validate()
-            if lead.source not in {DataSource.OFFICIAL_API, DataSource.VETTED_PROVIDER}:
-                raise ValueError(f"Unsupported source: {lead.source}")
-
-        created = self.store.add_many(leads)
+        result, rejections = self._ingest_rows(leads, first_row=0)
         return IngestLeadsResponse(
             provider_name=provider_name,
-            accepted=len(created),
-            rejected=0,
-            lead_ids=[lead.id for lead in created],
+            accepted=len(result.created),
+            rejected=len(rejections),
+            lead_ids=[lead.id for lead in result.created],
+            duplicates=len(result.duplicates),
+            rejections=rejections,
         )
 
+    def ingest_stream(
+        self,
+        provider_name: str,
+        leads: Iterable[InboundLead],
+        chunk_size: int = DEFAULT_INGEST_CHUNK_SIZE,
+    ) -> Iterator[IngestProgress]:
+        """Validate and commit ``leads`` in fixed-size chunks, yielding progress after each.
+
+        Only one chunk is held at a time and the store lock is released between chunks,
+        so memory stays flat for arbitrarily large backfills. Rejected rows are reported
+        per chunk with their position in the overall stream.
+        """
+        progress = self.start_ingest_stream(provider_name)
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        iterator = iter(leads)
+        while chunk := list(islice(iterator, chunk_size)):
+            yield self.ingest_chunk(progress, chunk)
+        if progress.chunks_committed == 0:
+            raise ValueError("at least one lead is required")
+
+    def start_ingest_stream(self, provider_name: str) -> IngestProgress:
+        self._validate_provider(provider_name)
+        return IngestProgress(provider_name=provider_name)
+
+    def ingest_chunk(self, progress: IngestProgress, leads: list[InboundLead | ValueError]) -> IngestProgress:
+        """Commit one chunk; rows the caller could not parse are passed as their ``ValueError``."""
+        result, rejections = self._ingest_rows(leads, first_row=progress.rows_processed)
+        progress.chunks_committed += 1
+        progress.rows_processed += len(leads)
+        progress.accepted += len(result.created)
+        progress.rejected += len(rejections)
+        progress.duplicates += len(result.duplicates)
+        progress.chunk_lead_ids = [lead.id for lead in result.created]
+        progress.chunk_rejections = rejections
+        return progress
+
     def list_leads(self) -> list[Lead]:
         return self.store.list_all()
+
+    def list_leads_page(
+        self,
+        after_id: int | None = None,
+        limit: int = DEFAULT_LEAD_PAGE_SIZE,
+        lead_filter: LeadFilter | None = None,
+        min_score: int | None = None,
+    ) -> LeadPage:
+        """One page of leads in id order; pass ``next_after_id`` back to continue.
+
+        Work is bounded by ``limit``: a selective filter may return a short (even empty)
+        page with a cursor rather than scanning the whole store.
+        """
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        leads: list[Lead] = []
+        cursor = after_id
+        step = max(limit, 256)
+        scanned = 0
+        while True:
+            chunk, cursor = self.store.scan(cursor, step, lead_filter)
+            scanned += step
+            if min_score is not None and chunk:
+                chunk = [lead for lead, score in zip(chunk, self.scorer.score_many(chunk)) if score >= min_score]
+            leads.extend(chunk)
+            if len(leads) >= limit:
+                more = len(leads) > limit or cursor is not None
+                return LeadPage(leads[:limit], leads[limit - 1].id if more else None)
+            if cursor is None or scanned >= limit * LEAD_SCAN_FACTOR:
+                return LeadPage(leads, cursor)
+
+    def iter_leads(
+        self,
+        lead_filter: LeadFilter | None = None,
+        min_score: int | None = None,
+        page_size: int = DEFAULT_LEAD_PAGE_SIZE,
+    ) -> Iterator[list[Lead]]:
+        """Yield matching leads page by page; the store lock is never held between pages."""
+        page = self.list_leads_page(None, page_size, lead_filter, min_score)
+        while True:
+            if page.leads:
+                yield page.leads
+            if page.next_after_id is None:
+                return
+            page = self.list_leads_page(page.next_after_id, page_size, lead_filter, min_score)
+
+    def get_lead(self, lead_id: int) -> Lead:
+        lead = self.store.get(lead_id)
+        if lead is None:
+            raise ValueError(f"lead_id {lead_id} not found")
+        return lead
+
+    def get_leads(self, lead_ids: Iterable[int]) -> list[Lead]:
+        return self.store.get_many(lead_ids)
+
+    def find_leads_by_company(self, company: str) -> list[Lead]:
+        return self.store.find_by_company(company)
+
+    def score_leads(self, lead_ids: Iterable[int] | None = None) -> list[tuple[int, int]]:
+        """Return ``(lead_id, score)`` pairs for the given leads, or the whole book."""
+        leads = self.store.list_all() if lead_ids is None else self.store.get_many(lead_ids)
+        return list(zip((lead.id for lead in leads), self.scorer.score_many(leads)))
+
+    def score_leads_side_by_side(self, lead_ids: Iterable[int] | None = None) -> list[tuple[int, int, int]]:
+        """Return ``(lead_id, rule_score, model_score)`` triples from one pass over the leads."""
+        model = self._require_model()
+        leads = self.store.list_all() if lead_ids is None else self.store.get_many(lead_ids)
+        return list(zip((lead.id for lead in leads), self.scorer.score_many(leads), model.score_many(leads)))
+
+    def train_model(self, epochs: int = 5, feature_bits: int = DEFAULT_FEATURE_BITS) -> HashedLogisticScorer:
+        """Fit a predictive scorer on the current CRM labels and start serving it next to the rules.
+
+        With a ``draft_executor`` the SGD passes run there, off the calling thread and the GIL.
+        """
+        args = (self.quality.labeled_leads(), self.scorer.config, feature_bits, epochs)
+        if self.draft_executor is None:
+            weights, bias, rule_weights = _fit_model(*args)
+        else:
+            weights, bias, rule_weights = self.draft_executor.submit(_fit_model, *args).result()
+        self.model = HashedLogisticScorer(self.scorer, weights, bias, rule_weights, feature_bits, ScoreCache())
+        return self.model
+
+    def compare_scorers(self) -> tuple[ScoringQualityReport, ScoringQualityReport]:
+        """Quality reports for the rules and the model over the same labeled leads."""
+        model = self._require_model()
+        labeled = self.quality.labeled_leads()
+        return self.quality.report(labeled), self.quality.evaluate(model, labeled)
+
+    def explain_score(self, lead_id: int) -> LeadScoreResult:
+        return self.scorer.score_lead(self.get_lead(lead_id))
+
+    def generate_message_draft(self, lead_id: int, controls: MessageGenerationControls) -> MessageDraft:
+        return self.draft_generator.generate(self.get_lead(lead_id), controls)
+
+    def generate_campaign_drafts(
+        self,
+        lead_ids: Iterable[int],
+        controls: MessageGenerationControls,
+        submit_for_approval: bool = False,
+        batch_size: int = DEFAULT_DRAFT_BATCH_SIZE,
+    ) -> Iterator[list[CampaignDraft]]:
+        """Generate drafts for a lead selection in parallel batches; unknown ids are skipped."""
+        leads = self.store.get_many(lead_ids)
+        offset = 0
+        for drafts in self.draft_generator.generate_many(
+            leads, controls, executor=self.draft_executor, batch_size=batch_size
+        ):
+            batch = [
+                CampaignDraft(lead_id=lead.id, draft=draft)
+                for lead, draft in zip(leads[offset : offset + len(drafts)], drafts)
+            ]
+            offset += len(drafts)
+            if submit_for_approval:
+                for item in batch:
+                    item.revision_id = self.approvals.submit(item.lead_id, item.draft).revision_id
+            yield batch
+
+    async def send_approved_drafts(self, recipients: Iterable[tuple[int, str]]) -> DispatchReport:
+        """PRD Step 5: email each lead's approved draft to its ``(lead_id, recipient)`` address."""
+        if self.email_dispatcher is None:
+            raise ValueError("no email transport configured")
+        return await self.email_dispatcher.dispatch(recipients)
+
+    def close(self) -> None:
+        """Write out queued audit events and close the audit and lead backends."""
+        self.audit.close()
+        self.store.close()
+
+    def refresh(self) -> None:
+        """Catch up on state other processes committed to shared backends; cheap when nothing changed."""
+        self.store.refresh()
+        self.approvals.refresh()
+        self.delivery.refresh()
+        self.audit.refresh()
+
+    def erase_leads(self, lead_ids: Iterable[int], requested_by: str) -> list[LeadErasure]:
+        """DSAR erase: drop each lead with its drafts, delivery events and CRM outcomes.
+
+        A repeated request finishes whatever an interrupted one left behind and is
+        otherwise a no-op. Every erased lead gets a ``lead_deleted`` audit event; the
+        store's background snapshot then drops its logged rows from disk.
+        """
+        requested_by = requested_by.strip()
+        if len(requested_by) < 2:
+            raise ValueError("requested_by must be at least 2 characters")
+        erasures = self._erase(lead_ids)
+        for erasure in erasures:
+            self.audit.append(
+                "lead_deleted",
+                {
+                    "lead_id": erasure.lead_id,
+                    "requested_by": requested_by,
+                    "drafts_removed": erasure.drafts_removed,
+                    "delivery_events_removed": erasure.delivery_events_removed,
+                    "crm_outcomes_removed": erasure.crm_outcomes_removed,
+                },
+            )
+        return erasures
+
+    def enforce_retention(self, cutoff: datetime, batch_size: int = DEFAULT_RETENTION_BATCH_SIZE) -> int:
+        """Erase every lead created before ``cutoff``, oldest first, and record the run."""
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        deleted = 0
+        while lead_ids := self.store.take_created_before(cutoff, batch_size):
+            deleted += len(self._erase(lead_ids))
+        self.audit.append("retention_policy_enforced", {"cutoff": cutoff.isoformat(), "leads_deleted": deleted})
+        return deleted
+
+    def _erase(self, lead_ids: Iterable[int]) -> list[LeadErasure]:
+        lead_ids = list(dict.fromkeys(lead_ids))
+        # The store goes first so late webhooks and CRM pulls already see the lead as gone. Dependants
+        # are cleared for every requested id: a retry then finishes a cascade that failed halfway.
+        erasures = {lead.id: LeadErasure(lead.id) for lead in self.store.remove_many(lead_ids)}
+        for item in self.approvals.remove_leads(lead_ids):
+            erasures.setdefault(item.lead_id, LeadErasure(item.lead_id)).drafts_removed += 1
+        for event in self.delivery.remove_leads(lead_ids):
+            erasures.setdefault(event.lead_id, LeadErasure(event.lead_id)).delivery_events_removed += 1
+        for record in self.crm.remove_leads(lead_ids):
+            erasures.setdefault(record.lead_id, LeadErasure(record.lead_id)).crm_outcomes_removed += 1
+        return list(erasures.values())
+
+    def _on_leads_changed(self, kind: str, leads: list[Lead]) -> None:
+        # Also runs when a refresh replays another worker's erasures, so no cache keeps their personal data.
+        if kind == "removed":
+            self.scorer.forget(leads)
+            self.draft_generator.forget(leads)
+            if self.model is not None:
+                self.model.forget(leads)
+
+    def _require_model(self) -> HashedLogisticScorer:
+        if self.model is None:
+            raise ValueError("no predictive model has been trained or loaded")
+        return self.model
+
+    def _validate_provider(self, provider_name: str) -> None:
+        if len(provider_name.strip()) < 2:
+            raise ValueError("provider_name must be at least 2 characters")
+
+    def _ingest_rows(
+        self, leads: list[InboundLead | ValueError], first_row: int
+    ) -> tuple[UpsertResult, list[IngestRejection]]:
+        valid: list[InboundLead] = []
+        rejections: list[IngestRejection] = []
+        for row, lead in enumerate(leads, start=first_row):
+            if isinstance(lead, ValueError):
+                rejections.append(IngestRejection(row=row, reason=str(lead)))
+                continue
+            try:
+                self._validate_lead(lead)
+            except ValueError as exc:
+                rejections.append(IngestRejection(row=row, reason=str(exc)))
+            else:
+                valid.append(lead)
+        result = self.store.upsert_many(valid, self.duplicate_policy) if valid else UpsertResult()
+        return result, rejections
+
+    def _validate_lead(self, lead: InboundLead) -> None:
+        lead.validate()
+        # API payloads pass the raw string so an unknown value rejects only its own row.
+        try:
+            lead.source = DataSource(lead.source)
+        except ValueError:
+            raise ValueError(f"Unsupported source: {lead.source}") from None
+
+
+def _fit_model(
+    labeled: LabeledLeads, config: ICPRuleConfig, feature_bits: int, epochs: int
+) -> tuple[array, float, tuple[float, ...]]:
+    # Returns plain weights: the scorers' caches hold locks and do not cross process boundaries.
+    model = HashedLogisticScorer.train(labeled, RuleBasedScorer(config), feature_bits=feature_bits, epochs=epochs)
+    return model.weights, model.bias, model.rule_weights
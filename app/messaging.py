@@ -1,8 +1,16 @@
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, Future
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Iterable, Iterator, Sequence
 
 from .models import Lead
 
+DEFAULT_DRAFT_BATCH_SIZE = 500
+DEFAULT_EVIDENCE_CACHE_SIZE = 4_096
+
 
 class MessageTone(str, Enum):
     PROFESSIONAL = "professional"
@@ -27,7 +35,7 @@ class MessageGenerationControls:
     cta: MessageCTA
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class PersonalizationEvidence:
     token: str
     value: str
@@ -44,80 +52,156 @@ class MessageDraft:
     personalization: list[PersonalizationEvidence]
 
 
+@dataclass(slots=True)
+class CampaignDraft:
+    lead_id: int
+    draft: MessageDraft
+    revision_id: int | None = None
+
+
 class MessageDraftGenerator:
-    """PRD Step 3: deterministic draft generation with configurable controls."""
+    """PRD Step 3: deterministic draft generation with configurable controls.
+
+    Evidence records are cached per lead id and shared by every draft of the same lead
+    revision (e.g. A/B variants); ``forget`` drops them when leads are erased.
+    """
+
+    def __init__(self, evidence_cache_size: int = DEFAULT_EVIDENCE_CACHE_SIZE) -> None:
+        if evidence_cache_size < 1:
+            raise ValueError("evidence_cache_size must be positive")
+        self.evidence_cache_size = evidence_cache_size
+        self._evidence_lock = Lock()
+        self._evidence: OrderedDict[int, tuple[tuple, tuple[PersonalizationEvidence, ...]]] = OrderedDict()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Pool workers start with an empty cache rather than a copy of this one.
+        return {"evidence_cache_size": self.evidence_cache_size}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["evidence_cache_size"])
+
+    def generate_many(
+        self,
+        leads: Sequence[Lead],
+        controls: MessageGenerationControls,
+        executor: Executor | None = None,
+        batch_size: int = DEFAULT_DRAFT_BATCH_SIZE,
+        max_pending_batches: int = 8,
+    ) -> Iterator[list[MessageDraft]]:
+        """Yield drafts in input order, one list per ``batch_size`` leads.
+
+        With an executor, batches are generated in parallel (a process pool spreads
+        them across cores) while at most ``max_pending_batches`` are in flight, so
+        results stream back without materializing the whole campaign.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        batches = (leads[start : start + batch_size] for start in range(0, len(leads), batch_size))
+        if executor is None:
+            for batch in batches:
+                yield _generate_batch(self, batch, controls)
+            return
+
+        pending: deque[Future[list[MessageDraft]]] = deque()
+        try:
+            for batch in batches:
+                pending.append(executor.submit(_generate_batch, self, batch, controls))
+                if len(pending) >= max_pending_batches:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
 
     def generate(self, lead: Lead, controls: MessageGenerationControls) -> MessageDraft:
-        greeting = self._greeting_for_tone(controls.tone)
-        template_line = self._template_line(controls.template, lead)
-        cta_line = self._cta_line(controls.cta)
-
-        subject = self._subject_for_template(controls.template, lead)
-        body = (
-            f"{greeting} {lead.full_name},\n\n"
-            f"{template_line}\n\n"
-            f"{cta_line}\n\n"
-            "Best,\n"
-            "Your SDR Team"
+        subject_format, body_format = _compiled_template(controls.tone, controls.template, controls.cta)
+        fields = {"full_name": lead.full_name, "title": lead.title, "company": lead.company}
+        return MessageDraft(
+            subject=subject_format.format_map(fields),
+            body=body_format.format_map(fields),
+            controls=controls,
+            personalization=list(self._lead_evidence(lead)),
         )
 
-        personalization = [
-            PersonalizationEvidence(
-                token="full_name",
-                value=lead.full_name,
-                source="lead_ingestion",
-                captured_at=lead.created_at.isoformat(),
-                confidence=0.99,
-            ),
+    def forget(self, leads: Iterable[Lead]) -> None:
+        """Drop cached evidence for erased leads; it holds their personal data."""
+        with self._evidence_lock:
+            for lead in leads:
+                self._evidence.pop(lead.id, None)
+
+    def _lead_evidence(self, lead: Lead) -> tuple[PersonalizationEvidence, ...]:
+        values = (lead.full_name, lead.title, lead.company, lead.profile_url)
+        key = (*values, lead.created_at)
+        with self._evidence_lock:
+            cached = self._evidence.get(lead.id)
+            if cached is not None and cached[0] == key:
+                self._evidence.move_to_end(lead.id)
+                return cached[1]
+        captured_at = lead.created_at.isoformat()
+        evidence = tuple(
             PersonalizationEvidence(
-                token="title",
-                value=lead.title,
+                token=token,
+                value=value,
                 source="lead_ingestion",
-                captured_at=lead.created_at.isoformat(),
-                confidence=0.95,
-            ),
-            PersonalizationEvidence(
-                token="company",
-                value=lead.company,
-                source="lead_ingestion",
-                captured_at=lead.created_at.isoformat(),
-                confidence=0.95,
-            ),
-            PersonalizationEvidence(
-                token="profile_url",
-                value=lead.profile_url,
-                source="lead_ingestion",
-                captured_at=lead.created_at.isoformat(),
-                confidence=0.9,
-            ),
-        ]
-
-        return MessageDraft(subject=subject, body=body, controls=controls, personalization=personalization)
-
-    def _greeting_for_tone(self, tone: MessageTone) -> str:
-        if tone == MessageTone.FRIENDLY:
-            return "Hi"
-        if tone == MessageTone.DIRECT:
-            return "Hello"
-        return "Good day"
-
-    def _template_line(self, template: MessageTemplate, lead: Lead) -> str:
-        if template == MessageTemplate.FOLLOW_UP:
-            return (
-                f"I wanted to follow up because leaders in roles like {lead.title} at {lead.company} "
-                "often ask us how to improve outbound performance with less manual work."
+                captured_at=captured_at,
+                confidence=confidence,
             )
-        return (
-            f"I noticed your work as {lead.title} at {lead.company} and thought a brief intro "
-            "might be relevant to your growth goals."
+            for (token, confidence), value in zip(_EVIDENCE_FIELDS, values)
         )
-
-    def _cta_line(self, cta: MessageCTA) -> str:
-        if cta == MessageCTA.BOOK_CALL:
-            return "Would you be open to a 15-minute call next week to compare approaches?"
-        return "If this is relevant, just reply and I can share a short tailored plan."
-
-    def _subject_for_template(self, template: MessageTemplate, lead: Lead) -> str:
-        if template == MessageTemplate.FOLLOW_UP:
-            return f"Following up for {lead.company}"
-        return f"Intro idea for {lead.company}"
+        with self._evidence_lock:
+            self._evidence[lead.id] = (key, evidence)
+            self._evidence.move_to_end(lead.id)
+            if len(self._evidence) > self.evidence_cache_size:
+                self._evidence.popitem(last=False)
+        return evidence
+
+
+_GREETINGS = {
+    MessageTone.PROFESSIONAL: "Good day",
+    MessageTone.FRIENDLY: "Hi",
+    MessageTone.DIRECT: "Hello",
+}
+_TEMPLATE_LINES = {
+    MessageTemplate.INTRO: (
+        "I noticed your work as {title} at {company} and thought a brief intro "
+        "might be relevant to your growth goals."
+    ),
+    MessageTemplate.FOLLOW_UP: (
+        "I wanted to follow up because leaders in roles like {title} at {company} "
+        "often ask us how to improve outbound performance with less manual work."
+    ),
+}
+_CTA_LINES = {
+    MessageCTA.BOOK_CALL: "Would you be open to a 15-minute call next week to compare approaches?",
+    MessageCTA.REPLY: "If this is relevant, just reply and I can share a short tailored plan.",
+}
+_SUBJECTS = {
+    MessageTemplate.INTRO: "Intro idea for {company}",
+    MessageTemplate.FOLLOW_UP: "Following up for {company}",
+}
+_EVIDENCE_FIELDS = (
+    ("full_name", 0.99),
+    ("title", 0.95),
+    ("company", 0.95),
+    ("profile_url", 0.9),
+)
+
+
+@lru_cache(maxsize=None)
+def _compiled_template(tone: MessageTone, template: MessageTemplate, cta: MessageCTA) -> tuple[str, str]:
+    """Subject and body format strings for one control combination, assembled once."""
+    body = (
+        f"{_GREETINGS[tone]} {{full_name}},\n\n"
+        f"{_TEMPLATE_LINES[template]}\n\n"
+        f"{_CTA_LINES[cta]}\n\n"
+        "Best,\n"
+        "Your SDR Team"
+    )
+    return _SUBJECTS[template], body
+
+
+def _generate_batch(
+    generator: MessageDraftGenerator, leads: Sequence[Lead], controls: MessageGenerationControls
+) -> list[MessageDraft]:
+    return [generator.generate(lead, controls) for lead in leads]
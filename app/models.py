@@ -27,6 +27,8 @@ class InboundLead:
         parsed = urlparse(self.profile_url)
         if parsed.scheme not in {"http", "https"} or not parsed.netloc:
             raise ValueError("profile_url must be a valid http(s) URL")
+        if "\0" in self.full_name + self.title + self.company + self.profile_url:
+            raise ValueError("fields cannot contain NUL characters")
 
 
 @dataclass(slots=True)
@@ -40,9 +42,60 @@ class Lead:
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+def normalize_profile_url(profile_url: str) -> str:
+    """Canonical key for a profile URL: case, scheme, ``www.``, query and trailing slash ignored."""
+    url = profile_url.strip().lower()
+    scheme_end = url.find("://")
+    if scheme_end != -1:
+        url = url[scheme_end + 3 :]
+    for separator in ("#", "?"):
+        cut = url.find(separator)
+        if cut != -1:
+            url = url[:cut]
+    if url.startswith("www."):
+        url = url[4:]
+    return url.rstrip("/")
+
+
+def lead_fingerprint(full_name: str, company: str) -> str:
+    """Secondary duplicate key for providers that rewrite profile URLs between exports."""
+    return f"{' '.join(full_name.lower().split())}|{' '.join(company.lower().split())}"
+
+
+class DuplicatePolicy(str, Enum):
+    SKIP = "skip"
+    MERGE = "merge"
+
+
+@dataclass(slots=True)
+class IngestRejection:
+    row: int
+    reason: str
+
+
 @dataclass(slots=True)
 class IngestLeadsResponse:
     provider_name: str
     accepted: int
     rejected: int
     lead_ids: list[int]
+    duplicates: int = 0
+    rejections: list[IngestRejection] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class IngestProgress:
+    provider_name: str
+    chunks_committed: int = 0
+    rows_processed: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    duplicates: int = 0
+    chunk_lead_ids: list[int] = field(default_factory=list)
+    chunk_rejections: list[IngestRejection] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class LeadPage:
+    leads: list[Lead]
+    next_after_id: int | None = None
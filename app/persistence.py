@@ -0,0 +1,676 @@
+import gc
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from contextlib import nullcontext
+from functools import partial
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, ContextManager, Iterable, Protocol
+
+from .governance import AuditEvent, audit_event_matches
+from .models import DataSource, Lead
+
+_SNAPSHOT_VERSION = 2
+_BLOCK_LENGTH = struct.Struct("<Q")
+_LOG_ADD = "add"
+_LOG_SET = "set"
+_LOG_DELETE = "del"
+_SOURCES = {source.value: source for source in DataSource}
+_SOURCE_ORDER = list(DataSource)
+_SOURCE_INDEX = {source: index for index, source in enumerate(_SOURCE_ORDER)}
+
+
+class LeadStoreBackend(Protocol):
+    def load(self) -> tuple[list[Lead], int]:
+        """Return the persisted leads in id order and the next id to allocate."""
+
+    def append(self, leads: list[Lead]) -> None:
+        ...
+
+    def update(self, leads: list[Lead]) -> None:
+        ...
+
+    def delete(self, lead_ids: list[int]) -> None:
+        ...
+
+    def needs_snapshot(self) -> bool:
+        ...
+
+    def begin_snapshot(self, leads: Iterable[Lead], next_id: int) -> Callable[[], None]:
+        """Start a snapshot of ``leads`` under the store lock; the store calls the result after releasing it.
+
+        Once the returned function finishes, rows of erased leads are gone from disk.
+        ``leads`` must not change in the meantime.
+        """
+
+    def transaction(self) -> ContextManager[None]:
+        """Hold the write lock shared with other processes; the store replays ``changes`` first."""
+
+    def changes(self) -> tuple[list[Lead], list[int]]:
+        """Leads saved and ids deleted by other processes since the previous call."""
+
+    def close(self) -> None:
+        ...
+
+
+class FileLeadBackend:
+    """Local-file lead persistence: append-only log plus periodic compact snapshots.
+
+    ``append`` writes one batch with a single ``fsync`` (group commit). Once
+    ``snapshot_every`` records have been logged, ``begin_snapshot`` rotates the log
+    to ``leads.log.previous``; the returned writer rewrites the columnar snapshot
+    and then deletes the rotated log, so restart cost tracks the log tail rather
+    than total history and writers never wait for the rewrite. The snapshot is a
+    JSON header line followed by one length-prefixed block per column: ids as int64,
+    sources as one byte each and the text columns as NUL-separated UTF-8. Boot maps
+    the file and decodes each block with a single array or split call.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], snapshot_every: int = 100_000, fsync: bool = True) -> None:
+        if snapshot_every < 1:
+            raise ValueError("snapshot_every must be positive")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.snapshot_path = self.directory / "leads.snapshot"
+        self.log_path = self.directory / "leads.log"
+        self.previous_log_path = self.directory / "leads.log.previous"
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self._log: BinaryIO | None = None
+        self._records_since_snapshot = 0
+
+    def load(self) -> tuple[list[Lead], int]:
+        snapshot, next_id = self._load_snapshot()
+        leads = {lead.id: lead for lead in snapshot}
+        snapshot_max_id = next_id - 1
+        # A rotated log outlives its snapshot only if the process died mid-rewrite; replaying it is idempotent.
+        recovering = self.previous_log_path.exists()
+        records = self._read_log(self.previous_log_path) if recovering else []
+        for record in records + self._read_log(self.log_path):
+            op, lead_id = record[0], record[1]
+            if op == _LOG_ADD and lead_id <= snapshot_max_id:
+                continue
+            if op in (_LOG_ADD, _LOG_SET):
+                leads[lead_id] = _lead_from_row(record[1:])
+                next_id = max(next_id, lead_id + 1)
+            elif op == _LOG_DELETE:
+                leads.pop(lead_id, None)
+            self._records_since_snapshot += 1
+        if recovering:
+            self.snapshot(leads.values(), next_id)
+        else:
+            self._log = open(self.log_path, "ab")
+        return list(leads.values()), next_id
+
+    def append(self, leads: list[Lead]) -> None:
+        self._write(_LOG_ADD, leads)
+
+    def update(self, leads: list[Lead]) -> None:
+        self._write(_LOG_SET, leads)
+
+    def delete(self, lead_ids: list[int]) -> None:
+        """Log deletions; the erased rows leave the files entirely at the next ``snapshot``."""
+        self._write_records([[_LOG_DELETE, lead_id] for lead_id in lead_ids])
+
+    def needs_snapshot(self) -> bool:
+        return self._records_since_snapshot >= self.snapshot_every
+
+    def snapshot(self, leads: Iterable[Lead], next_id: int) -> None:
+        """Rewrite the snapshot and empty both logs before returning."""
+        self._write_snapshot(leads, next_id)
+        if self._log is not None:
+            self._log.close()
+        self._log = open(self.log_path, "wb")
+        self._records_since_snapshot = 0
+        self.previous_log_path.unlink(missing_ok=True)
+
+    def begin_snapshot(self, leads: Iterable[Lead], next_id: int) -> Callable[[], None]:
+        if self.previous_log_path.exists():
+            # The last rewrite failed; its rotated log is only safe to drop after a full snapshot.
+            self.snapshot(leads, next_id)
+            return _done
+        if self._log is not None:
+            self._log.close()
+        os.replace(self.log_path, self.previous_log_path)
+        self._log = open(self.log_path, "wb")
+        self._fsync_directory()
+        self._records_since_snapshot = 0
+        return partial(self._finish_snapshot, leads, next_id)
+
+    def _finish_snapshot(self, leads: Iterable[Lead], next_id: int) -> None:
+        self._write_snapshot(leads, next_id)
+        self.previous_log_path.unlink()
+        self._fsync_directory()
+
+    def _write_snapshot(self, leads: Iterable[Lead], next_id: int) -> None:
+        ids = array("q")
+        sources = array("B")
+        full_names: list[str] = []
+        titles: list[str] = []
+        companies: list[str] = []
+        profile_urls: list[str] = []
+        created_at: list[str] = []
+        for lead in leads:
+            ids.append(lead.id)
+            sources.append(_SOURCE_INDEX[lead.source])
+            full_names.append(lead.full_name)
+            titles.append(lead.title)
+            companies.append(lead.company)
+            profile_urls.append(lead.profile_url)
+            created_at.append(lead.created_at.isoformat())
+        blocks = [
+            ids.tobytes(),
+            *map(_encode_text_column, (full_names, titles, companies, profile_urls)),
+            sources.tobytes(),
+            _encode_text_column(created_at),
+        ]
+        header = {"version": _SNAPSHOT_VERSION, "next_id": next_id, "count": len(ids), "byteorder": sys.byteorder}
+
+        tmp_path = self.snapshot_path.with_suffix(".snapshot.tmp")
+        with open(tmp_path, "wb") as fh:
+            fh.write(json.dumps(header).encode() + b"\n")
+            for block in blocks:
+                fh.write(_BLOCK_LENGTH.pack(len(block)))
+                fh.write(block)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self._fsync_directory()
+
+    def transaction(self) -> ContextManager[None]:
+        # The files have a single writer process, so there is nothing to lock or replay.
+        return nullcontext()
+
+    def changes(self) -> tuple[list[Lead], list[int]]:
+        return [], []
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _write(self, op: str, leads: list[Lead]) -> None:
+        self._write_records([[op, *_row_from_lead(lead)] for lead in leads])
+
+    def _write_records(self, records: list[list]) -> None:
+        if not records:
+            return
+        if self._log is None:
+            self._log = open(self.log_path, "ab")
+        payload = b"".join(json.dumps(record, separators=(",", ":")).encode() + b"\n" for record in records)
+        self._log.write(payload)
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+        self._records_since_snapshot += len(records)
+
+    def _load_snapshot(self) -> tuple[list[Lead], int]:
+        if not self.snapshot_path.exists() or self.snapshot_path.stat().st_size == 0:
+            return [], 1
+        with open(self.snapshot_path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            offset = mapped.find(b"\n") + 1
+            header = json.loads(mapped[:offset])
+            if header.get("version") != _SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported lead snapshot version: {header.get('version')}")
+            columns: list[Any] = []
+            with memoryview(mapped) as view:
+                for decode in _COLUMN_DECODERS:
+                    (length,) = _BLOCK_LENGTH.unpack_from(view, offset)
+                    offset += _BLOCK_LENGTH.size
+                    if offset + length > len(view):
+                        raise ValueError("lead snapshot is truncated")
+                    # Blocks are decoded straight from the mapping; each view is released before the next.
+                    with view[offset : offset + length] as block:
+                        column = decode(block, header)
+                    if len(column) != header["count"]:
+                        raise ValueError("lead snapshot column length does not match its header")
+                    columns.append(column)
+                    offset += length
+        columns[-1] = map(datetime.fromisoformat, columns[-1])
+        # Leads hold no reference cycles; pausing the collector avoids rescanning millions of new objects.
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            return list(map(Lead, *columns)), int(header["next_id"])
+        finally:
+            if collecting:
+                gc.enable()
+
+    def _read_log(self, path: Path) -> list[list]:
+        if not path.exists():
+            return []
+        records: list[list] = []
+        valid_bytes = 0
+        with open(path, "rb") as fh:
+            for line in fh:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+        if valid_bytes != path.stat().st_size:
+            # A crash mid-write leaves a torn tail; drop it so later appends stay parseable.
+            with open(path, "r+b") as fh:
+                fh.truncate(valid_bytes)
+        return records
+
+    def _fsync_directory(self) -> None:
+        if not self.fsync or os.name != "posix":
+            return
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+@dataclass(slots=True)
+class AuditSegment:
+    """Sparse index over one audit segment: id range, time range and per-action counts."""
+
+    path: Path
+    first_id: int = 0
+    last_id: int = 0
+    count: int = 0
+    size: int = 0
+    min_created_at: datetime | None = None
+    max_created_at: datetime | None = None
+    actions: dict[str, int] = field(default_factory=dict)
+
+    def may_contain(self, actions: frozenset[str] | None, start: datetime | None, end: datetime | None) -> bool:
+        if not self.count:
+            return False
+        if actions is not None and actions.isdisjoint(self.actions):
+            return False
+        if start is not None and self.max_created_at < start:
+            return False
+        return end is None or self.min_created_at < end
+
+    def add(self, event: AuditEvent, size: int) -> None:
+        if not self.count:
+            self.first_id = event.event_id
+            self.min_created_at = self.max_created_at = event.created_at
+        else:
+            self.min_created_at = min(self.min_created_at, event.created_at)
+            self.max_created_at = max(self.max_created_at, event.created_at)
+        self.last_id = event.event_id
+        self.count += 1
+        self.size += size
+        self.actions[event.action] = self.actions.get(event.action, 0) + 1
+
+
+class FileAuditBackend:
+    """Segmented audit persistence: JSON-lines segments with sparse per-segment indexes.
+
+    ``append`` only queues the event; a writer thread drains the queue and commits
+    each batch with one ``fsync`` (group commit). Segments roll over every
+    ``segment_max_events`` events and are sealed with an ``.idx`` sidecar holding
+    their id range, time range and action counts, so queries memory-map only the
+    segments that can match.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        segment_max_events: int = 100_000,
+        fsync: bool = True,
+    ) -> None:
+        if segment_max_events < 1:
+            raise ValueError("segment_max_events must be positive")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_max_events = segment_max_events
+        self.fsync = fsync
+        self._cond = threading.Condition()
+        self._segments: list[AuditSegment] = []
+        self._queued: list[AuditEvent] = []
+        self._inflight: list[AuditEvent] = []
+        self._file: BinaryIO | None = None
+        self._writer: threading.Thread | None = None
+        self._closed = False
+        self._error: OSError | None = None
+
+    def load(self) -> tuple[int, int]:
+        paths = sorted(self.directory.glob("audit-*.log"))
+        for position, path in enumerate(paths):
+            segment = _read_audit_index(path)
+            if segment is None:
+                segment = self._scan_segment(path, repair=position == len(paths) - 1)
+            self._segments.append(segment)
+        if not self._segments:
+            self._segments.append(AuditSegment(self._segment_path(1)))
+        self._file = open(self._segments[-1].path, "ab")
+        self._writer = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._writer.start()
+        count = sum(segment.count for segment in self._segments)
+        next_id = max((segment.last_id for segment in self._segments), default=0) + 1
+        return count, next_id
+
+    def append(self, event: AuditEvent) -> None:
+        with self._cond:
+            if self._error is not None:
+                raise self._error
+            if self._closed or self._writer is None:
+                raise ValueError("audit backend is not open")
+            self._queued.append(event)
+            self._cond.notify_all()
+
+    def query(
+        self,
+        actions: frozenset[str] | None,
+        start: datetime | None,
+        end: datetime | None,
+    ) -> list[AuditEvent]:
+        with self._cond:
+            # Committed sizes and the unwritten tail are captured together so no event is seen twice.
+            ranges = [
+                (segment.path, segment.size)
+                for segment in self._segments
+                if segment.may_contain(actions, start, end)
+            ]
+            pending = self._inflight + self._queued
+        prefixes = None if actions is None else tuple(b"[" + json.dumps(action).encode() + b"," for action in actions)
+        events: list[AuditEvent] = []
+        for path, size in ranges:
+            events.extend(_read_audit_segment(path, size, prefixes, actions, start, end))
+        events.extend(event for event in pending if audit_event_matches(event, actions, start, end))
+        return events
+
+    def flush(self) -> None:
+        with self._cond:
+            while (self._queued or self._inflight) and self._error is None and self._writer is not None:
+                self._cond.wait()
+            if self._error is not None:
+                raise self._error
+
+    def transaction(self) -> ContextManager[None]:
+        # Segments have a single writer process, so there is nothing to lock or replay.
+        return nullcontext()
+
+    def changes(self) -> list[AuditEvent]:
+        return []
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._writer is not None:
+            self._writer.join()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            if self._error is None:
+                _write_audit_index(self._segments[-1])
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queued and not self._closed:
+                    self._cond.wait()
+                if not self._queued:
+                    return
+                self._inflight, self._queued = self._queued, []
+                batch = self._inflight
+            try:
+                self._commit(batch)
+            except OSError as exc:
+                with self._cond:
+                    self._error = exc
+                    self._cond.notify_all()
+                return
+
+    def _commit(self, batch: list[AuditEvent]) -> None:
+        # Only this thread mutates segments, so their counts can be read without the lock.
+        active = self._segments[-1]
+        target, delta = active, AuditSegment(active.path)
+        updates: list[tuple[AuditSegment, AuditSegment]] = []
+        chunk: list[bytes] = []
+        for event in batch:
+            if target.count + delta.count >= self.segment_max_events:
+                self._write_chunk(chunk)
+                chunk = []
+                updates.append((target, delta))
+                target = AuditSegment(self._segment_path(event.event_id))
+                delta = AuditSegment(target.path)
+                self._file.close()
+                self._file = open(target.path, "ab")
+            line = _audit_line(event)
+            chunk.append(line)
+            delta.add(event, len(line))
+        self._write_chunk(chunk)
+        updates.append((target, delta))
+
+        with self._cond:
+            for segment, written in updates:
+                _merge_segment(segment, written)
+                if segment is not active:
+                    self._segments.append(segment)
+            self._inflight = []
+            self._cond.notify_all()
+        for sealed, _ in updates[:-1]:
+            _write_audit_index(sealed)
+
+    def _write_chunk(self, chunk: list[bytes]) -> None:
+        if not chunk:
+            return
+        self._file.write(b"".join(chunk))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _scan_segment(self, path: Path, repair: bool) -> AuditSegment:
+        segment = AuditSegment(path)
+        with open(path, "rb") as fh:
+            for line in fh:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    segment.add(_audit_event_from_row(json.loads(line)), len(line))
+                except ValueError:
+                    break
+        if repair and segment.size != path.stat().st_size:
+            # A crash mid-write leaves a torn tail; drop it so later appends stay parseable.
+            with open(path, "r+b") as fh:
+                fh.truncate(segment.size)
+        return segment
+
+    def _segment_path(self, first_id: int) -> Path:
+        return self.directory / f"audit-{first_id:012d}.log"
+
+
+class FileCursorStore:
+    """Durable cursor and parked changes for incremental pulls, replaced atomically on save."""
+
+    def __init__(self, path: str | os.PathLike[str], fsync: bool = True) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+
+    def load(self) -> str | None:
+        return self._read().get("cursor")
+
+    def load_parked(self) -> list[dict[str, Any]]:
+        return self._read().get("parked", [])
+
+    def save(self, cursor: str | None, parked: list[dict[str, Any]] = ()) -> None:
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "wb") as fh:
+            fh.write(json.dumps({"cursor": cursor, "parked": list(parked)}).encode())
+            fh.flush()
+            if self.fsync:
+                os.fsync(fh.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _read(self) -> dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        return json.loads(self.path.read_bytes())
+
+
+def _merge_segment(segment: AuditSegment, delta: AuditSegment) -> None:
+    if not delta.count:
+        return
+    if not segment.count:
+        segment.first_id = delta.first_id
+        segment.min_created_at, segment.max_created_at = delta.min_created_at, delta.max_created_at
+    else:
+        segment.min_created_at = min(segment.min_created_at, delta.min_created_at)
+        segment.max_created_at = max(segment.max_created_at, delta.max_created_at)
+    segment.last_id = delta.last_id
+    segment.count += delta.count
+    segment.size += delta.size
+    for action, count in delta.actions.items():
+        segment.actions[action] = segment.actions.get(action, 0) + count
+
+
+def _done() -> None:
+    pass
+
+
+def _audit_line(event: AuditEvent) -> bytes:
+    row = [event.action, event.event_id, event.created_at.isoformat(), event.payload]
+    return json.dumps(row, separators=(",", ":"), default=str).encode() + b"\n"
+
+
+def _audit_event_from_row(row: list) -> AuditEvent:
+    action, event_id, created_at, payload = row
+    return AuditEvent(event_id=event_id, action=action, payload=payload, created_at=datetime.fromisoformat(created_at))
+
+
+def _read_audit_segment(
+    path: Path,
+    size: int,
+    prefixes: tuple[bytes, ...] | None,
+    actions: frozenset[str] | None,
+    start: datetime | None,
+    end: datetime | None,
+) -> list[AuditEvent]:
+    if not size:
+        return []
+    events: list[AuditEvent] = []
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        position = 0
+        while position < size:
+            # Only the committed ``size`` bytes are read, one line at a time.
+            line_end = mapped.find(b"\n", position, size)
+            if line_end == -1:
+                line_end = size
+            line = mapped[position:line_end]
+            position = line_end + 1
+            if not line:
+                continue
+            # Rows lead with the action, so non-matching rows are skipped without decoding.
+            if prefixes is not None and not line.startswith(prefixes):
+                continue
+            event = _audit_event_from_row(json.loads(line))
+            if audit_event_matches(event, actions, start, end):
+                events.append(event)
+    return events
+
+
+def _read_audit_index(path: Path) -> AuditSegment | None:
+    index_path = path.with_suffix(".idx")
+    if not index_path.exists():
+        return None
+    try:
+        index = json.loads(index_path.read_bytes())
+    except ValueError:
+        return None
+    if index.get("size") != path.stat().st_size:
+        return None
+    return AuditSegment(
+        path=path,
+        first_id=index["first_id"],
+        last_id=index["last_id"],
+        count=index["count"],
+        size=index["size"],
+        min_created_at=datetime.fromisoformat(index["min_created_at"]) if index["count"] else None,
+        max_created_at=datetime.fromisoformat(index["max_created_at"]) if index["count"] else None,
+        actions=index["actions"],
+    )
+
+
+def _write_audit_index(segment: AuditSegment) -> None:
+    index = {
+        "first_id": segment.first_id,
+        "last_id": segment.last_id,
+        "count": segment.count,
+        "size": segment.size,
+        "min_created_at": segment.min_created_at.isoformat() if segment.min_created_at else None,
+        "max_created_at": segment.max_created_at.isoformat() if segment.max_created_at else None,
+        "actions": segment.actions,
+    }
+    index_path = segment.path.with_suffix(".idx")
+    tmp_path = segment.path.with_suffix(".idx.tmp")
+    tmp_path.write_bytes(json.dumps(index).encode())
+    os.replace(tmp_path, index_path)
+
+
+def _encode_text_column(values: list[str]) -> bytes:
+    text = "\0".join(values)
+    if text.count("\0") != max(len(values) - 1, 0):
+        raise ValueError("lead text fields cannot contain NUL characters")
+    return text.encode()
+
+
+def _decode_text_column(block: memoryview, header: dict[str, Any]) -> list[str]:
+    return str(block, "utf-8").split("\0") if header["count"] else []
+
+
+def _decode_id_column(block: memoryview, header: dict[str, Any]) -> array:
+    ids = array("q")
+    ids.frombytes(block)
+    if header["byteorder"] != sys.byteorder:
+        ids.byteswap()
+    return ids
+
+
+def _decode_source_column(block: memoryview, header: dict[str, Any]) -> list[DataSource]:
+    return list(map(_SOURCE_ORDER.__getitem__, block))
+
+
+# Block order matches the ``Lead`` constructor.
+_COLUMN_DECODERS = (
+    _decode_id_column,
+    _decode_text_column,
+    _decode_text_column,
+    _decode_text_column,
+    _decode_text_column,
+    _decode_source_column,
+    _decode_text_column,
+)
+
+
+def _row_from_lead(lead: Lead) -> tuple:
+    return (
+        lead.id,
+        lead.full_name,
+        lead.title,
+        lead.company,
+        lead.profile_url,
+        lead.source.value,
+        lead.created_at.isoformat(),
+    )
+
+
+def _lead_from_row(row) -> Lead:
+    lead_id, full_name, title, company, profile_url, source, created_at = row
+    return Lead(
+        id=lead_id,
+        full_name=full_name,
+        title=title,
+        company=company,
+        profile_url=profile_url,
+        source=_SOURCES[source],
+        created_at=datetime.fromisoformat(created_at),
+    )
@@ -0,0 +1,261 @@
+import math
+import os
+import random
+import struct
+import sys
+from array import array
+from itertools import repeat
+from pathlib import Path
+from typing import Iterable, Sequence
+from zlib import crc32
+
+from .models import InboundLead, Lead
+from .quality import LabeledLeads
+from .scoring import RuleBasedScorer, ScoreCache
+
+DEFAULT_FEATURE_BITS = 18
+
+_MODEL_MAGIC = b"HLS1"
+# magic, version, feature bits, non-zero weights, bias, four rule-bit weights
+_MODEL_HEADER = struct.Struct("<4sHHId4d")
+_MODEL_VERSION = 1
+# ASCII punctuation and whitespace separate tokens; a bytes translate + split beats a regex per value.
+_PUNCTUATION = bytes(code for code in range(128) if not chr(code).isalnum())
+_SEPARATORS = bytes.maketrans(_PUNCTUATION, b" " * len(_PUNCTUATION))
+# Hashing continues from the field prefix, so crc32(token, seed) == crc32(b"t:" + token).
+_FIELD_SEEDS = {field: crc32(f"{field}:".encode()) for field in ("t", "c", "u")}
+_RULE_BITS = 4
+_MAX_MEMO_ENTRIES = 100_000
+
+
+class HashedLogisticScorer:
+    """PRD Step 7 predictive scorer: logistic regression over hashed tokens and the rule bits.
+
+    Title, company and profile-URL path tokens are hashed (CRC32) into ``2**feature_bits``
+    weights; the rule scorer's match mask contributes one weight per bit. Scores are win
+    probabilities scaled to 0-100 so they line up with rule scores in quality reports.
+    """
+
+    def __init__(
+        self,
+        rule_scorer: RuleBasedScorer,
+        weights: array,
+        bias: float = 0.0,
+        rule_weights: Sequence[float] = (0.0,) * _RULE_BITS,
+        feature_bits: int = DEFAULT_FEATURE_BITS,
+        cache: ScoreCache | None = None,
+    ) -> None:
+        if len(weights) != 1 << feature_bits:
+            raise ValueError("weights must have 2**feature_bits entries")
+        if len(rule_weights) != _RULE_BITS:
+            raise ValueError(f"rule_weights must have {_RULE_BITS} entries")
+        self.rule_scorer = rule_scorer
+        self.weights = weights
+        self.bias = bias
+        self.rule_weights = tuple(rule_weights)
+        self.feature_bits = feature_bits
+        self._mask_logits = tuple(
+            sum(weight for bit, weight in enumerate(self.rule_weights) if mask >> bit & 1)
+            for mask in range(1 << _RULE_BITS)
+        )
+        self.cache = cache
+        # The rule config can be edited in place, so its key is appended per lookup in ``_cache_key``.
+        self._model_key = ("hashed-logistic", feature_bits, self.bias, self.rule_weights, crc32(weights.tobytes()))
+        # Titles and companies repeat across the book, so their summed logits are memoized.
+        self._title_logits: dict[str, float] = {}
+        self._company_logits: dict[str, float] = {}
+
+    @classmethod
+    def train(
+        cls,
+        labeled: LabeledLeads,
+        rule_scorer: RuleBasedScorer,
+        feature_bits: int = DEFAULT_FEATURE_BITS,
+        epochs: int = 5,
+        learning_rate: float = 0.1,
+        l2: float = 1e-6,
+        seed: int = 0,
+        cache: ScoreCache | None = None,
+    ) -> "HashedLogisticScorer":
+        """Fit by SGD on the won/lost labels; a fixed ``seed`` makes training reproducible."""
+        if not len(labeled):
+            raise ValueError("at least one labeled lead is required")
+        size = 1 << feature_bits
+        masks = rule_scorer.match_columns(labeled.full_names, labeled.titles, labeled.companies, labeled.profile_urls)
+        rows = [
+            (
+                _features("t", title, size) + _features("c", company, size) + _url_features(profile_url, size),
+                [bit for bit in range(_RULE_BITS) if mask >> bit & 1],
+                won,
+            )
+            for title, company, profile_url, mask, won in zip(
+                labeled.titles, labeled.companies, labeled.profile_urls, masks, labeled.won
+            )
+        ]
+        weights = [0.0] * size
+        rule_weights = [0.0] * _RULE_BITS
+        bias = 0.0
+        order = list(range(len(rows)))
+        shuffle = random.Random(seed).shuffle
+        for epoch in range(epochs):
+            shuffle(order)
+            rate = learning_rate / (1 + epoch)
+            for row in order:
+                features, bits, won = rows[row]
+                logit = bias + sum(weights[index] for index in features) + sum(rule_weights[bit] for bit in bits)
+                gradient = _sigmoid(logit) - won
+                bias -= rate * gradient
+                for index in features:
+                    weights[index] -= rate * (gradient + l2 * weights[index])
+                for bit in bits:
+                    rule_weights[bit] -= rate * (gradient + l2 * rule_weights[bit])
+        return cls(rule_scorer, array("f", weights), bias, rule_weights, feature_bits, cache)
+
+    @classmethod
+    def load(
+        cls,
+        path: str | os.PathLike[str],
+        rule_scorer: RuleBasedScorer,
+        cache: ScoreCache | None = None,
+    ) -> "HashedLogisticScorer":
+        data = Path(path).read_bytes()
+        magic, version, feature_bits, nonzero, bias, *rule_weights = _MODEL_HEADER.unpack_from(data)
+        if magic != _MODEL_MAGIC or version != _MODEL_VERSION:
+            raise ValueError(f"unsupported model file: {path}")
+        offset = _MODEL_HEADER.size
+        indices = array("I")
+        indices.frombytes(data[offset : offset + 4 * nonzero])
+        values = array("f")
+        values.frombytes(data[offset + 4 * nonzero : offset + 8 * nonzero])
+        if sys.byteorder != "little":
+            indices.byteswap()
+            values.byteswap()
+        weights = array("f", bytes(4 << feature_bits))
+        for index, value in zip(indices, values):
+            weights[index] = value
+        return cls(rule_scorer, weights, bias, rule_weights, feature_bits, cache)
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Write the non-zero weights only; the file is replaced atomically."""
+        indices = array("I", (index for index, value in enumerate(self.weights) if value))
+        values = array("f", map(self.weights.__getitem__, indices))
+        if sys.byteorder != "little":
+            indices.byteswap()
+            values.byteswap()
+        header = _MODEL_HEADER.pack(
+            _MODEL_MAGIC, _MODEL_VERSION, self.feature_bits, len(indices), self.bias, *self.rule_weights
+        )
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(header + indices.tobytes() + values.tobytes())
+        os.replace(tmp_path, path)
+
+    def forget(self, leads: Iterable[InboundLead | Lead]) -> None:
+        if self.cache is not None:
+            self.cache.discard_many((lead.full_name, lead.title, lead.company, lead.profile_url) for lead in leads)
+
+    def score_lead(self, lead: InboundLead | Lead) -> int:
+        return self.score_columns([lead.full_name], [lead.title], [lead.company], [lead.profile_url])[0]
+
+    def score_many(self, leads: Sequence[InboundLead | Lead]) -> array:
+        """Score leads in bulk; the result is aligned with ``leads`` like ``RuleBasedScorer.score_many``."""
+        return self.score_columns(
+            full_names=[lead.full_name for lead in leads],
+            titles=[lead.title for lead in leads],
+            companies=[lead.company for lead in leads],
+            profile_urls=[lead.profile_url for lead in leads],
+        )
+
+    def score_columns(
+        self,
+        full_names: Sequence[str],
+        titles: Sequence[str],
+        companies: Sequence[str],
+        profile_urls: Sequence[str],
+    ) -> array:
+        """Columnar inference; with a cache, repeat leads skip tokenization entirely."""
+        if self.cache is None or not self.cache.admits(len(full_names)):
+            return self._score_uncached(full_names, titles, companies, profile_urls)
+
+        cache_key = self._cache_key()
+        contents = list(zip(full_names, titles, companies, profile_urls))
+        cached = self.cache.get_many(cache_key, contents)
+        missing = [row for row, score in enumerate(cached) if score is None]
+        if missing:
+            computed = self._score_uncached(
+                [full_names[row] for row in missing],
+                [titles[row] for row in missing],
+                [companies[row] for row in missing],
+                [profile_urls[row] for row in missing],
+            )
+            for row, score in zip(missing, computed):
+                cached[row] = score
+            self.cache.put_many(cache_key, [(contents[row], cached[row]) for row in missing])
+        return array("i", cached)
+
+    def _cache_key(self) -> tuple:
+        return (*self._model_key, self.rule_scorer.config.key())
+
+    def _score_uncached(
+        self,
+        full_names: Sequence[str],
+        titles: Sequence[str],
+        companies: Sequence[str],
+        profile_urls: Sequence[str],
+    ) -> array:
+        masks = self.rule_scorer.match_columns(full_names, titles, companies, profile_urls)
+        title_logits = map(self._memoized_logit, titles, repeat(self._title_logits), repeat("t"))
+        company_logits = map(self._memoized_logit, companies, repeat(self._company_logits), repeat("c"))
+        url_logits = map(self._url_logit, profile_urls)
+        mask_logits = map(self._mask_logits.__getitem__, masks)
+        return array("i", map(_probability_score, title_logits, company_logits, url_logits, mask_logits))
+
+    def _memoized_logit(self, value: str, memo: dict[str, float], field: str) -> float:
+        logit = memo.get(value)
+        if logit is None:
+            weights = self.weights
+            logit = sum(weights[index] for index in _features(field, value, len(weights)))
+            if len(memo) >= _MAX_MEMO_ENTRIES:
+                memo.clear()
+            memo[value] = logit
+        return logit
+
+    def _url_logit(self, profile_url: str) -> float:
+        # Slugs are unique per lead, so this is the one field hashed on every uncached call.
+        weights = self.weights
+        mask = len(weights) - 1
+        seed = _FIELD_SEEDS["u"]
+        logit = self.bias
+        for token in _tokens(_url_path(profile_url)):
+            logit += weights[crc32(token, seed) & mask]
+        return logit
+
+
+def _tokens(value: str) -> list[bytes]:
+    return value.lower().encode().translate(_SEPARATORS).split()
+
+
+def _features(field: str, value: str, size: int) -> list[int]:
+    seed = _FIELD_SEEDS[field]
+    mask = size - 1
+    return [crc32(token, seed) & mask for token in _tokens(value)]
+
+
+def _url_path(profile_url: str) -> str:
+    # Only the path carries signal; the scheme and host are the same for every LinkedIn profile.
+    return profile_url.partition("://")[2].partition("/")[2]
+
+
+def _url_features(profile_url: str, size: int) -> list[int]:
+    return _features("u", _url_path(profile_url), size)
+
+
+def _sigmoid(logit: float) -> float:
+    if logit >= 0:
+        return 1.0 / (1.0 + math.exp(-logit))
+    odds = math.exp(logit)
+    return odds / (1.0 + odds)
+
+
+def _probability_score(title_logit: float, company_logit: float, url_logit: float, mask_logit: float) -> int:
+    return round(100 * _sigmoid(title_logit + company_logit + url_logit + mask_logit))
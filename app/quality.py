@@ -0,0 +1,216 @@
+from array import array
+from dataclasses import dataclass, field
+from itertools import groupby
+from typing import Protocol, Sequence
+
+from .crm import CRMOutcomeSync, OutcomeStatus, ScoringQualitySnapshot
+from .scoring import ICPRuleConfig, RuleBasedScorer
+from .store import LeadStore
+
+DEFAULT_HIGH_SCORE_THRESHOLD = 70
+
+
+class ColumnScorer(Protocol):
+    def score_columns(
+        self,
+        full_names: Sequence[str],
+        titles: Sequence[str],
+        companies: Sequence[str],
+        profile_urls: Sequence[str],
+    ) -> array:
+        ...
+
+
+@dataclass(slots=True)
+class LabeledLeads:
+    """CRM labels joined to lead fields as aligned columns, one row per labeled lead."""
+
+    lead_ids: array = field(default_factory=lambda: array("q"))
+    won: array = field(default_factory=lambda: array("B"))
+    revenue: array = field(default_factory=lambda: array("d"))
+    full_names: list[str] = field(default_factory=list)
+    titles: list[str] = field(default_factory=list)
+    companies: list[str] = field(default_factory=list)
+    profile_urls: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.lead_ids)
+
+
+@dataclass(slots=True)
+class ScoreDecile:
+    decile: int
+    leads: int
+    min_score: int
+    max_score: int
+    won: int
+    win_rate: float
+    revenue: float
+
+
+@dataclass(slots=True)
+class CalibrationBin:
+    score: int
+    leads: int
+    expected_win_rate: float
+    observed_win_rate: float
+
+
+@dataclass(slots=True)
+class ScoringQualityReport:
+    snapshot: ScoringQualitySnapshot
+    deciles: list[ScoreDecile]
+    calibration: list[CalibrationBin]
+    auc: float | None
+    top_decile_revenue_lift: float | None
+
+
+class ScoringQualityEngine:
+    """PRD Step 7: how well scores predicted CRM outcomes, and how a candidate config would have done.
+
+    Labels are joined to leads once into aligned columns; each evaluation then scores
+    those columns in bulk and derives every metric from one sort of the scores.
+    """
+
+    def __init__(
+        self,
+        store: LeadStore,
+        crm: CRMOutcomeSync,
+        scorer: RuleBasedScorer,
+        high_score_threshold: int = DEFAULT_HIGH_SCORE_THRESHOLD,
+    ) -> None:
+        self.store = store
+        self.crm = crm
+        self.scorer = scorer
+        self.high_score_threshold = high_score_threshold
+
+    def labeled_leads(self) -> LabeledLeads:
+        """Leads with a won or lost deal; revenue is the sum of their won deal values."""
+        labels: dict[int, list] = {}
+        for record in self.crm.list_outcomes():
+            if record.status == OutcomeStatus.OPEN:
+                continue
+            label = labels.setdefault(record.lead_id, [False, 0.0])
+            if record.status == OutcomeStatus.WON:
+                label[0] = True
+                label[1] += record.deal_value or 0.0
+        columns = LabeledLeads()
+        for lead in self.store.get_many(labels):
+            won, revenue = labels[lead.id]
+            columns.lead_ids.append(lead.id)
+            columns.won.append(won)
+            columns.revenue.append(revenue)
+            columns.full_names.append(lead.full_name)
+            columns.titles.append(lead.title)
+            columns.companies.append(lead.company)
+            columns.profile_urls.append(lead.profile_url)
+        return columns
+
+    def report(self, labeled: LabeledLeads | None = None) -> ScoringQualityReport:
+        return self.evaluate(self.scorer, labeled, max_score=self.scorer.config.max_score)
+
+    def backtest(self, config: ICPRuleConfig, labeled: LabeledLeads | None = None) -> ScoringQualityReport:
+        """Report for ``config`` over the same labels, without touching the live scorer or its cache."""
+        return self.evaluate(RuleBasedScorer(config), labeled, max_score=config.max_score)
+
+    def evaluate(
+        self,
+        scorer: ColumnScorer,
+        labeled: LabeledLeads | None = None,
+        max_score: int = 100,
+    ) -> ScoringQualityReport:
+        """Report for any columnar scorer, e.g. a trained model next to the rules."""
+        labeled = labeled if labeled is not None else self.labeled_leads()
+        scores = scorer.score_columns(labeled.full_names, labeled.titles, labeled.companies, labeled.profile_urls)
+        return summarize_quality(
+            scores,
+            labeled.won,
+            labeled.revenue,
+            high_score_threshold=self.high_score_threshold,
+            max_score=max_score,
+        )
+
+
+def summarize_quality(
+    scores: Sequence[int],
+    won: Sequence[int],
+    revenue: Sequence[float],
+    high_score_threshold: int = DEFAULT_HIGH_SCORE_THRESHOLD,
+    max_score: int = 100,
+) -> ScoringQualityReport:
+    """Deciles, calibration, AUC and top-decile revenue lift from aligned score/label columns.
+
+    Rows are sorted by score once; deciles are position slices of that order (decile 1
+    holds the highest scores), calibration groups equal scores, and AUC is the tie-aware
+    rank statistic accumulated over the same groups.
+    """
+    total = len(scores)
+    if not (len(won) == len(revenue) == total):
+        raise ValueError("scores, won and revenue must be aligned")
+    order = sorted(range(total), key=scores.__getitem__, reverse=True)
+    sorted_scores = list(map(scores.__getitem__, order))
+    sorted_won = list(map(won.__getitem__, order))
+    sorted_revenue = list(map(revenue.__getitem__, order))
+    total_won = sum(sorted_won)
+    total_lost = total - total_won
+    total_revenue = sum(sorted_revenue)
+
+    deciles: list[ScoreDecile] = []
+    for decile in range(1, 11):
+        lo, hi = -(-(decile - 1) * total // 10), -(-decile * total // 10)
+        if lo < hi:
+            decile_won = sum(sorted_won[lo:hi])
+            deciles.append(
+                ScoreDecile(
+                    decile=decile,
+                    leads=hi - lo,
+                    min_score=sorted_scores[hi - 1],
+                    max_score=sorted_scores[lo],
+                    won=decile_won,
+                    win_rate=decile_won / (hi - lo),
+                    revenue=sum(sorted_revenue[lo:hi]),
+                )
+            )
+
+    calibration: list[CalibrationBin] = []
+    high_count = high_won = 0
+    wins_above = 0
+    auc_pairs = 0.0
+    position = 0
+    for score, group in groupby(sorted_scores):
+        # One group of equal scores, highest first.
+        group_size = sum(1 for _ in group)
+        group_won = sum(sorted_won[position : position + group_size])
+        group_lost = group_size - group_won
+        # Each loss here is outranked by every win above it and ties half of the wins beside it.
+        auc_pairs += group_lost * (wins_above + 0.5 * group_won)
+        wins_above += group_won
+        if score >= high_score_threshold:
+            high_count += group_size
+            high_won += group_won
+        calibration.append(
+            CalibrationBin(
+                score=score,
+                leads=group_size,
+                expected_win_rate=min(max(score / max_score, 0.0), 1.0) if max_score else 0.0,
+                observed_win_rate=group_won / group_size,
+            )
+        )
+        position += group_size
+
+    calibration.reverse()
+    top_revenue = deciles[0].revenue if deciles else 0.0
+    top_share = deciles[0].leads / total if deciles else 0.0
+    return ScoringQualityReport(
+        snapshot=ScoringQualitySnapshot(
+            total_labeled=total,
+            won_count=total_won,
+            high_score_count=high_count,
+            high_score_win_rate=high_won / high_count if high_count else 0.0,
+        ),
+        deciles=deciles,
+        calibration=calibration,
+        auc=auc_pairs / (total_won * total_lost) if total_won and total_lost else None,
+        top_decile_revenue_lift=(top_revenue / total_revenue) / top_share if total_revenue else None,
+    )
+
@@ -1,8 +1,12 @@
+from array import array
 from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from threading import Lock
 
-from .approval import ApprovalStatus, DraftApproval
-from .delivery import DeliveryEvent, DeliveryEventType
+from .approval import ApprovalStatus, ApprovalWorkflow, DraftApproval
+from .delivery import DeliveryEvent, DeliveryEventType, DeliveryTelemetry
 from .models import Lead
+from .store import LeadStore
 
 
 @dataclass(slots=True)
@@ -30,6 +34,15 @@ class ManagerDashboardSnapshot:
     funnel: FunnelMetrics
 
 
+@dataclass(slots=True)
+class RepDailyActivity:
+    day: date
+    reviewer: str
+    drafts_reviewed: int
+    approved_drafts: int
+    rejected_drafts: int
+
+
 class ManagerDashboardBuilder:
     """PRD Step 6: manager-facing activity and conversion funnel summary."""
 
@@ -66,3 +79,261 @@ class ManagerDashboardBuilder:
             complaints=complaints,
         )
         return ManagerDashboardSnapshot(activity=activity, funnel=funnel)
+
+
+class IncrementalDashboard:
+    """PRD Step 6 dashboard maintained from store change notifications.
+
+    Counters move by O(1) per lead, approval or delivery event as the stores
+    change, so ``build`` is constant time and equals ``ManagerDashboardBuilder.build``
+    over the same collections.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._leads = 0
+        self._drafts_submitted = 0
+        self._approval_counts: dict[ApprovalStatus, int] = dict.fromkeys(ApprovalStatus, 0)
+        self._approved_by_lead: dict[int, int] = {}
+        self._delivery_counts: dict[DeliveryEventType, int] = dict.fromkeys(DeliveryEventType, 0)
+
+    def attach(self, store: LeadStore, approvals: ApprovalWorkflow, delivery: DeliveryTelemetry) -> None:
+        store.subscribe(self.on_leads)
+        approvals.subscribe(self.on_approvals)
+        delivery.subscribe(self.on_delivery_events)
+
+    def on_leads(self, change: str, leads: list[Lead]) -> None:
+        with self._lock:
+            if change == "added":
+                self._leads += len(leads)
+            elif change == "removed":
+                self._leads -= len(leads)
+
+    def on_approvals(self, change: str, approvals: list[DraftApproval]) -> None:
+        with self._lock:
+            if change == "submitted":
+                self._drafts_submitted += len(approvals)
+                self._approval_counts[ApprovalStatus.PENDING] += len(approvals)
+            elif change == "reviewed":
+                for item in approvals:
+                    self._approval_counts[ApprovalStatus.PENDING] -= 1
+                    self._approval_counts[item.status] += 1
+                    if item.status == ApprovalStatus.APPROVED:
+                        self._approved_by_lead[item.lead_id] = self._approved_by_lead.get(item.lead_id, 0) + 1
+            elif change == "removed":
+                self._drafts_submitted -= len(approvals)
+                for item in approvals:
+                    self._approval_counts[item.status] -= 1
+                    if item.status == ApprovalStatus.APPROVED:
+                        remaining = self._approved_by_lead[item.lead_id] - 1
+                        if remaining:
+                            self._approved_by_lead[item.lead_id] = remaining
+                        else:
+                            del self._approved_by_lead[item.lead_id]
+
+    def on_delivery_events(self, change: str, events: list[DeliveryEvent]) -> None:
+        with self._lock:
+            if change == "recorded":
+                for event in events:
+                    self._delivery_counts[event.event_type] += 1
+            elif change == "removed":
+                for event in events:
+                    self._delivery_counts[event.event_type] -= 1
+
+    def build(self) -> ManagerDashboardSnapshot:
+        with self._lock:
+            approved = self._approval_counts[ApprovalStatus.APPROVED]
+            rejected = self._approval_counts[ApprovalStatus.REJECTED]
+            activity = ActivityMetrics(
+                leads_ingested=self._leads,
+                drafts_submitted=self._drafts_submitted,
+                drafts_reviewed=approved + rejected,
+                approved_drafts=approved,
+                rejected_drafts=rejected,
+            )
+            funnel = FunnelMetrics(
+                leads_total=self._leads,
+                leads_with_approved_draft=len(self._approved_by_lead),
+                messages_sent=self._delivery_counts[DeliveryEventType.SENT],
+                messages_delivered=self._delivery_counts[DeliveryEventType.DELIVERED],
+                messages_bounced=self._delivery_counts[DeliveryEventType.BOUNCED],
+                complaints=self._delivery_counts[DeliveryEventType.COMPLAINT],
+            )
+            return ManagerDashboardSnapshot(activity=activity, funnel=funnel)
+
+
+# Additive per-bucket counters, in the order of ActivityMetrics then FunnelMetrics.
+_LEADS, _SUBMITTED, _REVIEWED, _APPROVED, _REJECTED, _FIRST_APPROVAL = range(6)
+_DELIVERY_METRIC = {
+    DeliveryEventType.SENT: 6,
+    DeliveryEventType.DELIVERED: 7,
+    DeliveryEventType.BOUNCED: 8,
+    DeliveryEventType.COMPLAINT: 9,
+}
+_METRIC_COUNT = 10
+_EPOCH_DAY = date(1970, 1, 1)
+
+
+class _BucketRing:
+    """Fixed ring of ``slots`` buckets of ``width`` seconds; each bucket is a row in one flat array."""
+
+    def __init__(self, width: int, slots: int) -> None:
+        self.width = width
+        self.slots = slots
+        self.bucket_ids = array("q", [-1]) * slots
+        self.values = array("q", [0]) * (slots * _METRIC_COUNT)
+        self.newest = -1
+
+    def oldest_retained(self) -> int:
+        return self.newest - self.slots + 1
+
+    def add(self, timestamp: float, metric: int) -> None:
+        bucket = int(timestamp // self.width)
+        if bucket < self.oldest_retained():
+            return
+        slot = bucket % self.slots
+        if self.bucket_ids[slot] != bucket:
+            offset = slot * _METRIC_COUNT
+            self.values[offset : offset + _METRIC_COUNT] = array("q", [0]) * _METRIC_COUNT
+            self.bucket_ids[slot] = bucket
+        self.values[slot * _METRIC_COUNT + metric] += 1
+        self.newest = max(self.newest, bucket)
+
+    def covers(self, timestamp: float) -> bool:
+        return int(timestamp // self.width) >= self.oldest_retained()
+
+    def sum(self, start: float, end: float) -> list[int]:
+        totals = [0] * _METRIC_COUNT
+        first = max(int(start // self.width), self.oldest_retained())
+        last = min(-int(-end // self.width) - 1, self.newest)
+        for bucket in range(first, last + 1):
+            slot = bucket % self.slots
+            if self.bucket_ids[slot] == bucket:
+                offset = slot * _METRIC_COUNT
+                for metric in range(_METRIC_COUNT):
+                    totals[metric] += self.values[offset + metric]
+        return totals
+
+
+class FunnelRollups:
+    """Minute/hour/day rollups of the dashboard metrics for windowed queries.
+
+    Each event is counted once per resolution. Minute buckets cover the last day,
+    hour buckets the last 90 days and day buckets ten years; a window is answered
+    from the finest resolution still retaining its start, with edges aligned to that
+    resolution's buckets, so the cost is O(buckets) regardless of event volume.
+    Windowed ``leads_with_approved_draft`` counts leads whose first approval falls
+    in the window. Buckets are anonymous history, so erasures do not rewrite them;
+    per-lead and per-rep state is dropped once the day buckets no longer retain it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        # One extra slot per ring: a window of exactly the horizon straddles horizon + 1 buckets.
+        self._rings = (_BucketRing(60, 24 * 60 + 1), _BucketRing(3600, 90 * 24 + 1), _BucketRing(86400, 3650 + 1))
+        # Lead id -> day of its first approval.
+        self._approved_leads: dict[int, int] = {}
+        self._rep_days: dict[int, dict[str, list[int]]] = {}
+        self._pruned_before = 0
+
+    def attach(self, store: LeadStore, approvals: ApprovalWorkflow, delivery: DeliveryTelemetry) -> None:
+        store.subscribe(self.on_leads)
+        approvals.subscribe(self.on_approvals)
+        delivery.subscribe(self.on_delivery_events)
+
+    def on_leads(self, change: str, leads: list[Lead]) -> None:
+        with self._lock:
+            if change == "added":
+                for lead in leads:
+                    self._add(lead.created_at, _LEADS)
+            elif change == "removed":
+                for lead in leads:
+                    self._approved_leads.pop(lead.id, None)
+
+    def on_approvals(self, change: str, approvals: list[DraftApproval]) -> None:
+        with self._lock:
+            for item in approvals:
+                if change == "submitted":
+                    self._add(item.submitted_at, _SUBMITTED)
+                elif change == "reviewed" and item.reviewed_at is not None:
+                    self._add_review(item, item.reviewed_at)
+
+    def on_delivery_events(self, change: str, events: list[DeliveryEvent]) -> None:
+        if change != "recorded":
+            return
+        with self._lock:
+            for event in events:
+                self._add(event.created_at, _DELIVERY_METRIC[event.event_type])
+
+    def window(self, start: datetime, end: datetime) -> ManagerDashboardSnapshot:
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        with self._lock:
+            ring = next((ring for ring in self._rings if ring.covers(start_ts)), self._rings[-1])
+            totals = ring.sum(start_ts, end_ts)
+        activity = ActivityMetrics(
+            leads_ingested=totals[_LEADS],
+            drafts_submitted=totals[_SUBMITTED],
+            drafts_reviewed=totals[_REVIEWED],
+            approved_drafts=totals[_APPROVED],
+            rejected_drafts=totals[_REJECTED],
+        )
+        funnel = FunnelMetrics(
+            leads_total=totals[_LEADS],
+            leads_with_approved_draft=totals[_FIRST_APPROVAL],
+            messages_sent=totals[_DELIVERY_METRIC[DeliveryEventType.SENT]],
+            messages_delivered=totals[_DELIVERY_METRIC[DeliveryEventType.DELIVERED]],
+            messages_bounced=totals[_DELIVERY_METRIC[DeliveryEventType.BOUNCED]],
+            complaints=totals[_DELIVERY_METRIC[DeliveryEventType.COMPLAINT]],
+        )
+        return ManagerDashboardSnapshot(activity=activity, funnel=funnel)
+
+    def last(self, duration: timedelta, now: datetime | None = None) -> ManagerDashboardSnapshot:
+        end = now or datetime.now(timezone.utc)
+        return self.window(end - duration, end)
+
+    def daily_by_rep(self, start: date, end: date) -> list[RepDailyActivity]:
+        """Review activity per reviewer per UTC day for ``start <= day <= end``."""
+        rows: list[RepDailyActivity] = []
+        with self._lock:
+            for day_number in range((start - _EPOCH_DAY).days, (end - _EPOCH_DAY).days + 1):
+                for reviewer, (reviewed, approved, rejected) in sorted(self._rep_days.get(day_number, {}).items()):
+                    rows.append(
+                        RepDailyActivity(
+                            day=_EPOCH_DAY + timedelta(days=day_number),
+                            reviewer=reviewer,
+                            drafts_reviewed=reviewed,
+                            approved_drafts=approved,
+                            rejected_drafts=rejected,
+                        )
+                    )
+        return rows
+
+    def _add(self, moment: datetime, metric: int) -> None:
+        timestamp = moment.timestamp()
+        for ring in self._rings:
+            ring.add(timestamp, metric)
+
+    def _add_review(self, item: DraftApproval, reviewed_at: datetime) -> None:
+        approved = item.status == ApprovalStatus.APPROVED
+        self._add(reviewed_at, _REVIEWED)
+        self._add(reviewed_at, _APPROVED if approved else _REJECTED)
+        self._prune()
+        day = int(reviewed_at.timestamp() // 86400)
+        if day < self._pruned_before:
+            return
+        if approved and item.lead_id not in self._approved_leads:
+            self._approved_leads[item.lead_id] = day
+            self._add(reviewed_at, _FIRST_APPROVAL)
+        counts = self._rep_days.setdefault(day, {}).setdefault(item.reviewer or "", [0, 0, 0])
+        counts[0] += 1
+        counts[1 if approved else 2] += 1
+
+    def _prune(self) -> None:
+        cutoff = self._rings[-1].oldest_retained()
+        if cutoff <= self._pruned_before:
+            return
+        self._pruned_before = cutoff
+        for day in [day for day in self._rep_days if day < cutoff]:
+            del self._rep_days[day]
+        for lead_id in [lead_id for lead_id, day in self._approved_leads.items() if day < cutoff]:
+            del self._approved_leads[lead_id]
@@ -0,0 +1,73 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from threading import Event, Thread
+from typing import Callable, Protocol
+
+from .main import DEFAULT_RETENTION_BATCH_SIZE, LeadIngestionService
+
+logger = logging.getLogger(__name__)
+
+
+class SweepLease(Protocol):
+    def acquire(self) -> bool:
+        """Take or renew the lease; ``False`` while another worker holds it."""
+
+    def release(self) -> None:
+        ...
+
+
+class RetentionSweeper:
+    """Background thread that erases leads older than ``max_age`` every ``interval_seconds``.
+
+    With a ``lease`` shared between workers, only the worker holding it sweeps.
+    """
+
+    def __init__(
+        self,
+        service: LeadIngestionService,
+        max_age: timedelta,
+        interval_seconds: float = 3600.0,
+        batch_size: int = DEFAULT_RETENTION_BATCH_SIZE,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+        lease: SweepLease | None = None,
+    ) -> None:
+        if max_age <= timedelta(0):
+            raise ValueError("max_age must be positive")
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+        self.service = service
+        self.max_age = max_age
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._clock = clock
+        self.lease = lease
+        self._stopped = Event()
+        self._thread: Thread | None = None
+
+    def run_once(self) -> int:
+        return self.service.enforce_retention(self._clock() - self.max_age, self.batch_size)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise ValueError("retention sweeper already started")
+        self._stopped.clear()
+        self._thread = Thread(target=self._run, name="retention-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.lease is not None:
+            self.lease.release()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                if self.lease is None or self.lease.acquire():
+                    self.run_once()
+            except Exception:
+                # A failed run (e.g. a full disk during compaction) is retried next interval.
+                logger.exception("retention sweep failed")
+            self._stopped.wait(self.interval_seconds)
@@ -1,6 +1,44 @@
-from dataclasses import dataclass
+import re
+from array import array
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Callable, Iterable, Sequence
 
-from .models import InboundLead
+from .models import InboundLead, Lead
+
+TITLE_MATCH = 1
+COMPANY_MATCH = 2
+LINKEDIN_PROFILE = 4
+RECORD_COMPLETE = 8
+
+# (bit, rule, reason when matched, reason when not matched), in breakdown order.
+_RULES: tuple[tuple[int, str, str, str], ...] = (
+    (
+        TITLE_MATCH,
+        "title_keyword_match",
+        "Title matched ICP seniority/function keywords",
+        "No ICP title keywords matched",
+    ),
+    (
+        COMPANY_MATCH,
+        "company_keyword_match",
+        "Company matched ICP industry keywords",
+        "No ICP company keywords matched",
+    ),
+    (
+        LINKEDIN_PROFILE,
+        "linkedin_profile_detected",
+        "LinkedIn profile URL is present",
+        "LinkedIn profile URL not detected",
+    ),
+    (
+        RECORD_COMPLETE,
+        "record_completeness",
+        "Lead record has complete core fields",
+        "Lead record missing one or more core fields",
+    ),
+)
 
 
 @dataclass(slots=True)
@@ -14,6 +52,27 @@ class ICPRuleConfig:
     linkedin_profile_points: int = 15
     completeness_points: int = 25
 
+    def key(self) -> tuple:
+        """Value identity of the config; cheaper than ``astuple`` on the per-lead path."""
+        return (
+            self.title_keywords,
+            self.company_keywords,
+            self.min_score,
+            self.max_score,
+            self.title_match_points,
+            self.company_match_points,
+            self.linkedin_profile_points,
+            self.completeness_points,
+        )
+
+    def rule_points(self) -> tuple[int, ...]:
+        return (
+            self.title_match_points,
+            self.company_match_points,
+            self.linkedin_profile_points,
+            self.completeness_points,
+        )
+
 
 @dataclass(slots=True)
 class ScoreBreakdownItem:
@@ -25,82 +84,282 @@ class ScoreBreakdownItem:
 
 @dataclass(slots=True)
 class LeadScoreResult:
+    """Capped score plus the matched-rule bitmask; ``breakdown`` is built on first access."""
+
     score: int
-    breakdown: list[ScoreBreakdownItem]
+    matched_rules: int
+    rule_points: tuple[int, ...] = field(repr=False)
+    _breakdown: list[ScoreBreakdownItem] | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def breakdown(self) -> list[ScoreBreakdownItem]:
+        if self._breakdown is None:
+            self._breakdown = [
+                ScoreBreakdownItem(
+                    rule=rule,
+                    points=points if self.matched_rules & bit else 0,
+                    matched=bool(self.matched_rules & bit),
+                    reason=matched_reason if self.matched_rules & bit else unmatched_reason,
+                )
+                for (bit, rule, matched_reason, unmatched_reason), points in zip(_RULES, self.rule_points)
+            ]
+        return self._breakdown
+
+
+@dataclass(slots=True)
+class ScoreCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    bypassed: int
+    size: int
+    max_entries: int
+
+
+class ScoreCache:
+    """Bounded LRU of rule masks keyed by lead content, scoped to one ICP config version.
+
+    A lookup under a different config key than the cached entries were stored with
+    drops everything, so editing the ``ICPRuleConfig`` can never serve stale scores.
+    Batches larger than the cache bypass it: an LRU scan over more rows than it holds
+    would evict every entry before the next scan could reuse it.
+    """
+
+    def __init__(self, max_entries: int = 200_000) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self._lock = Lock()
+        self._entries: OrderedDict[tuple[str, str, str, str], int] = OrderedDict()
+        self._config_key: tuple | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypassed = 0
+
+    def admits(self, rows: int) -> bool:
+        """Whether a batch of ``rows`` should use the cache; larger batches are counted as bypassed."""
+        if rows <= self.max_entries:
+            return True
+        with self._lock:
+            self.bypassed += rows
+        return False
+
+    def get(self, config_key: tuple, content: tuple[str, str, str, str]) -> int | None:
+        return self.get_many(config_key, (content,))[0]
+
+    def get_many(self, config_key: tuple, contents: Sequence[tuple[str, str, str, str]]) -> list[int | None]:
+        with self._lock:
+            self._ensure_config(config_key)
+            entries = self._entries
+            found = list(map(entries.get, contents))
+            misses = found.count(None)
+            if misses == 0:
+                deque(map(entries.move_to_end, contents), maxlen=0)
+            else:
+                for content, mask in zip(contents, found):
+                    if mask is not None:
+                        entries.move_to_end(content)
+            self.hits += len(found) - misses
+            self.misses += misses
+            return found
+
+    def put(self, config_key: tuple, content: tuple[str, str, str, str], mask: int) -> None:
+        self.put_many(config_key, ((content, mask),))
+
+    def put_many(self, config_key: tuple, items: Sequence[tuple[tuple[str, str, str, str], int]]) -> None:
+        with self._lock:
+            self._ensure_config(config_key)
+            entries = self._entries
+            for content, mask in items:
+                entries[content] = mask
+                entries.move_to_end(content)
+            overflow = len(entries) - self.max_entries
+            for _ in range(max(overflow, 0)):
+                entries.popitem(last=False)
+            self.evictions += max(overflow, 0)
+
+    def discard_many(self, contents: Iterable[tuple[str, str, str, str]]) -> None:
+        with self._lock:
+            for content in contents:
+                self._entries.pop(content, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> ScoreCacheStats:
+        with self._lock:
+            return ScoreCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                bypassed=self.bypassed,
+                size=len(self._entries),
+                max_entries=self.max_entries,
+            )
+
+    def _ensure_config(self, config_key: tuple) -> None:
+        if config_key != self._config_key:
+            self._entries.clear()
+            self._config_key = config_key
 
 
 class RuleBasedScorer:
     """Deterministic ICP scorer for PRD Step 2."""
 
-    def __init__(self, config: ICPRuleConfig | None = None) -> None:
+    def __init__(self, config: ICPRuleConfig | None = None, cache: ScoreCache | None = None) -> None:
         self.config = config or ICPRuleConfig()
+        self.cache = cache
+        self._compiled_key: tuple | None = None
+        self._title_matcher: Callable[[str], bool] = _never_matches
+        self._company_matcher: Callable[[str], bool] = _never_matches
+        self._rule_points: tuple[int, ...] = ()
+        self._score_table: tuple[int, ...] = ()
 
-    def score_lead(self, lead: InboundLead) -> LeadScoreResult:
-        breakdown: list[ScoreBreakdownItem] = []
-
-        title = lead.title.lower()
-        title_match = any(keyword in title for keyword in self.config.title_keywords)
-        breakdown.append(
-            ScoreBreakdownItem(
-                rule="title_keyword_match",
-                points=self.config.title_match_points if title_match else 0,
-                matched=title_match,
-                reason=(
-                    "Title matched ICP seniority/function keywords"
-                    if title_match
-                    else "No ICP title keywords matched"
-                ),
-            )
+    def score_lead(self, lead: InboundLead | Lead) -> LeadScoreResult:
+        mask = self.match_rules(lead)
+        return LeadScoreResult(score=self._score_table[mask], matched_rules=mask, rule_points=self._rule_points)
+
+    def score_value(self, lead: InboundLead | Lead) -> int:
+        """Score-only fast path for ranking: no result object, no explanation."""
+        mask = self.match_rules(lead)
+        return self._score_table[mask]
+
+    def match_rules(self, lead: InboundLead | Lead) -> int:
+        self._compile()
+        if self.cache is not None:
+            content = (lead.full_name, lead.title, lead.company, lead.profile_url)
+            mask = self.cache.get(self._compiled_key, content)
+            if mask is not None:
+                return mask
+        mask = _rule_mask(
+            self._title_matcher(lead.title.lower()),
+            self._company_matcher(lead.company.lower()),
+            lead.full_name,
+            lead.title,
+            lead.company,
+            lead.profile_url,
         )
+        if self.cache is not None:
+            self.cache.put(self._compiled_key, content, mask)
+        return mask
 
-        company = lead.company.lower()
-        company_match = any(keyword in company for keyword in self.config.company_keywords)
-        breakdown.append(
-            ScoreBreakdownItem(
-                rule="company_keyword_match",
-                points=self.config.company_match_points if company_match else 0,
-                matched=company_match,
-                reason=(
-                    "Company matched ICP industry keywords"
-                    if company_match
-                    else "No ICP company keywords matched"
-                ),
-            )
+    def forget(self, leads: Iterable[InboundLead | Lead]) -> None:
+        """Drop cached entries for erased leads; the cache is keyed by their personal data."""
+        if self.cache is not None:
+            self.cache.discard_many((lead.full_name, lead.title, lead.company, lead.profile_url) for lead in leads)
+
+    def score_many(self, leads: Sequence[InboundLead | Lead]) -> array:
+        """Score leads in bulk; the result is aligned with ``leads`` for joining back to ids."""
+        return self.score_columns(
+            full_names=[lead.full_name for lead in leads],
+            titles=[lead.title for lead in leads],
+            companies=[lead.company for lead in leads],
+            profile_urls=[lead.profile_url for lead in leads],
         )
 
-        linkedin_match = "linkedin.com" in lead.profile_url.lower()
-        breakdown.append(
-            ScoreBreakdownItem(
-                rule="linkedin_profile_detected",
-                points=self.config.linkedin_profile_points if linkedin_match else 0,
-                matched=linkedin_match,
-                reason=(
-                    "LinkedIn profile URL is present"
-                    if linkedin_match
-                    else "LinkedIn profile URL not detected"
-                ),
+    def score_columns(
+        self,
+        full_names: Sequence[str],
+        titles: Sequence[str],
+        companies: Sequence[str],
+        profile_urls: Sequence[str],
+    ) -> array:
+        """Columnar scoring: keywords are matched with one compiled pattern per field."""
+        masks = self.match_columns(full_names, titles, companies, profile_urls)
+        return array("i", map(self._score_table.__getitem__, masks))
+
+    def match_columns(
+        self,
+        full_names: Sequence[str],
+        titles: Sequence[str],
+        companies: Sequence[str],
+        profile_urls: Sequence[str],
+    ) -> array:
+        self._compile()
+        if self.cache is None or not self.cache.admits(len(full_names)):
+            return self._match_uncached(full_names, titles, companies, profile_urls)
+
+        contents = list(zip(full_names, titles, companies, profile_urls))
+        cached = self.cache.get_many(self._compiled_key, contents)
+        missing = [row for row, mask in enumerate(cached) if mask is None]
+        if missing:
+            computed = self._match_uncached(
+                [full_names[row] for row in missing],
+                [titles[row] for row in missing],
+                [companies[row] for row in missing],
+                [profile_urls[row] for row in missing],
             )
-        )
+            for row, mask in zip(missing, computed):
+                cached[row] = mask
+            self.cache.put_many(self._compiled_key, [(contents[row], cached[row]) for row in missing])
+        return array("B", cached)
 
-        complete = all(
-            [
-                bool(lead.full_name.strip()),
-                bool(lead.title.strip()),
-                bool(lead.company.strip()),
-                bool(lead.profile_url.strip()),
-            ]
+    def _match_uncached(
+        self,
+        full_names: Sequence[str],
+        titles: Sequence[str],
+        companies: Sequence[str],
+        profile_urls: Sequence[str],
+    ) -> array:
+        title_matches = map(self._title_matcher, map(str.lower, titles))
+        company_matches = map(self._company_matcher, map(str.lower, companies))
+        return array(
+            "B",
+            map(_rule_mask, title_matches, company_matches, full_names, titles, companies, profile_urls),
         )
-        breakdown.append(
-            ScoreBreakdownItem(
-                rule="record_completeness",
-                points=self.config.completeness_points if complete else 0,
-                matched=complete,
-                reason="Lead record has complete core fields"
-                if complete
-                else "Lead record missing one or more core fields",
+
+    def score_for_mask(self, mask: int) -> int:
+        self._compile()
+        return self._score_table[mask]
+
+    def _compile(self) -> None:
+        key = self.config.key()
+        if key == self._compiled_key:
+            return
+        config = self.config
+        self._title_matcher = _keyword_matcher(config.title_keywords)
+        self._company_matcher = _keyword_matcher(config.company_keywords)
+        self._rule_points = config.rule_points()
+        self._score_table = tuple(
+            max(
+                config.min_score,
+                min(
+                    sum(points for (bit, *_), points in zip(_RULES, self._rule_points) if mask & bit),
+                    config.max_score,
+                ),
             )
+            for mask in range(1 << len(_RULES))
         )
+        self._compiled_key = key
+
+
+def _rule_mask(
+    title_match: bool,
+    company_match: bool,
+    full_name: str,
+    title: str,
+    company: str,
+    profile_url: str,
+) -> int:
+    mask = TITLE_MATCH if title_match else 0
+    if company_match:
+        mask |= COMPANY_MATCH
+    if "linkedin.com" in profile_url.lower():
+        mask |= LINKEDIN_PROFILE
+    if full_name.strip() and title.strip() and company.strip() and profile_url.strip():
+        mask |= RECORD_COMPLETE
+    return mask
+
+
+def _keyword_matcher(keywords: tuple[str, ...]) -> Callable[[str], bool]:
+    """One alternation regex per keyword set; equivalent to ``any(k in text for k in keywords)``."""
+    if not keywords:
+        return _never_matches
+    pattern = re.compile("|".join(re.escape(keyword) for keyword in keywords))
+    return lambda text: pattern.search(text) is not None
+
 
-        raw_score = sum(item.points for item in breakdown)
-        capped_score = max(self.config.min_score, min(raw_score, self.config.max_score))
-        return LeadScoreResult(score=capped_score, breakdown=breakdown)
+def _never_matches(text: str) -> bool:
+    return False
@@ -0,0 +1,113 @@
+import json
+import types
+import typing
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Iterable
+
+Encoder = Callable[[Any], dict[str, Any]]
+
+_ENCODERS: dict[type, Encoder] = {}
+_SEQUENCE_ORIGINS = (list, tuple, set, frozenset, typing.Sequence, typing.Iterable)
+
+
+def encoder_for(cls: type) -> Encoder:
+    """Return a compiled ``asdict`` replacement for dataclass ``cls``.
+
+    The encoder is generated once per type from its field annotations: enums become their
+    values, dates and datetimes ISO strings, and nested dataclasses call their own encoders.
+    Nothing is deep-copied, so the result shares lists of primitives with the object.
+    """
+    encoder = _ENCODERS.get(cls)
+    if encoder is None:
+        encoder = _ENCODERS[cls] = _compile(cls)
+    return encoder
+
+
+def to_jsonable(value: Any) -> Any:
+    encoder = _ENCODERS.get(type(value))
+    if encoder is not None:
+        return encoder(value)
+    if is_dataclass(value) and not isinstance(value, type):
+        return encoder_for(type(value))(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+# Matches the separators and flags FastAPI's JSONResponse uses, so payloads are byte-identical.
+_JSON = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=to_jsonable)
+
+
+def dumps(value: Any) -> bytes:
+    """Encode ``value`` as JSON bytes; dataclasses may appear at any depth."""
+    return _JSON.encode(value).encode()
+
+
+def dumps_lines(values: Iterable[Any]) -> bytes:
+    """Encode ``values`` as NDJSON, one object per line."""
+    lines = "\n".join(map(_JSON.encode, values))
+    return (lines + "\n").encode() if lines else b""
+
+
+def _compile(cls: type) -> Encoder:
+    if not is_dataclass(cls):
+        raise TypeError(f"{cls.__name__} is not a dataclass")
+    hints = typing.get_type_hints(cls)
+    namespace: dict[str, Any] = {}
+    items = []
+    for item in fields(cls):
+        ref = f"obj.{item.name}"
+        items.append(f"{item.name!r}: {_expression(hints.get(item.name, Any), ref, namespace, 0) or ref}")
+    source = f"def encode(obj):\n    return {{{', '.join(items)}}}\n"
+    exec(source, namespace)
+    encoder = namespace["encode"]
+    encoder.__qualname__ = f"encode_{cls.__name__}"
+    return encoder
+
+
+def _expression(hint: Any, ref: str, namespace: dict[str, Any], depth: int) -> str | None:
+    """Python source converting ``ref`` to JSON-ready data, or None when it already is."""
+    origin = typing.get_origin(hint)
+    if origin in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(hint) if arg is not type(None)]
+        if len(args) != 1:
+            namespace["_generic"] = _generic
+            return f"_generic({ref})"
+        inner = _expression(args[0], ref, namespace, depth)
+        return f"(None if {ref} is None else {inner})" if inner is not None else None
+    if origin in _SEQUENCE_ORIGINS:
+        args = typing.get_args(hint)
+        item = f"item{depth}"
+        inner = _expression(args[0], item, namespace, depth + 1) if len(args) >= 1 and args[0] is not ... else None
+        if inner is None:
+            return None if origin in (list, tuple) else f"list({ref})"
+        return f"[{inner} for {item} in {ref}]"
+    if origin is dict:
+        args = typing.get_args(hint)
+        value = f"value{depth}"
+        inner = _expression(args[1], value, namespace, depth + 1) if len(args) == 2 else None
+        if inner is None:
+            return None
+        return f"{{key{depth}: {inner} for key{depth}, {value} in {ref}.items()}}"
+    if not isinstance(hint, type):
+        return None
+    if issubclass(hint, Enum):
+        return f"{ref}.value"
+    if issubclass(hint, (datetime, date)):
+        return f"{ref}.isoformat()"
+    if is_dataclass(hint):
+        name = f"_encode_{hint.__name__}_{id(hint):x}"
+        namespace[name] = encoder_for(hint)
+        return f"{name}({ref})"
+    return None
+
+
+def _generic(value: Any) -> Any:
+    # Unions of several types are resolved per value; containers are left to the JSON encoder.
+    if value is None or isinstance(value, (str, int, float, bool, list, tuple, dict)):
+        return value
+    return to_jsonable(value)
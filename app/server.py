@@ -1,18 +1,53 @@
-from dataclasses import asdict
-from fastapi import FastAPI, HTTPException
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Awaitable, Callable, Iterator
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
-from .main import LeadIngestionService
-from .messaging import MessageCTA, MessageGenerationControls, MessageTemplate, MessageTone
-from .models import DataSource, InboundLead
+from .approval import ApprovalWorkflow, DraftApproval
+from .crm_connector import CRMOutcomePuller, CRMRequestError, HTTPConnectionPool
+from .delivery import DeliveryEventType, DeliveryTelemetry, OutboundChannel, ProviderDeliveryEvent
+from .dispatch import SMTPConnectionPool
+from .governance import AuditLog
+from .main import DEFAULT_INGEST_CHUNK_SIZE, DEFAULT_LEAD_PAGE_SIZE, LeadIngestionService
+from .messaging import (
+    DEFAULT_DRAFT_BATCH_SIZE,
+    MessageCTA,
+    MessageGenerationControls,
+    MessageTemplate,
+    MessageTone,
+)
+from .models import DataSource, InboundLead, IngestProgress, IngestRejection
+from .persistence import FileAuditBackend, FileCursorStore, FileLeadBackend
+from .predictive import HashedLogisticScorer
+from .retention import RetentionSweeper
+from .scoring import ICPRuleConfig, ScoreCache
+from .serialization import dumps, dumps_lines
+from .shared_state import (
+    SharedStateDatabase,
+    SQLiteApprovalBackend,
+    SQLiteAuditBackend,
+    SQLiteDeliveryBackend,
+    SQLiteLeadBackend,
+    SQLiteLease,
+)
+from .store import LeadFilter, LeadStore
 
 
 class InboundLeadPayload(BaseModel):
-    full_name: str = Field(min_length=2)
-    title: str = Field(min_length=2)
-    company: str = Field(min_length=2)
+    # Field rules are enforced per row by the service so one bad row doesn't fail the batch.
+    full_name: str
+    title: str
+    company: str
     profile_url: str
-    source: DataSource
+    source: str
 
 
 class IngestPayload(BaseModel):
@@ -20,14 +55,168 @@ class IngestPayload(BaseModel):
     leads: list[InboundLeadPayload] = Field(min_length=1)
 
 
+class ScoreLeadsPayload(BaseModel):
+    lead_ids: list[int] | None = None
+    include_model: bool = False
+
+
+class TrainModelPayload(BaseModel):
+    epochs: int = Field(default=5, ge=1, le=50)
+
+
+class ICPRuleConfigPayload(BaseModel):
+    title_keywords: list[str] = Field(min_length=1)
+    company_keywords: list[str] = Field(min_length=1)
+    min_score: int = 0
+    max_score: int = Field(default=100, ge=1)
+    title_match_points: int = 35
+    company_match_points: int = 25
+    linkedin_profile_points: int = 15
+    completeness_points: int = 25
+
+
 class MessageControlsPayload(BaseModel):
     tone: MessageTone
     template: MessageTemplate
     cta: MessageCTA
 
 
-app = FastAPI(title="Linkedin Leads Service", version="0.1.0")
-service = LeadIngestionService()
+class CampaignDraftsPayload(BaseModel):
+    lead_ids: list[int] = Field(min_length=1)
+    controls: MessageControlsPayload
+    submit_for_approval: bool = False
+    batch_size: int = Field(default=DEFAULT_DRAFT_BATCH_SIZE, ge=1, le=10_000)
+
+
+class ReviewPayload(BaseModel):
+    revision_ids: list[int] = Field(min_length=1, max_length=1_000)
+    reviewer: str = Field(min_length=2)
+    approve: bool
+    review_notes: str | None = None
+
+
+class ProviderEventPayload(BaseModel):
+    provider_message_id: str = Field(min_length=1)
+    lead_id: int
+    recipient: str
+    subject: str = ""
+    event_type: DeliveryEventType
+    channel: OutboundChannel = OutboundChannel.EMAIL
+
+
+class DeliveryWebhookPayload(BaseModel):
+    events: list[ProviderEventPayload] = Field(min_length=1, max_length=10_000)
+
+
+class SendRecipientPayload(BaseModel):
+    lead_id: int
+    recipient: str
+
+
+class SendApprovedPayload(BaseModel):
+    recipients: list[SendRecipientPayload] = Field(min_length=1, max_length=10_000)
+
+
+class ErasePayload(BaseModel):
+    lead_ids: list[int] = Field(min_length=1, max_length=10_000)
+    requested_by: str = Field(min_length=2)
+
+
+MAX_REPORTED_STREAM_REJECTIONS = 100
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    # The audit writer is a daemon thread: without this, queued events and the last segment's index are lost.
+    if retention_sweeper is not None:
+        await run_in_threadpool(retention_sweeper.stop)
+    if service.email_dispatcher is not None:
+        await service.email_dispatcher.transport.close()
+    await run_in_threadpool(service.close)
+    if shared_state is not None:
+        shared_state.close()
+    service.draft_executor.shutdown(cancel_futures=True)
+
+
+app = FastAPI(title="Linkedin Leads Service", version="0.1.0", lifespan=_lifespan)
+
+_data_dir = os.environ.get("LEADS_DATA_DIR")
+_shared_db = os.environ.get("LEADS_SHARED_DB")
+# LEADS_SHARED_DB lets several uvicorn workers serve one consistent set of leads.
+shared_state = SharedStateDatabase(_shared_db) if _shared_db else None
+if shared_state is not None:
+    _store = LeadStore(backend=SQLiteLeadBackend(shared_state))
+    _audit = AuditLog(backend=SQLiteAuditBackend(shared_state))
+elif _data_dir:
+    _store = LeadStore(backend=FileLeadBackend(_data_dir))
+    _audit = AuditLog(backend=FileAuditBackend(os.path.join(_data_dir, "audit")))
+else:
+    _store, _audit = None, None
+service = LeadIngestionService(
+    store=_store,
+    approvals=ApprovalWorkflow(backend=SQLiteApprovalBackend(shared_state)) if shared_state is not None else None,
+    delivery=DeliveryTelemetry(backend=SQLiteDeliveryBackend(shared_state)) if shared_state is not None else None,
+    audit=_audit,
+    email_transport=(
+        SMTPConnectionPool(
+            os.environ["SMTP_HOST"],
+            int(os.environ.get("SMTP_PORT", "25")),
+            sender=os.environ.get("SMTP_SENDER", "sdr-team@localhost"),
+            starttls=os.environ.get("SMTP_STARTTLS") == "1",
+            username=os.environ.get("SMTP_USERNAME"),
+            password=os.environ.get("SMTP_PASSWORD"),
+        )
+        if "SMTP_HOST" in os.environ
+        else None
+    ),
+    draft_executor=ProcessPoolExecutor(
+        max_workers=int(os.environ.get("DRAFT_WORKERS", "0")) or None,
+        mp_context=multiprocessing.get_context("spawn"),
+    ),
+)
+_model_path = os.path.join(_data_dir, "lead-model.bin") if _data_dir else None
+if _model_path is not None and os.path.exists(_model_path):
+    service.model = HashedLogisticScorer.load(_model_path, service.scorer, cache=ScoreCache())
+_crm_url = os.environ.get("CRM_BASE_URL")
+crm_puller = (
+    CRMOutcomePuller(
+        service.crm,
+        HTTPConnectionPool(
+            _crm_url,
+            headers={"Authorization": f"Bearer {os.environ['CRM_API_TOKEN']}"} if "CRM_API_TOKEN" in os.environ else None,
+        ),
+        FileCursorStore(os.path.join(_data_dir or ".", "crm.cursor")),
+    )
+    if _crm_url
+    else None
+)
+_retention_days = int(os.environ.get("LEAD_RETENTION_DAYS", "0"))
+# Workers sharing a database elect one sweeper; the lease outlives two missed hourly runs.
+_retention_lease = (
+    SQLiteLease(shared_state, "retention-sweeper", ttl_seconds=3 * 3600) if shared_state is not None else None
+)
+retention_sweeper = (
+    RetentionSweeper(service, max_age=timedelta(days=_retention_days), lease=_retention_lease)
+    if _retention_days
+    else None
+)
+if retention_sweeper is not None:
+    retention_sweeper.start()
+
+
+def _json(content: object) -> Response:
+    # Returning a Response skips FastAPI's response-model validation and jsonable_encoder pass.
+    return Response(dumps(content), media_type="application/json")
+
+
+if shared_state is not None:
+
+    @app.middleware("http")
+    async def refresh_shared_state(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        # Apply other workers' commits first, so each request sees everything written before it began.
+        await run_in_threadpool(service.refresh)
+        return await call_next(request)
 
 
 @app.get("/health")
@@ -35,8 +224,29 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/v1/compliance")
+def compliance() -> Response:
+    return _json(service.compliance.snapshot())
+
+
+@app.get("/v1/dashboard")
+def dashboard() -> Response:
+    return _json(service.dashboard.build())
+
+
+@app.get("/v1/dashboard/window")
+def dashboard_window(hours: int = Query(default=24, ge=1, le=24 * 3650)) -> Response:
+    return _json(service.rollups.last(timedelta(hours=hours)))
+
+
+@app.get("/v1/dashboard/reps")
+def dashboard_reps(days: int = Query(default=7, ge=1, le=366)) -> Response:
+    today = datetime.now(timezone.utc).date()
+    return _json(service.rollups.daily_by_rep(today - timedelta(days=days - 1), today))
+
+
 @app.post("/v1/leads/ingest")
-def ingest(payload: IngestPayload) -> dict:
+def ingest(payload: IngestPayload) -> Response:
     try:
         response = service.ingest(
             provider_name=payload.provider_name,
@@ -51,18 +261,207 @@ def ingest(payload: IngestPayload) -> dict:
                 for item in payload.leads
             ],
         )
-        return asdict(response)
+        return _json(response)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
+@app.post("/v1/leads/ingest/stream")
+async def ingest_stream(
+    request: Request,
+    provider_name: str,
+    chunk_size: int = Query(default=DEFAULT_INGEST_CHUNK_SIZE, ge=1, le=50_000),
+) -> Response:
+    """Bulk ingest from an NDJSON body (one lead object per line), committed chunk by chunk."""
+    try:
+        progress = service.start_ingest_stream(provider_name)
+        rejections: list[IngestRejection] = []
+        chunk: list[InboundLead | ValueError] = []
+        async for lead in _ndjson_leads(request.stream()):
+            chunk.append(lead)
+            if len(chunk) >= chunk_size:
+                await run_in_threadpool(service.ingest_chunk, progress, chunk)
+                _keep_rejections(rejections, progress)
+                chunk = []
+        if chunk:
+            await run_in_threadpool(service.ingest_chunk, progress, chunk)
+            _keep_rejections(rejections, progress)
+        if progress.chunks_committed == 0:
+            raise ValueError("at least one lead is required")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return _json(
+        {
+            "provider_name": progress.provider_name,
+            "chunks_committed": progress.chunks_committed,
+            "rows_processed": progress.rows_processed,
+            "accepted": progress.accepted,
+            "rejected": progress.rejected,
+            "duplicates": progress.duplicates,
+            "rejections": rejections,
+        }
+    )
+
+
+def _keep_rejections(rejections: list[IngestRejection], progress: IngestProgress) -> None:
+    room = MAX_REPORTED_STREAM_REJECTIONS - len(rejections)
+    rejections.extend(progress.chunk_rejections[:room])
+
+
+async def _ndjson_leads(body: AsyncIterator[bytes]) -> AsyncIterator[InboundLead | ValueError]:
+    # Malformed lines are yielded as their error and rejected in place, so the summary
+    # always matches what earlier chunks already committed.
+    pending = b""
+    line_number = 0
+    async for data in body:
+        pending += data
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield _parse_ndjson_lead(line, line_number)
+    if pending.strip():
+        yield _parse_ndjson_lead(pending, line_number + 1)
+
+
+def _parse_ndjson_lead(line: bytes, line_number: int) -> InboundLead | ValueError:
+    try:
+        item = json.loads(line)
+        return InboundLead(
+            full_name=str(item["full_name"]),
+            title=str(item["title"]),
+            company=str(item["company"]),
+            profile_url=str(item["profile_url"]),
+            source=str(item["source"]),
+        )
+    except (KeyError, TypeError, ValueError) as exc:
+        return ValueError(f"line {line_number}: invalid lead record ({exc})")
+
+
+def _lead_filter(
+    source: DataSource | None = None,
+    company: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> LeadFilter:
+    return LeadFilter(source=source, company=company, created_from=created_from, created_to=created_to)
+
+
 @app.get("/v1/leads")
-def list_leads() -> list[dict]:
-    return [asdict(item) for item in service.list_leads()]
+def list_leads(
+    lead_filter: LeadFilter = Depends(_lead_filter),
+    after_id: int | None = None,
+    limit: int = Query(default=DEFAULT_LEAD_PAGE_SIZE, ge=1, le=1_000),
+    min_score: int | None = Query(default=None, ge=0),
+) -> Response:
+    page = service.list_leads_page(after_id, limit, lead_filter, min_score)
+    return _json({"items": page.leads, "next_after_id": page.next_after_id})
+
+
+@app.get("/v1/leads/stream")
+def stream_leads(
+    lead_filter: LeadFilter = Depends(_lead_filter),
+    min_score: int | None = Query(default=None, ge=0),
+) -> StreamingResponse:
+    """NDJSON, one lead per line, read from the store one page at a time."""
+
+    def lines() -> Iterator[bytes]:
+        for leads in service.iter_leads(lead_filter, min_score, page_size=1_000):
+            yield dumps_lines(leads)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.post("/v1/leads/scores")
+def score_leads(payload: ScoreLeadsPayload) -> Response:
+    if not payload.include_model:
+        return _json([{"lead_id": lead_id, "score": score} for lead_id, score in service.score_leads(payload.lead_ids)])
+    try:
+        scores = service.score_leads_side_by_side(payload.lead_ids)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return _json(
+        [{"lead_id": lead_id, "score": score, "model_score": model_score} for lead_id, score, model_score in scores]
+    )
+
+
+@app.get("/v1/scoring/cache")
+def score_cache_stats() -> Response:
+    cache = service.scorer.cache
+    return _json(cache.stats() if cache is not None else {})
+
+
+@app.get("/v1/scoring/quality")
+def scoring_quality() -> Response:
+    return _json(service.quality.report())
+
+
+@app.post("/v1/scoring/model/train")
+def train_model(payload: TrainModelPayload) -> Response:
+    try:
+        model = service.train_model(epochs=payload.epochs)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    if _model_path is not None:
+        model.save(_model_path)
+    rules, predictive = service.compare_scorers()
+    return _json({"rules": rules, "model": predictive})
+
+
+@app.get("/v1/scoring/model/compare")
+def compare_scorers() -> Response:
+    try:
+        rules, predictive = service.compare_scorers()
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return _json({"rules": rules, "model": predictive})
+
+
+@app.post("/v1/scoring/backtest")
+def backtest_scoring(candidate: ICPRuleConfigPayload) -> Response:
+    labeled = service.quality.labeled_leads()
+    config = ICPRuleConfig(
+        **{
+            **candidate.model_dump(),
+            "title_keywords": tuple(candidate.title_keywords),
+            "company_keywords": tuple(candidate.company_keywords),
+        }
+    )
+    return _json(
+        {
+            "current": service.quality.report(labeled),
+            "candidate": service.quality.backtest(config, labeled),
+        }
+    )
+
+
+@app.post("/v1/leads/erase")
+def erase_leads(payload: ErasePayload) -> Response:
+    try:
+        return _json(service.erase_leads(payload.lead_ids, payload.requested_by))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@app.get("/v1/leads/{lead_id}")
+def get_lead(lead_id: int) -> Response:
+    try:
+        return _json(service.get_lead(lead_id))
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@app.get("/v1/leads/{lead_id}/score")
+def explain_score(lead_id: int) -> Response:
+    try:
+        result = service.explain_score(lead_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return _json({"lead_id": lead_id, "score": result.score, "breakdown": result.breakdown})
 
 
 @app.post("/v1/leads/{lead_id}/draft")
-def generate_draft(lead_id: int, controls: MessageControlsPayload) -> dict:
+def generate_draft(lead_id: int, controls: MessageControlsPayload) -> Response:
     try:
         draft = service.generate_message_draft(
             lead_id=lead_id,
@@ -72,11 +471,110 @@ def generate_draft(lead_id: int, controls: MessageControlsPayload) -> dict:
                 cta=controls.cta,
             ),
         )
-        return {
-            "subject": draft.subject,
-            "body": draft.body,
-            "controls": asdict(draft.controls),
-            "personalization": [asdict(item) for item in draft.personalization],
-        }
+        return _json(draft)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@app.post("/v1/campaigns/drafts")
+def generate_campaign_drafts(payload: CampaignDraftsPayload) -> StreamingResponse:
+    """Stream NDJSON, one line per generated batch, so clients see progress on large campaigns."""
+    batches = service.generate_campaign_drafts(
+        lead_ids=payload.lead_ids,
+        controls=MessageGenerationControls(
+            tone=payload.controls.tone,
+            template=payload.controls.template,
+            cta=payload.controls.cta,
+        ),
+        submit_for_approval=payload.submit_for_approval,
+        batch_size=payload.batch_size,
+    )
+
+    def lines() -> Iterator[bytes]:
+        for batch in batches:
+            drafts = [
+                {
+                    "lead_id": item.lead_id,
+                    "revision_id": item.revision_id,
+                    "subject": item.draft.subject,
+                    "body": item.draft.body,
+                }
+                for item in batch
+            ]
+            yield dumps({"drafts": drafts}) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.get("/v1/approvals/pending")
+def pending_approvals(
+    limit: int = Query(default=50, ge=1, le=500),
+    after_revision_id: int | None = None,
+) -> Response:
+    items = service.approvals.pending_queue(limit=limit, after_revision_id=after_revision_id)
+    return _json(
+        {
+            "pending_total": service.approvals.pending_count(),
+            "items": [_approval_summary(item) for item in items],
+            "next_after_revision_id": items[-1].revision_id if len(items) == limit else None,
+        }
+    )
+
+
+@app.post("/v1/approvals/review")
+def review_approvals(payload: ReviewPayload) -> Response:
+    try:
+        items = service.approvals.review_many(
+            payload.revision_ids,
+            reviewer=payload.reviewer,
+            approve=payload.approve,
+            review_notes=payload.review_notes,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return _json([_approval_summary(item) for item in items])
+
+
+def _approval_summary(item: DraftApproval) -> dict:
+    return {
+        "revision_id": item.revision_id,
+        "lead_id": item.lead_id,
+        "status": item.status.value,
+        "subject": item.draft.subject,
+        "reviewer": item.reviewer,
+        "submitted_at": item.submitted_at.isoformat(),
+    }
+
+
+@app.post("/v1/crm/pull")
+def pull_crm_outcomes(full: bool = False) -> Response:
+    if crm_puller is None:
+        raise HTTPException(status_code=404, detail="CRM_BASE_URL is not configured")
+    try:
+        return _json(crm_puller.pull(full=full))
+    except (CRMRequestError, OSError) as exc:
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
+
+
+@app.post("/v1/delivery/send")
+async def send_approved_drafts(payload: SendApprovedPayload) -> Response:
+    if service.email_dispatcher is None:
+        raise HTTPException(status_code=404, detail="SMTP_HOST is not configured")
+    report = await service.send_approved_drafts((item.lead_id, item.recipient) for item in payload.recipients)
+    return _json(report)
+
+
+@app.post("/v1/delivery/webhooks")
+def delivery_webhook(payload: DeliveryWebhookPayload) -> Response:
+    result = service.delivery.record_provider_events(
+        ProviderDeliveryEvent(
+            provider_message_id=item.provider_message_id,
+            lead_id=item.lead_id,
+            recipient=item.recipient,
+            subject=item.subject,
+            event_type=item.event_type,
+            channel=item.channel,
+        )
+        for item in payload.events
+    )
+    return _json({"accepted": result.accepted, "duplicates": result.duplicates, "unknown_leads": result.unknown_leads})
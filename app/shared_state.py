@@ -0,0 +1,499 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from .approval import ApprovalStatus, DraftApproval
+from .delivery import SUPPRESSING_EVENT_TYPES, DeliveryEvent, DeliveryEventType, OutboundChannel
+from .governance import AuditEvent
+from .messaging import (
+    MessageCTA,
+    MessageDraft,
+    MessageGenerationControls,
+    MessageTemplate,
+    MessageTone,
+    PersonalizationEvidence,
+)
+from .models import Lead
+from .persistence import _lead_from_row, _row_from_lead
+from .serialization import dumps
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    id INTEGER PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    full_name TEXT,
+    title TEXT,
+    company TEXT,
+    profile_url TEXT,
+    source TEXT,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS leads_seq ON leads (seq);
+CREATE TABLE IF NOT EXISTS approvals (
+    revision_id INTEGER PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    lead_id INTEGER NOT NULL,
+    payload TEXT
+);
+CREATE INDEX IF NOT EXISTS approvals_seq ON approvals (seq);
+CREATE TABLE IF NOT EXISTS delivery_events (
+    event_id INTEGER PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    lead_id INTEGER NOT NULL,
+    channel TEXT,
+    recipient TEXT,
+    subject TEXT,
+    event_type TEXT,
+    created_at TEXT,
+    provider_message_id TEXT
+);
+CREATE INDEX IF NOT EXISTS delivery_events_seq ON delivery_events (seq);
+CREATE TABLE IF NOT EXISTS delivery_suppressions (
+    recipient TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    event_type TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS delivery_suppressions_seq ON delivery_suppressions (seq);
+CREATE TABLE IF NOT EXISTS audit_events (
+    event_id INTEGER PRIMARY KEY,
+    action TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS audit_events_action ON audit_events (action, created_at);
+CREATE INDEX IF NOT EXISTS audit_events_created_at ON audit_events (created_at);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    holder TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+_LEAD_COLUMNS = "id, full_name, title, company, profile_url, source, created_at"
+_EVENT_COLUMNS = "event_id, lead_id, channel, recipient, subject, event_type, created_at, provider_message_id"
+
+
+class SharedStateDatabase:
+    """SQLite file in WAL mode shared by the worker processes of one node.
+
+    Writers take SQLite's database-wide write lock with ``BEGIN IMMEDIATE``, so one
+    process writes at a time and ids are allocated from a consistent view; WAL lets
+    readers in every process continue meanwhile. Each process keeps its in-memory
+    indexes and catches up on rows other processes changed through ``seq`` columns.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], timeout: float = 30.0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(self.path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # Commits survive a process crash; only an OS crash can lose the last few.
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        # Erased rows are overwritten on disk instead of lingering in free pages.
+        self._connection.execute("PRAGMA secure_delete=ON")
+        self._connection.executescript(_SCHEMA)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Hold the cross-process write lock; the transaction commits when the block exits cleanly."""
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def read(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    def write(self, sql: str, rows: list[tuple]) -> None:
+        with self._lock:
+            self._connection.executemany(sql, rows)
+
+    def data_version(self) -> int:
+        """Changes whenever another connection commits, so idle followers skip their queries."""
+        with self._lock:
+            return self._connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def checkpoint(self) -> None:
+        """Copy the WAL into the database file and truncate it."""
+        with self._lock:
+            self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class _SharedBackend:
+    """Follows the ``seq`` column of some tables so each process reads only rows changed elsewhere."""
+
+    def __init__(self, database: SharedStateDatabase, tables: tuple[str, ...]) -> None:
+        self.database = database
+        self._seqs = dict.fromkeys(tables, 0)
+        self._data_version: int | None = None
+
+    def transaction(self) -> Any:
+        return self.database.transaction()
+
+    def close(self) -> None:
+        """The database is shared between components, so its owner closes it."""
+
+    def _start_following(self) -> None:
+        # Read the version first: anything committed after it shows up as a new version.
+        self._data_version = self.database.data_version()
+        for table in self._seqs:
+            self._seqs[table] = self.database.read(f"SELECT COALESCE(MAX(seq), 0) FROM {table}")[0][0]
+
+    def _stale(self) -> bool:
+        version = self.database.data_version()
+        if version == self._data_version:
+            return False
+        self._data_version = version
+        return True
+
+    def _rows_since(self, table: str, columns: str) -> list[tuple]:
+        rows = self.database.read(
+            f"SELECT seq, {columns} FROM {table} WHERE seq > ? ORDER BY seq", (self._seqs[table],)
+        )
+        if rows:
+            self._seqs[table] = rows[-1][0]
+        return [row[1:] for row in rows]
+
+    def _reserve(self, table: str, count: int) -> int:
+        """First of ``count`` new ``seq`` values; call inside ``transaction`` after catching up."""
+        first = self.database.read(f"SELECT COALESCE(MAX(seq), 0) FROM {table}")[0][0] + 1
+        self._seqs[table] = first + count - 1
+        return first
+
+
+class SQLiteLeadBackend(_SharedBackend):
+    """``LeadStoreBackend`` over the shared database; erased leads leave an id-only tombstone."""
+
+    def __init__(self, database: SharedStateDatabase) -> None:
+        super().__init__(database, ("leads",))
+
+    def load(self) -> tuple[list[Lead], int]:
+        with self.database.transaction():
+            self._start_following()
+            rows = self.database.read(f"SELECT {_LEAD_COLUMNS} FROM leads WHERE deleted = 0 ORDER BY id")
+            max_id = self.database.read("SELECT COALESCE(MAX(id), 0) FROM leads")[0][0]
+        return [_lead_from_row(row) for row in rows], max_id + 1
+
+    def append(self, leads: list[Lead]) -> None:
+        self._save(leads)
+
+    def update(self, leads: list[Lead]) -> None:
+        self._save(leads)
+
+    def delete(self, lead_ids: list[int]) -> None:
+        first = self._reserve("leads", len(lead_ids))
+        self.database.write(
+            "UPDATE leads SET seq = ?, deleted = 1, full_name = NULL, title = NULL, company = NULL,"
+            " profile_url = NULL, source = NULL, created_at = NULL WHERE id = ?",
+            [(first + offset, lead_id) for offset, lead_id in enumerate(lead_ids)],
+        )
+
+    def needs_snapshot(self) -> bool:
+        return False
+
+    def begin_snapshot(self, leads: Any, next_id: int) -> Callable[[], None]:
+        # Rows are already compact in SQLite; checkpointing drops erased values from the WAL file.
+        return self.database.checkpoint
+
+    def changes(self) -> tuple[list[Lead], list[int]]:
+        if not self._stale():
+            return [], []
+        saved: list[Lead] = []
+        deleted_ids: list[int] = []
+        for deleted, *row in self._rows_since("leads", f"deleted, {_LEAD_COLUMNS}"):
+            if deleted:
+                deleted_ids.append(row[0])
+            else:
+                saved.append(_lead_from_row(row))
+        return saved, deleted_ids
+
+    def _save(self, leads: list[Lead]) -> None:
+        if not leads:
+            return
+        first = self._reserve("leads", len(leads))
+        self.database.write(
+            f"INSERT OR REPLACE INTO leads (seq, {_LEAD_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(first + offset, *_row_from_lead(lead)) for offset, lead in enumerate(leads)],
+        )
+
+
+class SQLiteApprovalBackend(_SharedBackend):
+    """``ApprovalBackend`` over the shared database; each revision is one JSON row."""
+
+    def __init__(self, database: SharedStateDatabase) -> None:
+        super().__init__(database, ("approvals",))
+
+    def load(self) -> list[DraftApproval]:
+        with self.database.transaction():
+            self._start_following()
+            rows = self.database.read(
+                "SELECT payload FROM approvals WHERE payload IS NOT NULL ORDER BY revision_id"
+            )
+        return [_approval_from_json(json.loads(payload)) for (payload,) in rows]
+
+    def save(self, items: list[DraftApproval]) -> None:
+        first = self._reserve("approvals", len(items))
+        self.database.write(
+            "INSERT OR REPLACE INTO approvals (seq, revision_id, lead_id, payload) VALUES (?, ?, ?, ?)",
+            [
+                (first + offset, item.revision_id, item.lead_id, dumps(item).decode())
+                for offset, item in enumerate(items)
+            ],
+        )
+
+    def delete(self, revision_ids: list[int]) -> None:
+        first = self._reserve("approvals", len(revision_ids))
+        self.database.write(
+            "UPDATE approvals SET seq = ?, payload = NULL WHERE revision_id = ?",
+            [(first + offset, revision_id) for offset, revision_id in enumerate(revision_ids)],
+        )
+
+    def changes(self) -> tuple[list[DraftApproval], list[int]]:
+        if not self._stale():
+            return [], []
+        saved: list[DraftApproval] = []
+        deleted_ids: list[int] = []
+        for revision_id, payload in self._rows_since("approvals", "revision_id, payload"):
+            if payload is None:
+                deleted_ids.append(revision_id)
+            else:
+                saved.append(_approval_from_json(json.loads(payload)))
+        return saved, deleted_ids
+
+
+class SQLiteDeliveryBackend(_SharedBackend):
+    """``DeliveryBackend`` over the shared database; suppressions outlive erased events."""
+
+    def __init__(self, database: SharedStateDatabase) -> None:
+        super().__init__(database, ("delivery_events", "delivery_suppressions"))
+
+    def load(self) -> tuple[list[DeliveryEvent], dict[str, DeliveryEventType]]:
+        with self.database.transaction():
+            self._start_following()
+            rows = self.database.read(
+                f"SELECT {_EVENT_COLUMNS} FROM delivery_events WHERE deleted = 0 ORDER BY event_id"
+            )
+            suppressed = self.database.read("SELECT recipient, event_type FROM delivery_suppressions")
+        return [_event_from_row(row) for row in rows], {
+            recipient: DeliveryEventType(event_type) for recipient, event_type in suppressed
+        }
+
+    def append(self, events: list[DeliveryEvent]) -> None:
+        if not events:
+            return
+        first = self._reserve("delivery_events", len(events))
+        self.database.write(
+            f"INSERT INTO delivery_events (seq, {_EVENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(first + offset, *_row_from_event(event)) for offset, event in enumerate(events)],
+        )
+        suppressing = [event for event in events if event.event_type in SUPPRESSING_EVENT_TYPES]
+        if suppressing:
+            first = self._reserve("delivery_suppressions", len(suppressing))
+            self.database.write(
+                "INSERT OR IGNORE INTO delivery_suppressions (recipient, seq, event_type) VALUES (?, ?, ?)",
+                [
+                    (event.recipient.strip().lower(), first + offset, event.event_type.value)
+                    for offset, event in enumerate(suppressing)
+                ],
+            )
+
+    def delete(self, event_ids: list[int]) -> None:
+        first = self._reserve("delivery_events", len(event_ids))
+        self.database.write(
+            "UPDATE delivery_events SET seq = ?, deleted = 1, channel = NULL, recipient = NULL, subject = NULL,"
+            " event_type = NULL, created_at = NULL, provider_message_id = NULL WHERE event_id = ?",
+            [(first + offset, event_id) for offset, event_id in enumerate(event_ids)],
+        )
+
+    def changes(self) -> tuple[list[DeliveryEvent], list[int], dict[str, DeliveryEventType]]:
+        if not self._stale():
+            return [], [], {}
+        saved: list[DeliveryEvent] = []
+        deleted_ids: list[int] = []
+        for deleted, *row in self._rows_since("delivery_events", f"deleted, {_EVENT_COLUMNS}"):
+            if deleted:
+                deleted_ids.append(row[0])
+            else:
+                saved.append(_event_from_row(row))
+        suppressed = {
+            recipient: DeliveryEventType(event_type)
+            for recipient, event_type in self._rows_since("delivery_suppressions", "recipient, event_type")
+        }
+        return saved, deleted_ids, suppressed
+
+
+class SQLiteAuditBackend(_SharedBackend):
+    """``AuditLogBackend`` over the shared database; queries use the (action, created_at) index."""
+
+    def __init__(self, database: SharedStateDatabase) -> None:
+        super().__init__(database, ())
+        self._last_event_id = 0
+
+    def load(self) -> tuple[int, int]:
+        self._data_version = self.database.data_version()
+        count, last_event_id = self.database.read("SELECT COUNT(*), COALESCE(MAX(event_id), 0) FROM audit_events")[0]
+        self._last_event_id = last_event_id
+        return count, last_event_id + 1
+
+    def append(self, event: AuditEvent) -> None:
+        self.database.write(
+            "INSERT INTO audit_events (event_id, action, created_at, payload) VALUES (?, ?, ?, ?)",
+            [(event.event_id, event.action, _utc_text(event.created_at), json.dumps(event.payload))],
+        )
+        self._last_event_id = event.event_id
+
+    def query(
+        self,
+        actions: frozenset[str] | None,
+        start: datetime | None,
+        end: datetime | None,
+    ) -> list[AuditEvent]:
+        clauses: list[str] = []
+        params: list[str] = []
+        if actions is not None:
+            if not actions:
+                return []
+            clauses.append(f"action IN ({', '.join('?' * len(actions))})")
+            params.extend(sorted(actions))
+        if start is not None:
+            clauses.append("created_at >= ?")
+            params.append(_utc_text(start))
+        if end is not None:
+            clauses.append("created_at < ?")
+            params.append(_utc_text(end))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.database.read(
+            f"SELECT event_id, action, created_at, payload FROM audit_events{where} ORDER BY event_id", tuple(params)
+        )
+        return [_audit_event_from_row(row) for row in rows]
+
+    def flush(self) -> None:
+        """Appends are durable once their transaction commits."""
+
+    def changes(self) -> list[AuditEvent]:
+        if not self._stale():
+            return []
+        rows = self.database.read(
+            "SELECT event_id, action, created_at, payload FROM audit_events WHERE event_id > ? ORDER BY event_id",
+            (self._last_event_id,),
+        )
+        if rows:
+            self._last_event_id = rows[-1][0]
+        return [_audit_event_from_row(row) for row in rows]
+
+
+class SQLiteLease:
+    """Named lease in the shared database so one worker runs a periodic job at a time.
+
+    ``acquire`` takes a free or expired lease, or renews the one this instance holds; if the
+    holder dies, another worker takes over once ``ttl_seconds`` have passed.
+    """
+
+    def __init__(
+        self,
+        database: SharedStateDatabase,
+        name: str,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        self.database = database
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.holder = f"{os.getpid()}-{uuid.uuid4().hex}"
+        self._clock = clock
+
+    def acquire(self) -> bool:
+        now = self._clock()
+        with self.database.transaction():
+            self.database.write(
+                "INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?) ON CONFLICT (name) DO UPDATE"
+                " SET holder = excluded.holder, expires_at = excluded.expires_at"
+                " WHERE leases.holder = excluded.holder OR leases.expires_at <= ?",
+                [(self.name, self.holder, now + self.ttl_seconds, now)],
+            )
+            return self.database.read("SELECT holder FROM leases WHERE name = ?", (self.name,))[0][0] == self.holder
+
+    def release(self) -> None:
+        with self.database.transaction():
+            self.database.write("DELETE FROM leases WHERE name = ? AND holder = ?", [(self.name, self.holder)])
+
+
+def _utc_text(value: datetime) -> str:
+    # One fixed-width UTC format keeps string comparisons in SQL chronological.
+    return value.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _audit_event_from_row(row: tuple) -> AuditEvent:
+    event_id, action, created_at, payload = row
+    return AuditEvent(event_id, action, json.loads(payload), datetime.fromisoformat(created_at))
+
+
+def _row_from_event(event: DeliveryEvent) -> tuple:
+    return (
+        event.event_id,
+        event.lead_id,
+        event.channel.value,
+        event.recipient,
+        event.subject,
+        event.event_type.value,
+        event.created_at.isoformat(),
+        event.provider_message_id,
+    )
+
+
+def _event_from_row(row: tuple) -> DeliveryEvent:
+    event_id, lead_id, channel, recipient, subject, event_type, created_at, provider_message_id = row
+    return DeliveryEvent(
+        event_id=event_id,
+        lead_id=lead_id,
+        channel=OutboundChannel(channel),
+        recipient=recipient,
+        subject=subject,
+        event_type=DeliveryEventType(event_type),
+        created_at=datetime.fromisoformat(created_at),
+        provider_message_id=provider_message_id,
+    )
+
+
+def _approval_from_json(data: dict[str, Any]) -> DraftApproval:
+    draft = data["draft"]
+    controls = draft["controls"]
+    return DraftApproval(
+        lead_id=data["lead_id"],
+        revision_id=data["revision_id"],
+        draft=MessageDraft(
+            subject=draft["subject"],
+            body=draft["body"],
+            controls=MessageGenerationControls(
+                tone=MessageTone(controls["tone"]),
+                template=MessageTemplate(controls["template"]),
+                cta=MessageCTA(controls["cta"]),
+            ),
+            personalization=[PersonalizationEvidence(**item) for item in draft["personalization"]],
+        ),
+        status=ApprovalStatus(data["status"]),
+        reviewer=data["reviewer"],
+        review_notes=data["review_notes"],
+        submitted_at=datetime.fromisoformat(data["submitted_at"]),
+        reviewed_at=datetime.fromisoformat(data["reviewed_at"]) if data["reviewed_at"] is not None else None,
+    )
@@ -1,31 +1,489 @@
-from threading import Lock
+import logging
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from operator import attrgetter
+from threading import Condition, Lock, Thread
+from typing import Callable, Iterable, Iterator
 
-from .models import InboundLead, Lead
+from .models import DataSource, DuplicatePolicy, InboundLead, Lead, lead_fingerprint, normalize_profile_url
+from .persistence import LeadStoreBackend
+
+
+logger = logging.getLogger(__name__)
+
+LeadListener = Callable[[str, list[Lead]], None]
+
+SNAPSHOT_CHUNK_SIZE = 1_024
+
+_lead_id = attrgetter("id")
+
+
+@dataclass(slots=True)
+class UpsertResult:
+    created: list[Lead] = field(default_factory=list)
+    duplicates: list[tuple[int, Lead]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class LeadFilter:
+    source: DataSource | None = None
+    company: str | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+    def __post_init__(self) -> None:
+        # Lead timestamps are UTC-aware; naive bounds (e.g. from a query string) are read as UTC.
+        if self.created_from is not None and self.created_from.tzinfo is None:
+            self.created_from = self.created_from.replace(tzinfo=timezone.utc)
+        if self.created_to is not None and self.created_to.tzinfo is None:
+            self.created_to = self.created_to.replace(tzinfo=timezone.utc)
+
+    def matches(self, lead: Lead) -> bool:
+        if self.source is not None and lead.source != self.source:
+            return False
+        if self.created_from is not None and lead.created_at < self.created_from:
+            return False
+        return self.created_to is None or lead.created_at < self.created_to
+
+
+@dataclass(frozen=True, slots=True)
+class LeadSnapshot:
+    """Immutable, id-ordered view of the store at one ``version``.
+
+    Leads live in tuples of up to ``SNAPSHOT_CHUNK_SIZE``. Writers copy only the chunks
+    they touch and publish a new snapshot, so readers never take the store lock.
+    """
+
+    version: int = 0
+    chunks: tuple[tuple[Lead, ...], ...] = ()
+    first_ids: tuple[int, ...] = ()
+    size: int = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Lead]:
+        for chunk in self.chunks:
+            yield from chunk
+
+    def leads(self) -> list[Lead]:
+        # Extending chunk by chunk lets writer threads run between chunks.
+        leads: list[Lead] = []
+        for chunk in self.chunks:
+            leads.extend(chunk)
+        return leads
+
+    def scan(
+        self,
+        after_id: int | None = None,
+        max_rows: int = 1_000,
+        lead_filter: LeadFilter | None = None,
+    ) -> tuple[list[Lead], int | None]:
+        chunks = self.chunks
+        index = offset = 0
+        if after_id is not None and chunks:
+            index = max(bisect_right(self.first_ids, after_id) - 1, 0)
+            offset = bisect_right(chunks[index], after_id, key=_lead_id)
+        matches: list[Lead] = []
+        last_id = after_id
+        budget = max_rows
+        while index < len(chunks) and budget:
+            chunk = chunks[index]
+            rows = chunk[offset : offset + budget]
+            if rows:
+                budget -= len(rows)
+                last_id = rows[-1].id
+                matches.extend(rows if lead_filter is None else filter(lead_filter.matches, rows))
+            offset += len(rows)
+            if offset >= len(chunk):
+                index, offset = index + 1, 0
+        return matches, last_id if index < len(chunks) else None
+
+    def appended(self, leads: list[Lead]) -> "LeadSnapshot":
+        """Return a snapshot with ``leads`` (ascending, newer than every id here) at the end."""
+        if not leads:
+            return self
+        chunks = list(self.chunks)
+        first_ids = list(self.first_ids)
+        start = 0
+        if chunks and len(chunks[-1]) < SNAPSHOT_CHUNK_SIZE:
+            start = SNAPSHOT_CHUNK_SIZE - len(chunks[-1])
+            chunks[-1] += tuple(leads[:start])
+        for begin in range(start, len(leads), SNAPSHOT_CHUNK_SIZE):
+            chunk = tuple(leads[begin : begin + SNAPSHOT_CHUNK_SIZE])
+            chunks.append(chunk)
+            first_ids.append(chunk[0].id)
+        return LeadSnapshot(self.version + 1, tuple(chunks), tuple(first_ids), self.size + len(leads))
+
+    def replaced(self, leads: list[Lead]) -> "LeadSnapshot":
+        """Return a snapshot where ``leads`` replace the stored leads with the same ids."""
+        if not leads:
+            return self
+        updates = {lead.id: lead for lead in leads}
+        chunks = list(self.chunks)
+        for index in {self._chunk_index(lead_id) for lead_id in updates}:
+            chunks[index] = tuple(updates.get(lead.id, lead) for lead in chunks[index])
+        return LeadSnapshot(self.version + 1, tuple(chunks), self.first_ids, self.size)
+
+    def without(self, lead_ids: list[int]) -> "LeadSnapshot":
+        """Return a snapshot without ``lead_ids``, which must all be present."""
+        if not lead_ids:
+            return self
+        removed = set(lead_ids)
+        chunks = list(self.chunks)
+        for index in {self._chunk_index(lead_id) for lead_id in removed}:
+            chunks[index] = tuple(lead for lead in chunks[index] if lead.id not in removed)
+        kept = tuple(chunk for chunk in chunks if chunk)
+        return LeadSnapshot(self.version + 1, kept, tuple(chunk[0].id for chunk in kept), self.size - len(removed))
+
+    def _chunk_index(self, lead_id: int) -> int:
+        return bisect_right(self.first_ids, lead_id) - 1
 
 
 class LeadStore:
-    def __init__(self) -> None:
+    def __init__(self, backend: LeadStoreBackend | None = None, fingerprint_index: bool = False) -> None:
         self._lock = Lock()
-        self._items: list[Lead] = []
+        self._by_id: dict[int, Lead] = {}
+        # Readers use the published snapshot without the lock; writers replace it under the lock.
+        self._snapshot = LeadSnapshot()
+        self._by_profile_url: dict[str, int] = {}
+        # Sorted ids per company, so a company-filtered page bisects instead of sorting.
+        self._by_company: dict[str, list[int]] = {}
+        self._by_fingerprint: dict[str, int] | None = {} if fingerprint_index else None
+        # created_at-ordered (created_at, id) pairs for retention; erased ids are skipped lazily.
+        self._by_created_at: deque[tuple[datetime, int]] = deque()
         self._next_id = 1
+        self._listeners: list[LeadListener] = []
+        self._backend = backend
+        # Snapshot requests are counted so a compactor run covers every request made before it started.
+        self._compaction = Condition()
+        self._compactions_requested = 0
+        self._compactions_done = 0
+        self._compaction_error: Exception | None = None
+        self._compactor: Thread | None = None
+        self._closing = False
+        if backend is not None:
+            restored, self._next_id = backend.load()
+            for item in restored:
+                self._index(item)
+                self._track_created_at(item)
+            self._snapshot = self._snapshot.appended(sorted(self._by_id.values(), key=_lead_id))
+
+    @property
+    def fingerprint_index(self) -> bool:
+        return self._by_fingerprint is not None
 
     def add_many(self, leads: list[InboundLead]) -> list[Lead]:
-        with self._lock:
-            created: list[Lead] = []
-            for lead in leads:
-                item = Lead(
-                    id=self._next_id,
-                    full_name=lead.full_name,
-                    title=lead.title,
-                    company=lead.company,
-                    profile_url=lead.profile_url,
-                    source=lead.source,
-                )
-                self._items.append(item)
-                created.append(item)
-                self._next_id += 1
+        with self._lock, self._transaction():
+            created = [self._new_lead(lead) for lead in leads]
+            self._commit(created, [])
             return created
 
+    def upsert_many(self, leads: list[InboundLead], policy: DuplicatePolicy = DuplicatePolicy.SKIP) -> UpsertResult:
+        """Insert leads whose profile URL (or fingerprint, if indexed) is unseen.
+
+        Duplicates are matched in O(1) per row against both the store and earlier rows of
+        the same batch, and are reported as ``(row, lead)`` pairs. With ``MERGE`` the
+        existing lead takes the incoming name/title/company/source.
+        """
+        result = UpsertResult()
+        with self._lock, self._transaction():
+            pending_urls: dict[str, Lead] = {}
+            pending_fingerprints: dict[str, Lead] = {}
+            merged: dict[int, Lead] = {}
+            for row, lead in enumerate(leads):
+                url_key = normalize_profile_url(lead.profile_url)
+                fingerprint = (
+                    lead_fingerprint(lead.full_name, lead.company) if self._by_fingerprint is not None else None
+                )
+                batch_match = pending_urls.get(url_key) or pending_fingerprints.get(fingerprint)
+                if batch_match is not None:
+                    result.duplicates.append((row, batch_match))
+                    continue
+
+                existing = self._lookup(self._by_profile_url, url_key, merged)
+                if existing is None and fingerprint is not None:
+                    existing = self._lookup(self._by_fingerprint, fingerprint, merged)
+                if existing is None:
+                    item = self._new_lead(lead)
+                    result.created.append(item)
+                    pending_urls[url_key] = item
+                    if fingerprint is not None:
+                        pending_fingerprints[fingerprint] = item
+                    continue
+
+                if policy == DuplicatePolicy.MERGE:
+                    existing = replace(
+                        existing,
+                        full_name=lead.full_name,
+                        title=lead.title,
+                        company=lead.company,
+                        source=lead.source,
+                    )
+                    merged[existing.id] = existing
+                result.duplicates.append((row, existing))
+            self._commit(result.created, list(merged.values()))
+        return result
+
+    def remove_many(self, lead_ids: Iterable[int]) -> list[Lead]:
+        """Erase leads from every index and the backend; unknown ids are ignored."""
+        with self._lock, self._transaction():
+            removed = self._drop(lead_ids)
+            if removed:
+                if self._backend is not None:
+                    self._backend.delete([item.id for item in removed])
+                    # Logged rows of erased leads leave the files with the next background snapshot.
+                    self.request_compaction()
+                for listener in self._listeners:
+                    listener("removed", removed)
+            return removed
+
+    def refresh(self) -> None:
+        """Apply leads that other processes saved to or deleted from a shared backend."""
+        if self._backend is not None:
+            with self._lock:
+                self._apply_backend_changes()
+
+    def scan(
+        self,
+        after_id: int | None = None,
+        max_rows: int = 1_000,
+        lead_filter: LeadFilter | None = None,
+    ) -> tuple[list[Lead], int | None]:
+        """Examine at most ``max_rows`` leads in id order after ``after_id``.
+
+        Returns the ones matching ``lead_filter`` and the id to resume from, or None once
+        the end is reached, so the cost depends on ``max_rows`` rather than store size.
+        """
+        if max_rows < 1:
+            raise ValueError("max_rows must be positive")
+        if lead_filter is None or lead_filter.company is None:
+            return self._snapshot.scan(after_id, max_rows, lead_filter)
+        with self._lock:
+            ids = self._by_company.get(lead_filter.company.strip().lower(), [])
+            start = 0 if after_id is None else bisect_right(ids, after_id)
+            page_ids = ids[start : start + max_rows]
+            more = start + max_rows < len(ids)
+        matches = [lead for lead in self.get_many(page_ids) if lead_filter.matches(lead)]
+        return matches, page_ids[-1] if more else None
+
+    def take_created_before(self, cutoff: datetime, limit: int) -> list[int]:
+        """Pop up to ``limit`` ids of live leads created before ``cutoff``, oldest first."""
+        with self._lock:
+            queue = self._by_created_at
+            lead_ids: list[int] = []
+            while queue and len(lead_ids) < limit and queue[0][0] < cutoff:
+                lead_id = queue.popleft()[1]
+                if lead_id in self._by_id:
+                    lead_ids.append(lead_id)
+            return lead_ids
+
+    def compact(self) -> None:
+        """Rewrite the backend snapshot, dropping logged rows of erased leads, and wait for it."""
+        self.request_compaction()
+        with self._compaction:
+            target = self._compactions_requested
+            self._compaction.wait_for(lambda: self._compactions_done >= target)
+            if self._compaction_error is not None:
+                raise self._compaction_error
+
+    def request_compaction(self) -> None:
+        """Have the background compactor rewrite the snapshot; requests made while it runs share one run.
+
+        Only switching to a fresh log happens under the store lock, so readers and writers
+        are not held up by the rewrite.
+        """
+        if self._backend is None:
+            return
+        with self._compaction:
+            self._compactions_requested += 1
+            self._compaction.notify_all()
+            if self._compactor is None:
+                self._compactor = Thread(target=self._run_compactor, name="lead-compactor", daemon=True)
+                self._compactor.start()
+
+    def subscribe(self, listener: LeadListener) -> None:
+        """Call ``listener("added", leads)`` for existing and future leads, under the store lock.
+
+        ``remove_many`` later reports erased leads as ``"removed"``.
+        """
+        with self._lock:
+            if self._by_id:
+                listener("added", list(self._by_id.values()))
+            self._listeners.append(listener)
+
+    def get(self, lead_id: int) -> Lead | None:
+        return self._by_id.get(lead_id)
+
+    def issued(self, lead_id: int) -> bool:
+        """Whether ``lead_id`` was ever assigned, including to a lead erased since."""
+        return 0 < lead_id < self._next_id
+
+    def get_many(self, lead_ids: Iterable[int]) -> list[Lead]:
+        by_id = self._by_id
+        return [by_id[lead_id] for lead_id in lead_ids if lead_id in by_id]
+
+    def get_by_profile_url(self, profile_url: str) -> Lead | None:
+        lead_id = self._by_profile_url.get(normalize_profile_url(profile_url))
+        return None if lead_id is None else self._by_id.get(lead_id)
+
+    def find_by_company(self, company: str) -> list[Lead]:
+        with self._lock:
+            lead_ids = list(self._by_company.get(company.strip().lower(), ()))
+        return self.get_many(lead_ids)
+
+    def snapshot(self) -> LeadSnapshot:
+        """The latest published snapshot; it never changes, so it can be read without locking."""
+        return self._snapshot
+
     def list_all(self) -> list[Lead]:
+        return self._snapshot.leads()
+
+    def close(self) -> None:
+        """Finish requested snapshots, then close the backend."""
+        with self._compaction:
+            self._closing = True
+            self._compaction.notify_all()
+            compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
         with self._lock:
-            return list(self._items)
+            if self._backend is not None:
+                self._backend.close()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _new_lead(self, lead: InboundLead) -> Lead:
+        item = Lead(
+            id=self._next_id,
+            full_name=lead.full_name,
+            title=lead.title,
+            company=lead.company,
+            profile_url=lead.profile_url,
+            source=lead.source,
+        )
+        self._next_id += 1
+        return item
+
+    def _lookup(self, index: dict[str, int], key: str, merged: dict[int, Lead]) -> Lead | None:
+        lead_id = index.get(key)
+        if lead_id is None:
+            return None
+        return merged.get(lead_id) or self._by_id[lead_id]
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        # Writers replay other processes' changes first, so id allocation and duplicate checks see them.
+        if self._backend is None:
+            yield
+            return
+        with self._backend.transaction():
+            self._apply_backend_changes()
+            yield
+
+    def _apply_backend_changes(self) -> None:
+        saved, deleted_ids = self._backend.changes()
+        if not saved and not deleted_ids:
+            return
+        self._next_id = max(self._next_id, *(lead.id + 1 for lead in saved), *(lead_id + 1 for lead_id in deleted_ids))
+        created = sorted((lead for lead in saved if lead.id not in self._by_id), key=_lead_id)
+        self._apply(created, [lead for lead in saved if lead.id in self._by_id])
+        removed = self._drop(deleted_ids)
+        if removed:
+            for listener in self._listeners:
+                listener("removed", removed)
+
+    def _commit(self, created: list[Lead], updated: list[Lead]) -> None:
+        if self._backend is not None:
+            self._backend.append(created)
+            self._backend.update(updated)
+        self._apply(created, updated)
+        if self._backend is not None and self._backend.needs_snapshot():
+            with self._compaction:
+                idle = self._compactions_done == self._compactions_requested
+            if idle:
+                self.request_compaction()
+
+    def _run_compactor(self) -> None:
+        while True:
+            with self._compaction:
+                self._compaction.wait_for(lambda: self._compactions_done < self._compactions_requested or self._closing)
+                if self._compactions_done == self._compactions_requested:
+                    return
+                target = self._compactions_requested
+            error = None
+            try:
+                # The published snapshot is immutable, so it is encoded after the lock is released.
+                with self._lock:
+                    write = self._backend.begin_snapshot(self._snapshot, self._next_id)
+                write()
+            except Exception as exc:
+                logger.exception("lead snapshot failed")
+                error = exc
+            with self._compaction:
+                self._compactions_done = target
+                self._compaction_error = error
+                self._compaction.notify_all()
+
+    def _apply(self, created: list[Lead], updated: list[Lead]) -> None:
+        for item in updated:
+            self._unindex(self._by_id[item.id])
+            self._index(item)
+        for item in created:
+            self._index(item)
+            self._track_created_at(item)
+        self._snapshot = self._snapshot.replaced(updated).appended(created)
+        if created:
+            for listener in self._listeners:
+                listener("added", created)
+
+    def _drop(self, lead_ids: Iterable[int]) -> list[Lead]:
+        removed: list[Lead] = []
+        for lead_id in lead_ids:
+            item = self._by_id.get(lead_id)
+            if item is None:
+                continue
+            self._unindex(item)
+            url_key = normalize_profile_url(item.profile_url)
+            if self._by_profile_url.get(url_key) == lead_id:
+                del self._by_profile_url[url_key]
+            del self._by_id[lead_id]
+            removed.append(item)
+        self._snapshot = self._snapshot.without([item.id for item in removed])
+        return removed
+
+    def _index(self, item: Lead) -> None:
+        self._by_id[item.id] = item
+        self._by_profile_url[normalize_profile_url(item.profile_url)] = item.id
+        company_ids = self._by_company.setdefault(item.company.strip().lower(), [])
+        if company_ids and item.id < company_ids[-1]:
+            insort(company_ids, item.id)
+        else:
+            company_ids.append(item.id)
+        if self._by_fingerprint is not None:
+            self._by_fingerprint[lead_fingerprint(item.full_name, item.company)] = item.id
+
+    def _track_created_at(self, item: Lead) -> None:
+        entry = (item.created_at, item.id)
+        if self._by_created_at and entry < self._by_created_at[-1]:
+            insort(self._by_created_at, entry)
+        else:
+            self._by_created_at.append(entry)
+
+    def _unindex(self, item: Lead) -> None:
+        company_key = item.company.strip().lower()
+        company_ids = self._by_company.get(company_key)
+        if company_ids is not None:
+            index = bisect_left(company_ids, item.id)
+            if index < len(company_ids) and company_ids[index] == item.id:
+                del company_ids[index]
+            if not company_ids:
+                del self._by_company[company_key]
+        if self._by_fingerprint is not None:
+            fingerprint = lead_fingerprint(item.full_name, item.company)
+            if self._by_fingerprint.get(fingerprint) == item.id:
+                del self._by_fingerprint[fingerprint]
@@ -0,0 +1,55 @@
+"""Cold-start cost of ``FileLeadBackend``: writing and restoring a columnar lead snapshot.
+
+Builds ``LEADS`` leads in memory, writes them as a snapshot, then times ``load`` on a
+fresh backend the way a restarted process would. Pass a lead count to override the
+default, e.g. ``python -m benchmarks.bench_lead_snapshot 5000000``.
+"""
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.models import DataSource, Lead
+from app.persistence import FileLeadBackend
+
+LEADS = 1_000_000
+
+
+def _leads(count: int) -> list[Lead]:
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        Lead(
+            id=index,
+            full_name=f"Lead {index}",
+            title="Head of Sales",
+            company=f"Company {index % 5_000}",
+            profile_url=f"https://www.linkedin.com/in/lead-{index}",
+            source=DataSource.OFFICIAL_API if index % 3 else DataSource.VETTED_PROVIDER,
+            created_at=started + timedelta(seconds=index),
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else LEADS
+    leads = _leads(count)
+    with tempfile.TemporaryDirectory() as directory:
+        backend = FileLeadBackend(directory, fsync=False)
+        began = time.perf_counter()
+        backend.snapshot(leads, count + 1)
+        written = time.perf_counter() - began
+        backend.close()
+        size = backend.snapshot_path.stat().st_size / 2**20
+
+        began = time.perf_counter()
+        restored, _ = FileLeadBackend(directory, fsync=False).load()
+        loaded = time.perf_counter() - began
+    assert len(restored) == count
+
+    print(f"{count} leads, {size:.0f} MiB snapshot")
+    print(f"write {written:.2f}s, restore {loaded:.2f}s ({count / loaded / 1e6:.2f}M leads/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Mixed read/write load on ``LeadStore``: lock-free snapshot reads vs reads under the store lock.
+
+Reader threads page through the store with ``scan`` and call ``list_all`` while writer
+threads ingest small batches, the way FastAPI's threadpool interleaves requests. The
+``locked`` baseline holds the store lock for every read, as ``LeadStore`` used to.
+
+Run from the repository root with ``python -m benchmarks.bench_lead_store_contention``.
+"""
+import threading
+import time
+from statistics import quantiles
+
+from app.models import DataSource, InboundLead
+from app.store import LeadFilter, LeadStore
+
+PRELOADED_LEADS = 200_000
+WRITE_BATCH = 100
+DURATION_SECONDS = 3.0
+READERS = 8
+WRITERS = 2
+# Stands in for encoding and sending the response, during which a request holds no lock.
+READ_PAUSE_SECONDS = 0.002
+
+
+class LockedReadStore(LeadStore):
+    def list_all(self):
+        with self._lock:
+            return super().list_all()
+
+    def scan(self, after_id=None, max_rows=1_000, lead_filter=None):
+        with self._lock:
+            return super().scan(after_id, max_rows, lead_filter)
+
+
+def _leads(start: int, count: int) -> list[InboundLead]:
+    return [
+        InboundLead(
+            full_name=f"Lead {index}",
+            title="Head of Sales",
+            company=f"Company {index % 5_000}",
+            profile_url=f"https://www.linkedin.com/in/lead-{index}",
+            source=DataSource.OFFICIAL_API if index % 3 else DataSource.VETTED_PROVIDER,
+        )
+        for index in range(start, start + count)
+    ]
+
+
+def _run(store: LeadStore) -> dict[str, float]:
+    stop = threading.Event()
+    write_latencies: list[float] = []
+    read_latencies: list[float] = []
+    counter = iter(range(PRELOADED_LEADS, 10**9, WRITE_BATCH))
+    counter_lock = threading.Lock()
+    lead_filter = LeadFilter(source=DataSource.VETTED_PROVIDER)
+
+    def writer() -> None:
+        while not stop.is_set():
+            with counter_lock:
+                start = next(counter)
+            batch = _leads(start, WRITE_BATCH)
+            began = time.perf_counter()
+            store.add_many(batch)
+            write_latencies.append(time.perf_counter() - began)
+
+    def reader(number: int) -> None:
+        cursor = None
+        while not stop.is_set():
+            began = time.perf_counter()
+            if number == 0:
+                store.list_all()
+            else:
+                _, cursor = store.scan(cursor, 1_000, lead_filter)
+            read_latencies.append(time.perf_counter() - began)
+            time.sleep(READ_PAUSE_SECONDS)
+
+    threads = [threading.Thread(target=writer) for _ in range(WRITERS)]
+    threads += [threading.Thread(target=reader, args=(number,)) for number in range(READERS)]
+    for thread in threads:
+        thread.start()
+    time.sleep(DURATION_SECONDS)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "writes/s": len(write_latencies) * WRITE_BATCH / DURATION_SECONDS,
+        "write p50 ms": quantiles(write_latencies, n=100)[49] * 1e3,
+        "write p99 ms": quantiles(write_latencies, n=100)[98] * 1e3,
+        "reads/s": len(read_latencies) / DURATION_SECONDS,
+        "read p99 ms": quantiles(read_latencies, n=100)[98] * 1e3,
+    }
+
+
+def main() -> None:
+    results = {}
+    for name, cls in (("locked", LockedReadStore), ("snapshot", LeadStore)):
+        store = cls()
+        for start in range(0, PRELOADED_LEADS, 10_000):
+            store.add_many(_leads(start, 10_000))
+        results[name] = _run(store)
+
+    print(f"{READERS} readers, {WRITERS} writers, {PRELOADED_LEADS} preloaded leads, {DURATION_SECONDS}s each")
+    print(f"{'':<14}" + "".join(f"{name:>12}" for name in results))
+    for metric in results["locked"]:
+        print(f"{metric:<14}" + "".join(f"{values[metric]:>12.1f}" for values in results.values()))
+
+
+if __name__ == "__main__":
+    main()
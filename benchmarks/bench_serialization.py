@@ -0,0 +1,78 @@
+"""Per-object JSON encoding cost: ``dataclasses.asdict`` + ``json.dumps`` vs ``app.serialization``.
+
+Run from the repository root with ``python -m benchmarks.bench_serialization``.
+"""
+import json
+import timeit
+from dataclasses import asdict
+from datetime import date, datetime
+from enum import Enum
+
+from app.delivery import DeliveryEventType, OutboundChannel
+from app.main import LeadIngestionService
+from app.messaging import MessageCTA, MessageGenerationControls, MessageTemplate, MessageTone
+from app.models import DataSource, InboundLead
+from app.serialization import dumps
+
+LEADS = 1_000
+
+
+def _jsonable(value: object) -> object:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(type(value).__name__)
+
+
+def _baseline(value: object) -> bytes:
+    return json.dumps(asdict(value), default=_jsonable, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def main() -> None:
+    service = LeadIngestionService()
+    response = service.ingest(
+        provider_name="bench",
+        leads=[
+            InboundLead(
+                full_name=f"Lead {index}",
+                title="Head of Sales",
+                company=f"Company {index} B2B",
+                profile_url=f"https://www.linkedin.com/in/lead-{index}",
+                source=DataSource.OFFICIAL_API,
+            )
+            for index in range(LEADS)
+        ],
+    )
+    lead = service.get_lead(response.lead_ids[0])
+    draft = service.generate_message_draft(
+        lead.id, MessageGenerationControls(MessageTone.DIRECT, MessageTemplate.FOLLOW_UP, MessageCTA.BOOK_CALL)
+    )
+    event = service.delivery.record_event(
+        lead.id, OutboundChannel.EMAIL, "lead@example.com", draft.subject, DeliveryEventType.SENT
+    )
+    samples = {
+        "Lead": lead,
+        "MessageDraft": draft,
+        "DeliveryEvent": event,
+        f"IngestLeadsResponse ({LEADS} ids)": response,
+    }
+    print(f"{'object':<32}{'asdict us':>12}{'encoder us':>12}{'speedup':>10}")
+    for name, value in samples.items():
+        assert dumps(value) == _baseline(value)
+        number, _ = timeit.Timer(lambda: _baseline(value)).autorange()
+        baseline = min(timeit.repeat(lambda: _baseline(value), number=number, repeat=5)) / number
+        compiled = min(timeit.repeat(lambda: dumps(value), number=number, repeat=5)) / number
+        print(f"{name:<32}{baseline * 1e6:>12.2f}{compiled * 1e6:>12.2f}{baseline / compiled:>9.1f}x")
+
+    leads = service.list_leads()
+    page = {"items": leads, "next_after_id": None}
+    baseline = min(
+        timeit.repeat(lambda: json.dumps({"items": [asdict(item) for item in leads]}, default=_jsonable), number=5)
+    ) / 5
+    compiled = min(timeit.repeat(lambda: dumps(page), number=5)) / 5
+    print(f"{f'page of {LEADS} leads':<32}{baseline * 1e6:>12.0f}{compiled * 1e6:>12.0f}{baseline / compiled:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
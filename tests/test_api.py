@@ -1,7 +1,10 @@
+from datetime import datetime
+
 import pytest
 
 from app.main import LeadIngestionService
-from app.models import DataSource, InboundLead
+from app.models import DataSource, DuplicatePolicy, InboundLead
+from app.store import LeadFilter, LeadStore
 
 
 def test_ingest_and_list_leads() -> None:
@@ -36,22 +39,110 @@ def test_ingest_and_list_leads() -> None:
     assert leads[1].source == DataSource.VETTED_PROVIDER
 
 
-def test_reject_invalid_url() -> None:
+def test_reject_invalid_url_keeps_valid_rows() -> None:
     service = LeadIngestionService()
 
-    with pytest.raises(ValueError, match="profile_url"):
-        service.ingest(
-            provider_name="proxycurl",
-            leads=[
-                InboundLead(
-                    full_name="Jane Doe",
-                    title="Head of Sales",
-                    company="Acme Inc",
-                    profile_url="not-a-url",
-                    source=DataSource.OFFICIAL_API,
-                )
-            ],
-        )
+    response = service.ingest(
+        provider_name="proxycurl",
+        leads=[
+            InboundLead(
+                full_name="Jane Doe",
+                title="Head of Sales",
+                company="Acme Inc",
+                profile_url="not-a-url",
+                source=DataSource.OFFICIAL_API,
+            ),
+            InboundLead(
+                full_name="John Smith",
+                title="Revenue Operations Manager",
+                company="Beta Labs",
+                profile_url="https://www.linkedin.com/in/john-smith",
+                source=DataSource.VETTED_PROVIDER,
+            ),
+        ],
+    )
+
+    assert response.accepted == 1
+    assert response.rejected == 1
+    assert response.rejections[0].row == 0
+    assert "profile_url" in response.rejections[0].reason
+    assert [lead.full_name for lead in service.list_leads()] == ["John Smith"]
+
+    raw_sources = service.ingest(
+        provider_name="proxycurl",
+        leads=[
+            InboundLead("Ann Lee", "VP Sales", "Acme Inc", "https://www.linkedin.com/in/ann-lee", "official_api"),
+            InboundLead("Bob Ray", "VP Sales", "Acme Inc", "https://www.linkedin.com/in/bob-ray", "scraped"),
+        ],
+    )
+    assert (raw_sources.accepted, [item.row for item in raw_sources.rejections]) == (1, [1])
+    assert raw_sources.rejections[0].reason == "Unsupported source: scraped"
+    assert service.get_lead(raw_sources.lead_ids[0]).source is DataSource.OFFICIAL_API
+
+
+def test_reingest_skips_duplicates() -> None:
+    service = LeadIngestionService()
+    batch = [
+        InboundLead(
+            full_name="Jane Doe",
+            title="Head of Sales",
+            company="Acme Inc",
+            profile_url="https://www.linkedin.com/in/jane-doe",
+            source=DataSource.OFFICIAL_API,
+        ),
+        InboundLead(
+            full_name="Jane Doe",
+            title="Head of Sales",
+            company="Acme Inc",
+            profile_url="https://linkedin.com/in/jane-doe/",
+            source=DataSource.OFFICIAL_API,
+        ),
+    ]
+
+    first = service.ingest(provider_name="proxycurl", leads=batch)
+    second = service.ingest(provider_name="proxycurl", leads=batch[:1])
+
+    assert (first.accepted, first.duplicates) == (1, 1)
+    assert (second.accepted, second.duplicates, second.lead_ids) == (0, 1, [])
+    assert len(service.list_leads()) == 1
+
+
+def test_reingest_merges_duplicates_by_fingerprint() -> None:
+    service = LeadIngestionService(
+        store=LeadStore(fingerprint_index=True),
+        duplicate_policy=DuplicatePolicy.MERGE,
+    )
+    service.ingest(
+        provider_name="proxycurl",
+        leads=[
+            InboundLead(
+                full_name="Jane Doe",
+                title="Sales Manager",
+                company="Acme Inc",
+                profile_url="https://www.linkedin.com/in/jane-doe",
+                source=DataSource.OFFICIAL_API,
+            )
+        ],
+    )
+
+    response = service.ingest(
+        provider_name="proxycurl",
+        leads=[
+            InboundLead(
+                full_name="jane  doe",
+                title="Head of Sales",
+                company="ACME Inc",
+                profile_url="https://www.linkedin.com/in/jane-doe-123",
+                source=DataSource.VETTED_PROVIDER,
+            )
+        ],
+    )
+
+    assert (response.accepted, response.duplicates) == (0, 1)
+    (lead,) = service.list_leads()
+    assert lead.title == "Head of Sales"
+    assert lead.profile_url == "https://www.linkedin.com/in/jane-doe"
+    assert service.find_leads_by_company("acme inc") == [lead]
 
 
 def test_reject_empty_batch() -> None:
@@ -59,3 +150,82 @@ def test_reject_empty_batch() -> None:
 
     with pytest.raises(ValueError, match="at least one lead"):
         service.ingest(provider_name="proxycurl", leads=[])
+
+
+def test_ingest_stream_commits_in_chunks() -> None:
+    service = LeadIngestionService()
+    leads = (
+        InboundLead(
+            full_name=f"Lead {index}",
+            title="Head of Sales",
+            company="Acme Inc",
+            profile_url=f"https://www.linkedin.com/in/lead-{index}",
+            source=DataSource.OFFICIAL_API,
+        )
+        for index in range(7)
+    )
+
+    progress = [
+        (item.chunks_committed, item.accepted, list(item.chunk_lead_ids))
+        for item in service.ingest_stream(provider_name="proxycurl", leads=leads, chunk_size=3)
+    ]
+
+    assert progress == [(1, 3, [1, 2, 3]), (2, 6, [4, 5, 6]), (3, 7, [7])]
+    assert len(service.list_leads()) == 7
+
+
+def test_ingest_stream_reports_rejections_by_stream_row() -> None:
+    service = LeadIngestionService()
+    leads = [
+        InboundLead(
+            full_name="Jane Doe",
+            title="Head of Sales",
+            company="Acme Inc",
+            profile_url=f"https://www.linkedin.com/in/jane-{index}" if index != 2 else "not-a-url",
+            source=DataSource.OFFICIAL_API,
+        )
+        for index in range(4)
+    ]
+
+    *_, progress = service.ingest_stream(provider_name="proxycurl", leads=leads, chunk_size=2)
+
+    assert (progress.rows_processed, progress.accepted, progress.rejected) == (4, 3, 1)
+    assert [item.row for item in progress.chunk_rejections] == [2]
+
+    progress = service.ingest_chunk(progress, [ValueError("line 5: invalid lead record"), leads[0]])
+    assert (progress.rows_processed, progress.rejected, progress.duplicates) == (6, 2, 1)
+    assert [(item.row, item.reason) for item in progress.chunk_rejections] == [(4, "line 5: invalid lead record")]
+
+
+def test_list_leads_page_follows_cursor_and_filters() -> None:
+    service = LeadIngestionService()
+    service.ingest(
+        provider_name="proxycurl",
+        leads=[
+            InboundLead(
+                full_name=f"Lead {index}",
+                title="VP Sales" if index % 2 else "Engineer",
+                company="Acme" if index % 3 else "Globex",
+                profile_url=f"https://www.linkedin.com/in/lead-{index}",
+                source=DataSource.OFFICIAL_API if index < 6 else DataSource.VETTED_PROVIDER,
+            )
+            for index in range(10)
+        ],
+    )
+    service.erase_leads([2], requested_by="dpo@example.com")
+
+    first = service.list_leads_page(limit=4)
+    second = service.list_leads_page(after_id=first.next_after_id, limit=4)
+    last = service.list_leads_page(after_id=second.next_after_id, limit=4)
+    assert [[lead.id for lead in page.leads] for page in (first, second, last)] == [[1, 3, 4, 5], [6, 7, 8, 9], [10]]
+    assert last.next_after_id is None
+
+    globex = service.list_leads_page(lead_filter=LeadFilter(company="globex"))
+    assert [lead.id for lead in globex.leads] == [1, 4, 7, 10]
+    naive_bounds = LeadFilter(created_from=datetime(2000, 1, 1), created_to=datetime(2999, 1, 1))
+    assert len(service.list_leads_page(lead_filter=naive_bounds).leads) == 9
+    vetted_sales = service.list_leads_page(lead_filter=LeadFilter(source=DataSource.VETTED_PROVIDER), min_score=50)
+    assert [lead.id for lead in vetted_sales.leads] == [8, 10]
+
+    streamed = [lead.id for page in service.iter_leads(min_score=50, page_size=2) for lead in page]
+    assert streamed == [4, 6, 8, 10]
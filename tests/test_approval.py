@@ -0,0 +1,87 @@
+from contextlib import nullcontext
+
+import pytest
+
+from app.approval import ApprovalStatus, ApprovalWorkflow
+from app.messaging import MessageCTA, MessageDraft, MessageGenerationControls, MessageTemplate, MessageTone
+
+
+def _draft() -> MessageDraft:
+    return MessageDraft(
+        subject="Intro idea for Acme Inc",
+        body="Hi",
+        controls=MessageGenerationControls(
+            tone=MessageTone.FRIENDLY,
+            template=MessageTemplate.INTRO,
+            cta=MessageCTA.REPLY,
+        ),
+        personalization=[],
+    )
+
+
+def test_pending_queue_pages_in_submission_order() -> None:
+    workflow = ApprovalWorkflow()
+    for lead_id in range(1, 6):
+        workflow.submit(lead_id, _draft())
+    workflow.review(2, reviewer="manager", approve=False)
+
+    first = workflow.pending_queue(limit=2)
+    second = workflow.pending_queue(limit=2, after_revision_id=first[-1].revision_id)
+
+    assert [item.revision_id for item in first] == [1, 3]
+    assert [item.revision_id for item in second] == [4, 5]
+    assert workflow.pending_count() == 4
+
+
+def test_review_many_updates_send_gate_and_is_all_or_nothing() -> None:
+    workflow = ApprovalWorkflow()
+    workflow.submit(7, _draft())
+    workflow.submit(7, _draft())
+    workflow.submit(8, _draft())
+
+    with pytest.raises(ValueError, match="revision_id 99 not found"):
+        workflow.review_many([1, 99], reviewer="manager", approve=True)
+    assert workflow.pending_count() == 3
+
+    reviewed = workflow.review_many([1, 3], reviewer=" manager ", approve=True)
+
+    assert [item.status for item in reviewed] == [ApprovalStatus.APPROVED, ApprovalStatus.APPROVED]
+    assert reviewed[0].reviewer == "manager"
+    assert workflow.is_send_allowed(7) and workflow.is_send_allowed(8)
+    assert not workflow.is_send_allowed(9)
+    assert [item.revision_id for item in workflow.list_approvals(lead_id=7)] == [1, 2]
+    assert [item.revision_id for item in workflow.pending_queue()] == [2]
+    with pytest.raises(ValueError, match="already reviewed"):
+        workflow.review(1, reviewer="manager", approve=False)
+    assert workflow.approved_draft(7).revision_id == 1
+    assert workflow.approved_draft(9) is None
+
+    workflow.review(2, reviewer="manager", approve=True)
+    assert workflow.approved_draft(7).revision_id == 2
+
+
+def test_failed_review_save_leaves_revisions_pending() -> None:
+    class FailingBackend:
+        def load(self) -> list:
+            return []
+
+        def save(self, items: list) -> None:
+            if any(item.status != ApprovalStatus.PENDING for item in items):
+                raise OSError("disk full")
+
+        def transaction(self) -> nullcontext:
+            return nullcontext()
+
+        def changes(self) -> tuple[list, list]:
+            return [], []
+
+    workflow = ApprovalWorkflow(backend=FailingBackend())
+    workflow.submit(7, _draft())
+
+    with pytest.raises(OSError):
+        workflow.review(1, reviewer="manager", approve=True)
+
+    assert workflow.get(1).status == ApprovalStatus.PENDING
+    assert workflow.get(1).reviewer is None
+    assert not workflow.is_send_allowed(7)
+    assert [item.revision_id for item in workflow.pending_queue()] == [1]
@@ -0,0 +1,62 @@
+from app.compliance import ComplianceReporter
+from app.crm import OutcomeStatus
+from app.main import LeadIngestionService
+from app.messaging import MessageCTA, MessageGenerationControls, MessageTemplate, MessageTone
+from app.models import DataSource, InboundLead
+
+CONTROLS = MessageGenerationControls(
+    tone=MessageTone.PROFESSIONAL,
+    template=MessageTemplate.INTRO,
+    cta=MessageCTA.BOOK_CALL,
+)
+
+
+def _full_scan(service: LeadIngestionService):
+    return ComplianceReporter().build(
+        service.list_leads(),
+        service.approvals.list_approvals(),
+        service.delivery.list_events(),
+        service.crm.list_outcomes(),
+        service.audit.list_events(),
+    )
+
+
+def test_compliance_snapshot_is_cached_until_a_mutation() -> None:
+    service = LeadIngestionService()
+    service.ingest(
+        provider_name="proxycurl",
+        leads=[
+            InboundLead(
+                full_name=f"Lead {index}",
+                title="Head of Sales",
+                company="Acme Inc",
+                profile_url=f"https://www.linkedin.com/in/lead-{index}",
+                source=DataSource.OFFICIAL_API,
+            )
+            for index in range(3)
+        ],
+    )
+    for _ in service.generate_campaign_drafts([1, 2, 3], CONTROLS, submit_for_approval=True):
+        pass
+    service.approvals.review(1, reviewer="manager", approve=True)
+    service.delivery.send_email(1, "lead1@example.com", "Intro")
+    service.crm.sync_outcome(1, OutcomeStatus.WON, deal_value=1000.0)
+    service.audit.append("lead_deleted", {"lead_id": 3})
+    service.audit.append("retention_policy_enforced", {"deleted": 0})
+
+    snapshot = service.compliance.snapshot()
+    assert snapshot == _full_scan(service)
+    assert snapshot.pending_approvals == 2
+    assert snapshot.dsar_deletions_recorded == 1
+    assert service.compliance.snapshot() is snapshot
+
+    service.audit.append("lead_deleted", {"lead_id": 2})
+
+    refreshed = service.compliance.snapshot()
+    assert refreshed is not snapshot
+    assert refreshed.dsar_deletions_recorded == 2
+    assert refreshed == _full_scan(service)
+
+    late = ComplianceReporter()
+    late.attach(service.store, service.approvals, service.delivery, service.crm, service.audit)
+    assert late.snapshot() == refreshed
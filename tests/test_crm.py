@@ -0,0 +1,168 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from app.crm import CRMOutcomeChange, CRMOutcomeSync, OutcomeStatus
+from app.crm_connector import CRMOutcomePuller, CRMRequestError, HTTPConnectionPool
+from app.models import DataSource, InboundLead
+from app.persistence import FileCursorStore
+from app.store import LeadStore
+
+
+def _lead(slug: str) -> InboundLead:
+    return InboundLead(
+        full_name="Jane Doe",
+        title="Head of Sales",
+        company="Acme Inc",
+        profile_url=f"https://www.linkedin.com/in/{slug}",
+        source=DataSource.VETTED_PROVIDER,
+    )
+
+
+class FakeCRM:
+    """Change feed whose cursor is the position in an append-only change list."""
+
+    def __init__(self) -> None:
+        self.changes: list[dict] = []
+        self.client_ports: set[int] = set()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                fake.client_ports.add(self.client_address[1])
+                query = parse_qs(urlsplit(self.path).query)
+                start = int(query.get("cursor", ["0"])[0])
+                end = start + int(query["limit"][0])
+                body = json.dumps(
+                    {
+                        "changes": fake.changes[start:end],
+                        "next_cursor": str(min(end, len(fake.changes))),
+                        "has_more": end < len(fake.changes),
+                    }
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def fake_crm():
+    crm = FakeCRM()
+    yield crm
+    crm.server.shutdown()
+    crm.server.server_close()
+
+
+def test_pull_is_incremental_and_idempotent(fake_crm, tmp_path) -> None:
+    fake_crm.changes = [
+        {"id": f"deal-{index}", "lead_id": index, "status": "open", "deal_value": 100.0} for index in range(1, 6)
+    ]
+    fake_crm.changes.append({"id": "deal-bad", "lead_id": 9, "status": "maybe"})
+    sync = CRMOutcomeSync()
+    pool = HTTPConnectionPool(fake_crm.url, size=2)
+    puller = CRMOutcomePuller(sync, pool, FileCursorStore(tmp_path / "crm.cursor"), page_size=2)
+
+    first = puller.pull()
+
+    assert (first.pages, first.created, first.rejected, first.cursor) == (3, 5, 1, "6")
+    assert pool.connections_opened == 1
+    assert len(fake_crm.client_ports) == 1
+
+    fake_crm.changes.append({"id": "deal-2", "lead_id": 2, "status": "won", "deal_value": 900.0})
+    fake_crm.changes.append({"id": "deal-3", "lead_id": 3, "status": "open", "deal_value": 100.0})
+    restarted = CRMOutcomePuller(sync, pool, FileCursorStore(tmp_path / "crm.cursor"), page_size=2)
+
+    delta = restarted.pull()
+
+    assert (delta.pages, delta.created, delta.updated, delta.unchanged) == (1, 0, 1, 1)
+    assert len(sync) == 5
+    (record,) = sync.list_outcomes(lead_id=2)
+    assert (record.status, record.deal_value, record.external_id) == (OutcomeStatus.WON, 900.0, "deal-2")
+
+    replay = restarted.pull(full=True)
+    assert (replay.created, replay.cursor, len(sync)) == (0, "8", 5)
+    assert sync.list_outcomes(lead_id=2)[0].status == OutcomeStatus.WON
+    pool.close()
+
+
+class ScriptedPool:
+    def __init__(self, pages: list) -> None:
+        self.pages = pages
+        self.requests = 0
+
+    def get_json(self, path: str, params: dict) -> object:
+        self.requests += 1
+        return self.pages[min(self.requests, len(self.pages)) - 1]
+
+
+def test_pull_fails_on_a_stuck_cursor_or_a_malformed_page(tmp_path) -> None:
+    change = {"id": "deal-1", "lead_id": 1, "status": "open"}
+    stuck = ScriptedPool([{"changes": [change, "junk"], "next_cursor": "1", "has_more": True}])
+    sync = CRMOutcomeSync()
+    cursor_store = FileCursorStore(tmp_path / "crm.cursor")
+
+    with pytest.raises(CRMRequestError, match="without advancing"):
+        CRMOutcomePuller(sync, stuck, cursor_store).pull()
+    assert (stuck.requests, len(sync), cursor_store.load()) == (2, 1, "1")
+
+    for page in (["not", "a", "page"], {"changes": "oops"}):
+        with pytest.raises(CRMRequestError, match="malformed"):
+            CRMOutcomePuller(sync, ScriptedPool([page]), cursor_store).pull()
+
+
+def test_pull_parks_changes_for_leads_not_yet_ingested(tmp_path) -> None:
+    store = LeadStore()
+    store.add_many([_lead("a")])
+    sync = CRMOutcomeSync()
+    sync.attach(store)
+    cursor_store = FileCursorStore(tmp_path / "crm.cursor")
+    pages = [
+        {
+            "changes": [
+                {"id": "deal-1", "lead_id": 1, "status": "open"},
+                {"id": "deal-2", "lead_id": 2, "status": "open"},
+                {"id": "deal-3", "lead_id": 3, "status": "open"},
+            ],
+            "next_cursor": "3",
+            "has_more": False,
+        }
+    ]
+
+    first = CRMOutcomePuller(sync, ScriptedPool(pages), cursor_store).pull()
+    assert (first.created, first.parked, cursor_store.load()) == (1, 2, "3")
+
+    store.add_many([_lead("b")])
+    final_page = {"changes": [{"id": "deal-3", "lead_id": 1, "status": "won"}], "next_cursor": None, "has_more": False}
+    second = CRMOutcomePuller(sync, ScriptedPool([final_page]), cursor_store).pull()
+
+    assert (second.created, second.updated, second.parked) == (2, 0, 0)
+    assert [record.status for record in sync.list_outcomes(lead_id=1)] == [OutcomeStatus.OPEN, OutcomeStatus.WON]
+    assert len(sync.list_outcomes(lead_id=2)) == 1
+    assert (cursor_store.load(), cursor_store.load_parked()) == ("3", [])
+
+
+def test_upsert_moves_records_between_leads() -> None:
+    sync = CRMOutcomeSync()
+    sync.upsert_outcomes([CRMOutcomeChange("deal-1", 1, OutcomeStatus.OPEN)])
+
+    result = sync.upsert_outcomes([CRMOutcomeChange("deal-1", 2, OutcomeStatus.LOST)])
+
+    assert len(result.updated) == 1
+    assert sync.list_outcomes(lead_id=1) == []
+    assert sync.list_outcomes(lead_id=2)[0].status == OutcomeStatus.LOST
+    with pytest.raises(ValueError):
+        sync.upsert_outcomes([CRMOutcomeChange("deal-2", 2, OutcomeStatus.WON, deal_value=-1.0)])
@@ -0,0 +1,130 @@
+from contextlib import nullcontext
+from datetime import timedelta
+
+import pytest
+
+from app.delivery import DeliveryEventType, DeliveryTelemetry, ProviderDeliveryEvent, RecentKeyWindow
+from app.models import DataSource, InboundLead
+from app.store import LeadStore
+
+
+def _event(message_id: str, event_type: DeliveryEventType, lead_id: int = 1) -> ProviderDeliveryEvent:
+    return ProviderDeliveryEvent(
+        provider_message_id=message_id,
+        lead_id=lead_id,
+        recipient="jane@example.com",
+        subject="Intro",
+        event_type=event_type,
+    )
+
+
+def test_webhook_batches_are_deduplicated_on_provider_message_id() -> None:
+    telemetry = DeliveryTelemetry()
+
+    first = telemetry.record_provider_events(
+        [
+            _event("m-1", DeliveryEventType.DELIVERED),
+            _event("m-1", DeliveryEventType.DELIVERED),
+            _event("m-1", DeliveryEventType.COMPLAINT),
+            _event("m-2", DeliveryEventType.BOUNCED, lead_id=2),
+        ]
+    )
+    second = telemetry.record_provider_events([_event("m-2", DeliveryEventType.BOUNCED, lead_id=2)])
+
+    assert (first.accepted, first.duplicates, first.event_ids) == (3, 1, [1, 2, 3])
+    assert (second.accepted, second.duplicates) == (0, 1)
+    assert [event.provider_message_id for event in telemetry.list_events()] == ["m-1", "m-1", "m-2"]
+
+
+def test_webhooks_for_unknown_or_erased_leads_are_dropped() -> None:
+    store = LeadStore()
+    store.add_many(
+        [
+            InboundLead(
+                full_name="Jane Doe",
+                title="Head of Sales",
+                company="Acme Inc",
+                profile_url=f"https://linkedin.com/in/{slug}",
+                source=DataSource.VETTED_PROVIDER,
+            )
+            for slug in ("a", "b")
+        ]
+    )
+    store.remove_many([2])
+    telemetry = DeliveryTelemetry()
+    telemetry.attach(store)
+
+    result = telemetry.record_provider_events(
+        [
+            _event("m-1", DeliveryEventType.DELIVERED),
+            _event("m-2", DeliveryEventType.BOUNCED, lead_id=2),
+            _event("m-3", DeliveryEventType.DELIVERED, lead_id=3),
+        ]
+    )
+
+    assert (result.accepted, result.unknown_leads) == (1, 2)
+    assert [event.lead_id for event in telemetry.list_events()] == [1]
+    assert not telemetry.is_suppressed("jane@example.com")
+
+
+def test_webhooks_from_a_failed_write_are_accepted_on_retry() -> None:
+    class FlakyBackend:
+        failures = 1
+
+        def load(self):
+            return [], {}
+
+        def append(self, events):
+            if self.failures:
+                self.failures -= 1
+                raise OSError("disk full")
+
+        def transaction(self):
+            return nullcontext()
+
+        def changes(self):
+            return [], [], {}
+
+    telemetry = DeliveryTelemetry(backend=FlakyBackend())
+    with pytest.raises(OSError):
+        telemetry.record_provider_events([_event("m-1", DeliveryEventType.BOUNCED)])
+
+    retry = telemetry.record_provider_events([_event("m-1", DeliveryEventType.BOUNCED)])
+    assert (retry.accepted, retry.duplicates, retry.event_ids) == (1, 0, [1])
+    assert telemetry.record_provider_events([_event("m-1", DeliveryEventType.BOUNCED)]).duplicates == 1
+
+
+def test_recent_key_window_is_bounded_by_size_and_ttl() -> None:
+    now = [0.0]
+    window = RecentKeyWindow(ttl_seconds=10, max_entries=2, clock=lambda: now[0])
+
+    assert window.add("a") and window.add("b") and window.add("c")
+    assert len(window) == 2
+    assert window.add("a")  # evicted by size, so accepted again
+    assert not window.add("c")
+
+    now[0] = 11.0
+    assert window.add("c")
+    assert len(window) == 1
+
+
+def test_event_indexes_track_leads_counts_time_and_suppression() -> None:
+    telemetry = DeliveryTelemetry()
+    telemetry.send_email(1, "Jane@Example.com", "Intro")
+    telemetry.send_email(2, "john@example.com", "Intro")
+    telemetry.record_provider_events(
+        [
+            _event("m-1", DeliveryEventType.DELIVERED),
+            _event("m-2", DeliveryEventType.BOUNCED, lead_id=2),
+        ]
+    )
+    events = telemetry.list_events()
+
+    assert [event.event_id for event in telemetry.list_events(lead_id=1)] == [1, 3]
+    assert telemetry.count(DeliveryEventType.SENT) == 2
+    assert telemetry.counts()[DeliveryEventType.BOUNCED] == 1
+    assert telemetry.list_events_between(events[0].created_at, events[-1].created_at + timedelta(seconds=1)) == events
+    assert telemetry.list_events_between(events[0].created_at - timedelta(days=1), events[0].created_at) == []
+    assert telemetry.is_suppressed(" JANE@example.com")
+    assert telemetry.suppression_reason("jane@example.com") == DeliveryEventType.BOUNCED
+    assert not telemetry.is_suppressed("john@example.com")
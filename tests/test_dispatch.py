@@ -0,0 +1,246 @@
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from app.approval import ApprovalWorkflow
+from app.delivery import DeliveryEventType, DeliveryTelemetry
+from app.dispatch import DeliveryError, EmailDispatcher, OutboundEmail, SMTPConnectionPool, TokenBucket
+from app.main import LeadIngestionService
+from app.messaging import MessageCTA, MessageDraft, MessageGenerationControls, MessageTemplate, MessageTone
+
+
+class _LocalSMTPServer:
+    """Minimal SMTP stand-in: refuses recipients starting with ``bounce`` and senders starting with ``blocked``."""
+
+    def __init__(self) -> None:
+        self.messages: list[bytes] = []
+        self.sessions = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.sessions += 1
+        writer.write(b"220 localhost ESMTP\r\n")
+        data: list[bytes] | None = None
+        while line := await reader.readline():
+            if data is not None:
+                if line == b".\r\n":
+                    self.messages.append(b"".join(data))
+                    data = None
+                    writer.write(b"250 queued\r\n")
+                else:
+                    data.append(line)
+            else:
+                command = line[:4].upper()
+                if command in (b"EHLO", b"HELO"):
+                    writer.write(b"250 localhost\r\n")
+                elif command == b"RCPT" and b"<bounce" in line:
+                    writer.write(b"550 no such user\r\n")
+                elif command == b"MAIL" and b"<blocked" in line:
+                    writer.write(b"553 sender not allowed\r\n")
+                elif command == b"DATA":
+                    data = []
+                    writer.write(b"354 end with .\r\n")
+                elif command == b"QUIT":
+                    writer.write(b"221 bye\r\n")
+                    await writer.drain()
+                    break
+                else:
+                    writer.write(b"250 ok\r\n")
+            await writer.drain()
+        writer.close()
+
+
+def _approved_workflow(*lead_ids: int) -> ApprovalWorkflow:
+    workflow = ApprovalWorkflow()
+    draft = MessageDraft(
+        subject="Intro",
+        body="Hi",
+        controls=MessageGenerationControls(MessageTone.FRIENDLY, MessageTemplate.INTRO, MessageCTA.REPLY),
+        personalization=[],
+    )
+    for lead_id in lead_ids:
+        workflow.review(workflow.submit(lead_id, draft).revision_id, reviewer="manager", approve=True)
+    return workflow
+
+
+def test_dispatcher_sends_over_pooled_smtp_and_records_events() -> None:
+    async def scenario() -> tuple:
+        smtp = _LocalSMTPServer()
+        server = await asyncio.start_server(smtp.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        telemetry = DeliveryTelemetry()
+        pool = SMTPConnectionPool("127.0.0.1", port, size=2)
+        dispatcher = EmailDispatcher(
+            telemetry,
+            _approved_workflow(*range(1, 21)),
+            pool,
+            global_rate=1_000,
+            per_domain_rate=1_000,
+            max_concurrency=5,
+            event_batch_size=7,
+        )
+        recipients = [(lead_id, f"lead{lead_id}@example.com") for lead_id in range(1, 21)]
+        recipients.append((21, "lead21@example.com"))
+        recipients.append((5, "bounce@example.com"))
+        report = await dispatcher.dispatch(recipients)
+        await pool.close()
+        server.close()
+        await server.wait_closed()
+        return report, telemetry, smtp
+
+    report, telemetry, smtp = asyncio.run(scenario())
+
+    assert (report.sent, report.skipped_unapproved, len(report.failures)) == (20, 1, 1)
+    assert "recipient refused" in report.failures[0].reason
+    assert len(smtp.messages) == 20
+    assert b"Subject: Intro" in smtp.messages[0] and b"Hi" in smtp.messages[0]
+    assert smtp.sessions <= 2
+    events = telemetry.list_events()
+    assert sum(event.event_type == DeliveryEventType.SENT for event in events) == 20
+    assert [event.recipient for event in events if event.event_type == DeliveryEventType.BOUNCED] == [
+        "bounce@example.com"
+    ]
+
+
+def test_sender_side_refusals_fail_without_suppressing_the_recipient() -> None:
+    async def scenario() -> tuple:
+        smtp = _LocalSMTPServer()
+        server = await asyncio.start_server(smtp.handle, "127.0.0.1", 0)
+        pool = SMTPConnectionPool("127.0.0.1", server.sockets[0].getsockname()[1], sender="blocked@localhost")
+        telemetry = DeliveryTelemetry()
+        dispatcher = EmailDispatcher(telemetry, _approved_workflow(1), pool, global_rate=1_000)
+        report = await dispatcher.dispatch([(1, "jane@example.com")])
+        await pool.close()
+        server.close()
+        await server.wait_closed()
+        return report, telemetry
+
+    report, telemetry = asyncio.run(scenario())
+
+    assert (report.sent, report.retries, len(report.failures)) == (0, 0, 1)
+    assert "553" in report.failures[0].reason
+    assert telemetry.list_events() == []
+    assert not telemetry.is_suppressed("jane@example.com")
+
+
+def test_pool_hands_a_dropped_connections_slot_to_the_next_sender() -> None:
+    async def scenario() -> tuple:
+        smtp = _LocalSMTPServer()
+        sessions = 0
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            nonlocal sessions
+            sessions += 1
+            if sessions == 1:
+                # Greet, then hang up at EHLO: the first send sees SMTPServerDisconnected.
+                writer.write(b"220 localhost ESMTP\r\n")
+                await writer.drain()
+                await reader.readline()
+                writer.close()
+                return
+            await smtp.handle(reader, writer)
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        pool = SMTPConnectionPool("127.0.0.1", server.sockets[0].getsockname()[1], size=1)
+        emails = [OutboundEmail(lead_id, f"lead{lead_id}@example.com", "Intro", "Hi") for lead_id in (1, 2)]
+        results = await asyncio.wait_for(
+            asyncio.gather(*(pool.send(email) for email in emails), return_exceptions=True), timeout=5
+        )
+        await pool.close()
+        server.close()
+        await server.wait_closed()
+        return results, smtp
+
+    results, smtp = asyncio.run(scenario())
+
+    assert isinstance(results[0], DeliveryError)
+    assert results[1] is None
+    assert len(smtp.messages) == 1
+
+
+def test_dispatch_cancels_in_flight_sends_on_unexpected_errors() -> None:
+    class BrokenTransport:
+        def __init__(self) -> None:
+            self.cancelled = 0
+
+        async def send(self, email: OutboundEmail) -> None:
+            if email.lead_id == 1:
+                try:
+                    await asyncio.sleep(60)
+                except asyncio.CancelledError:
+                    self.cancelled += 1
+                    raise
+            raise RuntimeError("transport bug")
+
+        async def close(self) -> None:
+            pass
+
+    transport = BrokenTransport()
+    telemetry = DeliveryTelemetry()
+    dispatcher = EmailDispatcher(telemetry, _approved_workflow(1, 2), transport, global_rate=1_000)
+    recipients = [(lead_id, f"lead{lead_id}@example.com") for lead_id in (1, 2)]
+
+    with pytest.raises(ExceptionGroup):
+        asyncio.run(asyncio.wait_for(dispatcher.dispatch(recipients), timeout=5))
+    assert transport.cancelled == 1
+
+
+def test_dispatcher_retries_transient_failures_with_backoff() -> None:
+    class FlakyTransport:
+        def __init__(self) -> None:
+            self.attempts = 0
+
+        async def send(self, email: OutboundEmail) -> None:
+            self.attempts += 1
+            if self.attempts < 3:
+                raise DeliveryError("temporarily unavailable")
+
+        async def close(self) -> None:
+            pass
+
+    transport = FlakyTransport()
+    telemetry = DeliveryTelemetry()
+    dispatcher = EmailDispatcher(telemetry, _approved_workflow(1), transport, backoff_seconds=0.001)
+
+    report = asyncio.run(dispatcher.dispatch([(1, "jane@example.com")]))
+
+    assert (report.sent, report.retries, transport.attempts) == (1, 2, 3)
+    assert len(telemetry.list_events()) == 1
+
+
+def test_service_sends_the_latest_approved_draft() -> None:
+    class RecordingTransport:
+        def __init__(self) -> None:
+            self.sent: list[OutboundEmail] = []
+
+        async def send(self, email: OutboundEmail) -> None:
+            self.sent.append(email)
+
+        async def close(self) -> None:
+            pass
+
+    transport = RecordingTransport()
+    service = LeadIngestionService(approvals=_approved_workflow(1), email_transport=transport)
+    resubmitted = service.approvals.submit(1, replace(service.approvals.get(1).draft, subject="Follow-up"))
+
+    report = asyncio.run(service.send_approved_drafts([(1, "jane@example.com"), (2, "joe@example.com")]))
+    assert (report.sent, report.skipped_unapproved) == (1, 1)
+    assert [email.subject for email in transport.sent] == ["Intro"]
+
+    service.approvals.review(resubmitted.revision_id, reviewer="manager", approve=True)
+    asyncio.run(service.send_approved_drafts([(1, "jane@example.com")]))
+    assert [email.subject for email in transport.sent] == ["Intro", "Follow-up"]
+    with pytest.raises(ValueError, match="no email transport"):
+        asyncio.run(LeadIngestionService().send_approved_drafts([(1, "jane@example.com")]))
+
+
+def test_token_bucket_limits_rate() -> None:
+    async def scenario() -> float:
+        bucket = TokenBucket(rate=100, capacity=1)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for _ in range(6):
+            await bucket.acquire()
+        return loop.time() - started
+
+    assert asyncio.run(scenario()) >= 0.045
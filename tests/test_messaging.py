@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.main import LeadIngestionService
+from app.messaging import MessageCTA, MessageGenerationControls, MessageTemplate, MessageTone
+from app.models import DataSource, InboundLead
+
+CONTROLS = MessageGenerationControls(
+    tone=MessageTone.DIRECT,
+    template=MessageTemplate.FOLLOW_UP,
+    cta=MessageCTA.BOOK_CALL,
+)
+
+
+def _service(count: int, **kwargs) -> LeadIngestionService:
+    service = LeadIngestionService(**kwargs)
+    service.ingest(
+        provider_name="proxycurl",
+        leads=[
+            InboundLead(
+                full_name=f"Lead {index}",
+                title="Head of Sales",
+                company=f"Company {index}",
+                profile_url=f"https://www.linkedin.com/in/lead-{index}",
+                source=DataSource.OFFICIAL_API,
+            )
+            for index in range(count)
+        ],
+    )
+    return service
+
+
+def test_campaign_drafts_stream_in_batches_and_match_single_generation() -> None:
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        service = _service(7, draft_executor=executor)
+        batches = list(
+            service.generate_campaign_drafts([7, 1, 2, 99, 3, 4, 5, 6], CONTROLS, batch_size=3)
+        )
+
+    assert [[item.lead_id for item in batch] for batch in batches] == [[7, 1, 2], [3, 4, 5], [6]]
+    for batch in batches:
+        for item in batch:
+            assert item.draft == service.generate_message_draft(item.lead_id, CONTROLS)
+            assert item.revision_id is None
+
+
+def test_campaign_drafts_can_be_submitted_for_approval() -> None:
+    service = _service(2)
+
+    (batch,) = service.generate_campaign_drafts([1, 2], CONTROLS, submit_for_approval=True)
+
+    assert [item.revision_id for item in batch] == [1, 2]
+    assert not service.approvals.is_send_allowed(1)
+    service.approvals.review(1, reviewer="manager", approve=True)
+    assert service.approvals.is_send_allowed(1)
+
+
+def test_drafts_for_the_same_lead_share_personalization_evidence() -> None:
+    service = _service(1)
+    friendly = MessageGenerationControls(
+        tone=MessageTone.FRIENDLY,
+        template=MessageTemplate.INTRO,
+        cta=MessageCTA.REPLY,
+    )
+
+    first = service.generate_message_draft(1, CONTROLS)
+    second = service.generate_message_draft(1, friendly)
+
+    assert first.body.startswith("Hello Lead 0,\n\nI wanted to follow up")
+    assert second.subject == "Intro idea for Company 0"
+    assert first.personalization is not second.personalization
+    assert all(a is b for a, b in zip(first.personalization, second.personalization))
+    assert [item.token for item in first.personalization] == ["full_name", "title", "company", "profile_url"]
+    assert len({item.captured_at for item in first.personalization}) == 1
+
+    service.draft_generator.forget([service.get_lead(1)])
+    assert service.generate_message_draft(1, CONTROLS).personalization[0] is not first.personalization[0]
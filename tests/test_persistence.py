@@ -0,0 +1,179 @@
+import pytest
+
+from app.governance import AuditLog
+from app.main import LeadIngestionService
+from app.models import DataSource, DuplicatePolicy, InboundLead
+from app.persistence import FileAuditBackend, FileLeadBackend
+from app.store import LeadStore
+
+
+def _lead(slug: str) -> InboundLead:
+    return InboundLead(
+        full_name="Jane Doe",
+        title="Head of Sales",
+        company="Acme Inc",
+        profile_url=f"https://www.linkedin.com/in/{slug}",
+        source=DataSource.VETTED_PROVIDER,
+    )
+
+
+def test_leads_survive_restart_from_log_and_snapshot(tmp_path) -> None:
+    store = LeadStore(backend=FileLeadBackend(tmp_path, snapshot_every=3, fsync=False))
+    first = store.add_many([_lead("a"), _lead("b")])
+    store.add_many([_lead("c"), _lead("d")])  # crosses the threshold and compacts
+    store.add_many([_lead("e")])  # stays in the log tail
+    store.close()
+
+    assert (tmp_path / "leads.snapshot").exists()
+    restored = LeadStore(backend=FileLeadBackend(tmp_path, snapshot_every=3, fsync=False))
+
+    assert [lead.id for lead in restored.list_all()] == [1, 2, 3, 4, 5]
+    assert restored.get(1) == first[0]
+    assert restored.get_by_profile_url("https://linkedin.com/in/e").id == 5
+    assert restored.add_many([_lead("f")])[0].id == 6
+
+
+def test_snapshot_round_trips_text_and_sources(tmp_path) -> None:
+    store = LeadStore(backend=FileLeadBackend(tmp_path, fsync=False))
+    lead = _lead("jose")
+    lead.full_name, lead.company = "José Müller 李", "Ünïcode GmbH"
+    lead.source = DataSource.OFFICIAL_API
+    created = store.add_many([lead, _lead("b")])
+    store.compact()
+    store.close()
+    (tmp_path / "leads.log").write_bytes(b"")
+
+    restored = LeadStore(backend=FileLeadBackend(tmp_path, fsync=False))
+    assert restored.list_all() == created
+    restored.close()
+    with pytest.raises(ValueError, match="NUL"):
+        InboundLead("Jane\0Doe", "Head of Sales", "Acme Inc", "https://linkedin.com/in/x", DataSource.OFFICIAL_API).validate()
+
+
+def test_writes_during_a_background_snapshot_survive_restart(tmp_path) -> None:
+    backend = FileLeadBackend(tmp_path, snapshot_every=2, fsync=False)
+    store = LeadStore(backend=backend)
+    store.add_many([_lead("a"), _lead("b")])  # the compactor rotates the log and snapshots in the background
+    store.add_many([_lead("c")])
+    store.compact()
+
+    assert not backend.previous_log_path.exists()
+    store.add_many([_lead("d")])
+    store.close()
+
+    restored = LeadStore(backend=FileLeadBackend(tmp_path, snapshot_every=2, fsync=False))
+    assert [lead.id for lead in restored.list_all()] == [1, 2, 3, 4]
+
+
+def test_rotated_log_left_by_an_interrupted_snapshot_is_replayed(tmp_path) -> None:
+    store = LeadStore(backend=FileLeadBackend(tmp_path, fsync=False))
+    store.add_many([_lead("a"), _lead("b")])
+    store.close()
+    # The process died after rotating the log but before the snapshot was written.
+    (tmp_path / "leads.log").rename(tmp_path / "leads.log.previous")
+    with open(tmp_path / "leads.log", "wb") as fh:
+        fh.write(b'["del",1]\n')
+
+    restored = LeadStore(backend=FileLeadBackend(tmp_path, fsync=False))
+    assert [lead.id for lead in restored.list_all()] == [2]
+    assert not (tmp_path / "leads.log.previous").exists()
+    assert b"/in/a" not in (tmp_path / "leads.snapshot").read_bytes()
+    restored.close()
+
+
+def test_torn_log_tail_is_discarded(tmp_path) -> None:
+    store = LeadStore(backend=FileLeadBackend(tmp_path, fsync=False))
+    store.add_many([_lead("a")])
+    store.close()
+    with open(tmp_path / "leads.log", "ab") as fh:
+        fh.write(b'["add",2,"Half')
+
+    restored = LeadStore(backend=FileLeadBackend(tmp_path, fsync=False))
+    restored.add_many([_lead("b")])
+    restored.close()
+
+    again = LeadStore(backend=FileLeadBackend(tmp_path, fsync=False))
+    assert [lead.profile_url[-1] for lead in again.list_all()] == ["a", "b"]
+
+
+def test_merged_leads_are_replayed_from_log(tmp_path) -> None:
+    store = LeadStore(backend=FileLeadBackend(tmp_path, fsync=False))
+    store.add_many([_lead("a")])
+    updated = _lead("a")
+    updated.title = "VP Sales"
+    store.upsert_many([updated], DuplicatePolicy.MERGE)
+    store.close()
+
+    restored = LeadStore(backend=FileLeadBackend(tmp_path, fsync=False))
+    assert [(lead.id, lead.title) for lead in restored.list_all()] == [(1, "VP Sales")]
+
+
+def test_audit_segments_survive_restart_and_prune_queries(tmp_path) -> None:
+    audit = AuditLog(backend=FileAuditBackend(tmp_path, segment_max_events=2, fsync=False))
+    for lead_id in range(1, 6):
+        audit.append("lead_deleted" if lead_id % 2 else "lead_ingested", {"lead_id": lead_id})
+    audit.flush()
+    assert [event.event_id for event in audit.query("lead_deleted")] == [1, 3, 5]
+    audit.close()
+
+    assert len(list(tmp_path.glob("audit-*.log"))) == 3
+    restored = AuditLog(backend=FileAuditBackend(tmp_path, segment_max_events=2, fsync=False))
+    assert len(restored) == 5
+    assert restored.append("retention_policy_enforced", {"deleted": 0}).event_id == 6
+    assert [event.payload["lead_id"] for event in restored.query(["lead_ingested"])] == [2, 4]
+    assert [event.event_id for event in restored.list_events()] == [1, 2, 3, 4, 5, 6]
+
+    later = restored.list_events()[-1].created_at
+    assert [event.event_id for event in restored.query(start=later)] == [6]
+    assert restored.query("lead_deleted", end=restored.list_events()[0].created_at) == []
+    restored.close()
+
+
+def test_torn_audit_tail_is_discarded(tmp_path) -> None:
+    audit = AuditLog(backend=FileAuditBackend(tmp_path, fsync=False))
+    audit.append("lead_deleted", {"lead_id": 1})
+    audit.close()
+    (segment,) = tmp_path.glob("audit-*.log")
+    with open(segment, "ab") as fh:
+        fh.write(b'["lead_deleted",2,"2026')
+
+    restored = AuditLog(backend=FileAuditBackend(tmp_path, fsync=False))
+    assert restored.append("lead_deleted", {"lead_id": 2}).event_id == 2
+    restored.close()
+
+    again = AuditLog(backend=FileAuditBackend(tmp_path, fsync=False))
+    assert [event.payload for event in again.list_events()] == [{"lead_id": 1}, {"lead_id": 2}]
+    again.close()
+
+
+def test_erased_leads_stay_erased_after_restart_and_compaction(tmp_path) -> None:
+    store = LeadStore(backend=FileLeadBackend(tmp_path, fsync=False))
+    store.add_many([_lead("a"), _lead("b"), _lead("c")])
+    store.remove_many([2])
+    store.close()
+
+    restored = LeadStore(backend=FileLeadBackend(tmp_path, fsync=False))
+    assert [lead.id for lead in restored.list_all()] == [1, 3]
+    restored.remove_many([3])
+    restored.compact()
+    restored.close()
+
+    assert b"/in/c" not in (tmp_path / "leads.snapshot").read_bytes()
+    again = LeadStore(backend=FileLeadBackend(tmp_path, fsync=False))
+    assert [lead.id for lead in again.list_all()] == [1]
+    assert again.add_many([_lead("d")])[0].id == 4
+
+
+def test_service_close_flushes_audit_and_lead_files(tmp_path) -> None:
+    service = LeadIngestionService(
+        store=LeadStore(backend=FileLeadBackend(tmp_path, fsync=False)),
+        audit=AuditLog(backend=FileAuditBackend(tmp_path / "audit", fsync=False)),
+    )
+    lead_id = service.ingest("proxycurl", [_lead("a")]).lead_ids[0]
+    service.erase_leads([lead_id], requested_by="dpo@acme.com")
+    service.close()
+
+    assert list((tmp_path / "audit").glob("audit-*.idx"))
+    restored = AuditLog(backend=FileAuditBackend(tmp_path / "audit", fsync=False))
+    assert [event.payload["lead_id"] for event in restored.query(["lead_deleted"])] == [lead_id]
+    restored.close()
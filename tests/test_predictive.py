@@ -0,0 +1,85 @@
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from app.crm import OutcomeStatus
+from app.main import LeadIngestionService
+from app.models import DataSource, InboundLead
+from app.predictive import HashedLogisticScorer
+from app.scoring import ScoreCache
+
+
+def _service_with_labels() -> LeadIngestionService:
+    rng = random.Random(7)
+    service = LeadIngestionService()
+    titles = ["VP Sales", "Founder", "Engineer", "Intern"]
+    service.ingest(
+        provider_name="proxycurl",
+        leads=[
+            InboundLead(
+                full_name=f"Lead {index}",
+                title=titles[index % 4],
+                company=f"Company {index % 7}",
+                profile_url=f"https://www.linkedin.com/in/lead-{index}",
+                source=DataSource.OFFICIAL_API,
+            )
+            for index in range(200)
+        ],
+    )
+    for lead in service.list_leads():
+        # Founders convert although the default rules do not reward them.
+        won = lead.title in ("VP Sales", "Founder") and rng.random() < 0.8
+        service.crm.sync_outcome(lead.id, OutcomeStatus.WON if won else OutcomeStatus.LOST, 100.0 if won else None)
+    return service
+
+
+def test_model_trains_on_crm_labels_and_beats_the_rules() -> None:
+    service = _service_with_labels()
+    with pytest.raises(ValueError):
+        service.compare_scorers()
+
+    model = service.train_model()
+    rules, predictive = service.compare_scorers()
+
+    assert predictive.auc > rules.auc
+    (lead_id, rule_score, model_score), *_ = service.score_leads_side_by_side([2])
+    assert (lead_id, rule_score) == (2, service.explain_score(2).score)
+    assert model_score == model.score_lead(service.get_lead(2)) > 50
+
+
+def test_model_file_round_trips(tmp_path) -> None:
+    service = _service_with_labels()
+    model = service.train_model(epochs=2)
+    path = tmp_path / "lead-model.bin"
+
+    model.save(path)
+    restored = HashedLogisticScorer.load(path, service.scorer, cache=ScoreCache())
+
+    leads = service.list_leads()
+    assert restored.score_many(leads) == model.score_many(leads)
+    assert path.stat().st_size < 4 * len(model.weights)
+
+
+def test_training_in_a_process_pool_matches_in_process_training() -> None:
+    service = _service_with_labels()
+    local = service.train_model(epochs=2)
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        service.draft_executor = executor
+        pooled = service.train_model(epochs=2)
+
+    assert pooled.rule_scorer is service.scorer
+    leads = service.list_leads()
+    assert pooled.score_many(leads) == local.score_many(leads)
+
+
+def test_cached_model_scores_follow_rule_config_edits() -> None:
+    service = _service_with_labels()
+    model = service.train_model(epochs=2)
+    leads = service.list_leads()
+    before = model.score_many(leads)
+
+    service.scorer.config.title_keywords = ("engineer",)
+    uncached = HashedLogisticScorer(service.scorer, model.weights, model.bias, model.rule_weights, model.feature_bits)
+    assert model.score_many(leads) == uncached.score_many(leads) != before
@@ -0,0 +1,58 @@
+from app.crm import OutcomeStatus
+from app.main import LeadIngestionService
+from app.models import DataSource, InboundLead
+from app.quality import summarize_quality
+from app.scoring import ICPRuleConfig
+
+
+def _brute_force_auc(scores, won) -> float:
+    wins = [score for score, label in zip(scores, won) if label]
+    losses = [score for score, label in zip(scores, won) if not label]
+    pairs = sum(1.0 if w > l else 0.5 if w == l else 0.0 for w in wins for l in losses)
+    return pairs / (len(wins) * len(losses))
+
+
+def test_summary_matches_brute_force_metrics() -> None:
+    scores = [100, 75, 75, 60, 40, 40, 40, 25, 15, 0]
+    won = [1, 1, 0, 1, 0, 1, 0, 0, 0, 0]
+    revenue = [500.0, 300.0, 0.0, 200.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+
+    report = summarize_quality(scores, won, revenue, high_score_threshold=70)
+
+    assert report.auc == _brute_force_auc(scores, won)
+    assert (report.snapshot.total_labeled, report.snapshot.won_count) == (10, 4)
+    assert (report.snapshot.high_score_count, report.snapshot.high_score_win_rate) == (3, 2 / 3)
+    assert [decile.leads for decile in report.deciles] == [1] * 10
+    assert report.top_decile_revenue_lift == 5.0
+    assert [(item.score, item.leads) for item in report.calibration][:2] == [(0, 1), (15, 1)]
+    assert report.calibration[-1].observed_win_rate == 1.0
+
+
+def test_backtest_scores_labeled_leads_with_candidate_config() -> None:
+    service = LeadIngestionService()
+    titles = ["VP Sales", "Head of Sales", "Engineer", "Intern"]
+    service.ingest(
+        provider_name="proxycurl",
+        leads=[
+            InboundLead(
+                full_name=f"Lead {index}",
+                title=title,
+                company="Acme",
+                profile_url=f"https://www.linkedin.com/in/lead-{index}",
+                source=DataSource.OFFICIAL_API,
+            )
+            for index, title in enumerate(titles)
+        ],
+    )
+    service.crm.sync_outcome(1, OutcomeStatus.WON, deal_value=1000.0)
+    service.crm.sync_outcome(2, OutcomeStatus.LOST)
+    service.crm.sync_outcome(3, OutcomeStatus.WON, deal_value=400.0)
+    service.crm.sync_outcome(4, OutcomeStatus.OPEN)
+
+    current = service.quality.report()
+    candidate = service.quality.backtest(ICPRuleConfig(title_keywords=("vp sales", "engineer")))
+
+    assert current.snapshot.total_labeled == 3
+    assert current.auc == 0.25
+    assert candidate.auc == 1.0
+    assert service.scorer.config == ICPRuleConfig()
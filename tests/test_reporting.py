@@ -0,0 +1,146 @@
+from datetime import date, datetime, timedelta, timezone
+
+from app.approval import ApprovalStatus, DraftApproval
+from app.delivery import DeliveryEvent, DeliveryEventType, OutboundChannel, ProviderDeliveryEvent
+from app.main import LeadIngestionService
+from app.messaging import MessageCTA, MessageDraftGenerator, MessageGenerationControls, MessageTemplate, MessageTone
+from app.models import DataSource, InboundLead, Lead
+from app.reporting import FunnelRollups, IncrementalDashboard, ManagerDashboardBuilder
+
+CONTROLS = MessageGenerationControls(
+    tone=MessageTone.PROFESSIONAL,
+    template=MessageTemplate.INTRO,
+    cta=MessageCTA.BOOK_CALL,
+)
+
+
+def _populated_service() -> LeadIngestionService:
+    service = LeadIngestionService()
+    service.ingest(
+        provider_name="proxycurl",
+        leads=[
+            InboundLead(
+                full_name=f"Lead {index}",
+                title="Head of Sales",
+                company="Acme Inc",
+                profile_url=f"https://www.linkedin.com/in/lead-{index}",
+                source=DataSource.OFFICIAL_API,
+            )
+            for index in range(4)
+        ],
+    )
+    for batch in service.generate_campaign_drafts([1, 1, 2, 3], CONTROLS, submit_for_approval=True):
+        assert len(batch) == 4
+    service.approvals.review_many([1, 2, 3], reviewer="manager", approve=True)
+    service.approvals.review(4, reviewer="manager", approve=False)
+    service.delivery.send_email(1, "lead1@example.com", "Intro")
+    service.delivery.send_email(2, "lead2@example.com", "Intro")
+    service.delivery.record_provider_events(
+        [
+            ProviderDeliveryEvent("m-1", 1, "lead1@example.com", "Intro", DeliveryEventType.DELIVERED),
+            ProviderDeliveryEvent("m-2", 2, "lead2@example.com", "Intro", DeliveryEventType.BOUNCED),
+        ]
+    )
+    return service
+
+
+def _full_scan(service: LeadIngestionService):
+    return ManagerDashboardBuilder().build(
+        service.list_leads(),
+        service.approvals.list_approvals(),
+        service.delivery.list_events(),
+    )
+
+
+def test_incremental_dashboard_matches_full_scan() -> None:
+    service = _populated_service()
+
+    snapshot = service.dashboard.build()
+
+    assert snapshot == _full_scan(service)
+    assert snapshot.funnel.leads_with_approved_draft == 2
+    assert snapshot.activity.drafts_reviewed == 4
+
+
+def test_dashboard_attached_late_replays_existing_state() -> None:
+    service = _populated_service()
+    late = IncrementalDashboard()
+    late.attach(service.store, service.approvals, service.delivery)
+
+    assert late.build() == _full_scan(service)
+
+
+def test_rollups_answer_windows_and_rep_days_from_buckets() -> None:
+    now = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+    rollups = FunnelRollups()
+    draft = MessageDraftGenerator().generate(
+        Lead(1, "Jane Doe", "Head of Sales", "Acme", "https://linkedin.com/in/jane", DataSource.OFFICIAL_API),
+        CONTROLS,
+    )
+    ages = [timedelta(minutes=5), timedelta(hours=3), timedelta(days=3), timedelta(days=40)]
+    rollups.on_leads(
+        "added",
+        [
+            Lead(lead_id, "Lead", "Head of Sales", "Acme", f"https://x/{lead_id}", DataSource.OFFICIAL_API, now - age)
+            for lead_id, age in enumerate(ages, start=1)
+        ],
+    )
+    approvals = [
+        DraftApproval(1, 1, draft, ApprovalStatus.APPROVED, "amy", None, now - timedelta(hours=2), now - timedelta(hours=1)),
+        DraftApproval(1, 2, draft, ApprovalStatus.APPROVED, "amy", None, now - timedelta(hours=2), now - timedelta(minutes=30)),
+        DraftApproval(2, 3, draft, ApprovalStatus.REJECTED, "bob", None, now - timedelta(days=2), now - timedelta(days=2)),
+    ]
+    rollups.on_approvals("submitted", approvals)
+    rollups.on_approvals("reviewed", approvals)
+    rollups.on_delivery_events(
+        "recorded",
+        [
+            DeliveryEvent(1, 1, OutboundChannel.EMAIL, "a@x.com", "Intro", DeliveryEventType.SENT, now - timedelta(minutes=20)),
+            DeliveryEvent(2, 1, OutboundChannel.EMAIL, "a@x.com", "Intro", DeliveryEventType.BOUNCED, now - timedelta(days=5)),
+        ],
+    )
+
+    day = rollups.last(timedelta(hours=24), now=now)
+    week = rollups.last(timedelta(days=7), now=now)
+    quarter = rollups.last(timedelta(days=90), now=now)
+
+    assert (day.activity.leads_ingested, day.activity.drafts_submitted, day.activity.approved_drafts) == (2, 2, 2)
+    assert (day.funnel.leads_with_approved_draft, day.funnel.messages_sent, day.funnel.messages_bounced) == (1, 1, 0)
+    assert (week.activity.leads_ingested, week.activity.rejected_drafts, week.funnel.messages_bounced) == (3, 1, 1)
+    assert quarter.activity.leads_ingested == 4
+    rep_days = rollups.daily_by_rep(date(2026, 3, 1), date(2026, 3, 10))
+    assert [(row.day.isoformat(), row.reviewer, row.drafts_reviewed, row.approved_drafts) for row in rep_days] == [
+        ("2026-03-08", "bob", 1, 0),
+        ("2026-03-10", "amy", 2, 2),
+    ]
+
+
+def test_last_day_window_stays_on_minute_buckets() -> None:
+    now = datetime(2026, 3, 10, 12, 30, 30, tzinfo=timezone.utc)
+    rollups = FunnelRollups()
+    rollups.on_leads(
+        "added",
+        [
+            Lead(lead_id, "Lead", "Head of Sales", "Acme", f"https://x/{lead_id}", DataSource.OFFICIAL_API, now - age)
+            for lead_id, age in enumerate([timedelta(0), timedelta(hours=24, minutes=20)], start=1)
+        ],
+    )
+
+    assert rollups.last(timedelta(hours=24), now=now).activity.leads_ingested == 1
+
+
+def test_rep_days_and_approved_leads_are_pruned_with_the_day_buckets() -> None:
+    start = datetime(2016, 1, 1, 9, 0, tzinfo=timezone.utc)
+    rollups = FunnelRollups()
+    draft = MessageDraftGenerator().generate(
+        Lead(1, "Jane Doe", "Head of Sales", "Acme", "https://linkedin.com/in/jane", DataSource.OFFICIAL_API),
+        CONTROLS,
+    )
+    for lead_id, reviewed_at in [(1, start), (2, start + timedelta(days=3652))]:
+        approval = DraftApproval(lead_id, lead_id, draft, ApprovalStatus.APPROVED, "amy", None, reviewed_at, reviewed_at)
+        rollups.on_approvals("reviewed", [approval])
+
+    assert rollups.daily_by_rep(start.date(), start.date()) == []
+    assert list(rollups._approved_leads) == [2]
+    rollups.on_leads("removed", [Lead(2, "Lead", "Head of Sales", "Acme", "https://x/2", DataSource.OFFICIAL_API)])
+    assert rollups._approved_leads == {}
@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.crm import CRMOutcomeChange, OutcomeStatus
+from app.delivery import DeliveryEventType, OutboundChannel
+from app.main import LeadIngestionService
+from app.messaging import MessageCTA, MessageGenerationControls, MessageTemplate, MessageTone
+from app.models import DataSource, InboundLead
+from app.persistence import FileLeadBackend
+from app.reporting import ManagerDashboardBuilder
+from app.retention import RetentionSweeper
+from app.store import LeadStore
+
+CONTROLS = MessageGenerationControls(
+    tone=MessageTone.PROFESSIONAL,
+    template=MessageTemplate.INTRO,
+    cta=MessageCTA.BOOK_CALL,
+)
+
+
+def _service_with_activity(**kwargs) -> LeadIngestionService:
+    service = LeadIngestionService(**kwargs)
+    service.ingest(
+        provider_name="proxycurl",
+        leads=[
+            InboundLead(
+                full_name=f"Lead {index}",
+                title="Head of Sales",
+                company="Acme Inc",
+                profile_url=f"https://www.linkedin.com/in/lead-{index}",
+                source=DataSource.OFFICIAL_API,
+            )
+            for index in range(3)
+        ],
+    )
+    for _ in service.generate_campaign_drafts([1, 1, 2, 3], CONTROLS, submit_for_approval=True):
+        pass
+    service.approvals.review_many([1, 3], reviewer="manager", approve=True)
+    service.delivery.send_email(1, "lead1@example.com", "Intro")
+    service.delivery.record_event(1, OutboundChannel.EMAIL, "lead1@example.com", "Intro", DeliveryEventType.BOUNCED)
+    service.delivery.send_email(2, "lead2@example.com", "Intro")
+    service.crm.sync_outcome(1, OutcomeStatus.WON, deal_value=500.0)
+    service.score_leads()
+    return service
+
+
+def test_erase_cascades_through_every_store() -> None:
+    service = _service_with_activity()
+
+    (erasure,) = service.erase_leads([1, 99], requested_by="dpo@example.com")
+
+    assert (erasure.drafts_removed, erasure.delivery_events_removed, erasure.crm_outcomes_removed) == (2, 2, 1)
+    assert service.store.get(1) is None
+    assert service.store.get_by_profile_url("https://linkedin.com/in/lead-0") is None
+    assert service.approvals.list_approvals(lead_id=1) == []
+    assert not service.approvals.is_send_allowed(1)
+    assert service.delivery.list_events(lead_id=1) == []
+    assert service.delivery.is_suppressed("lead1@example.com")
+    assert service.crm.list_outcomes() == []
+    assert [event.lead_id for event in service.delivery.list_events()] == [2]
+    replay = service.crm.upsert_outcomes(
+        [CRMOutcomeChange("deal-1", 1, OutcomeStatus.WON), CRMOutcomeChange("deal-2", 2, OutcomeStatus.LOST)]
+    )
+    assert (len(replay.created), replay.skipped) == (1, 1)
+    assert service.scorer.cache.stats().size == 2
+    assert service.erase_leads([1], requested_by="dpo@example.com") == []
+
+    assert service.dashboard.build() == ManagerDashboardBuilder().build(
+        service.list_leads(), service.approvals.list_approvals(), service.delivery.list_events()
+    )
+    snapshot = service.compliance.snapshot()
+    assert (snapshot.total_leads, snapshot.dsar_deletions_recorded, snapshot.pending_approvals) == (2, 1, 1)
+    (event,) = service.audit.query("lead_deleted")
+    assert event.payload["lead_id"] == 1
+
+
+def test_retention_sweeper_erases_expired_leads_oldest_first() -> None:
+    service = _service_with_activity()
+    service.erase_leads([2], requested_by="dpo@example.com")
+    later = datetime.now(timezone.utc) + timedelta(days=400)
+
+    sweeper = RetentionSweeper(service, max_age=timedelta(days=365), batch_size=1, clock=lambda: later)
+
+    assert sweeper.run_once() == 2
+    assert service.list_leads() == []
+    assert service.delivery.list_events() == []
+    assert sweeper.run_once() == 0
+    snapshot = service.compliance.snapshot()
+    assert (snapshot.retention_runs_recorded, snapshot.dsar_deletions_recorded) == (2, 1)
+
+
+def test_erase_drops_cached_evidence_and_lead_file_rows(tmp_path) -> None:
+    service = _service_with_activity(store=LeadStore(backend=FileLeadBackend(tmp_path, fsync=False)))
+    assert b"Lead 0" in (tmp_path / "leads.log").read_bytes()
+
+    service.erase_leads([1], requested_by="dpo@example.com")
+    service.close()  # finishes the snapshot the erasure requested
+
+    assert 1 not in service.draft_generator._evidence
+    assert all(b"Lead 0" not in path.read_bytes() for path in tmp_path.iterdir() if path.is_file())
+
+
+def test_sweeper_thread_survives_a_failed_run() -> None:
+    service = _service_with_activity()
+    runs: list[int] = []
+
+    class FlakySweeper(RetentionSweeper):
+        def run_once(self) -> int:
+            runs.append(1)
+            if len(runs) == 1:
+                raise OSError("disk full")
+            self._stopped.set()
+            return 0
+
+    sweeper = FlakySweeper(service, max_age=timedelta(days=1), interval_seconds=0.01)
+    sweeper.start()
+    sweeper._thread.join(timeout=5)
+
+    assert len(runs) == 2
+
+
+def test_sweeper_skips_runs_while_another_worker_holds_the_lease() -> None:
+    service = _service_with_activity()
+    attempts: list[int] = []
+
+    class HeldLease:
+        released = False
+
+        def acquire(self) -> bool:
+            attempts.append(1)
+            if len(attempts) == 2:
+                sweeper._stopped.set()
+            return False
+
+        def release(self) -> None:
+            self.released = True
+
+    lease = HeldLease()
+    sweeper = RetentionSweeper(service, max_age=timedelta(days=1), interval_seconds=0.01, lease=lease)
+    sweeper.start()
+    sweeper._thread.join(timeout=5)
+    sweeper.stop()
+
+    assert len(attempts) == 2 and lease.released
+    assert service.audit.query(actions=["retention_policy_enforced"]) == []
+
+
+def test_retried_erase_finishes_a_cascade_that_failed_halfway() -> None:
+    service = _service_with_activity()
+    remove_events = service.delivery.remove_leads
+
+    def failing(lead_ids):
+        raise OSError("disk full")
+
+    service.delivery.remove_leads = failing
+    with pytest.raises(OSError):
+        service.erase_leads([1], requested_by="dpo@example.com")
+    assert service.store.get(1) is None
+    assert service.delivery.list_events(lead_id=1) != []
+
+    service.delivery.remove_leads = remove_events
+    (erasure,) = service.erase_leads([1], requested_by="dpo@example.com")
+
+    assert (erasure.lead_id, erasure.drafts_removed, erasure.delivery_events_removed) == (1, 0, 2)
+    assert (service.delivery.list_events(lead_id=1), service.crm.list_outcomes(lead_id=1)) == ([], [])
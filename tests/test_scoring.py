@@ -0,0 +1,76 @@
+from app.models import DataSource, InboundLead
+from app.scoring import ICPRuleConfig, RuleBasedScorer, ScoreCache
+
+
+def _leads() -> list[InboundLead]:
+    rows = [
+        ("Jane Doe", "Head of Sales", "Acme B2B", "https://www.linkedin.com/in/jane"),
+        ("John Smith", "Engineer", "SaaS Labs", "https://example.com/john"),
+        ("Ann Lee", "Sales Director, EMEA", "Gamma", "https://linkedin.com/in/ann"),
+        ("  ", "VP Sales", "b2b saas", "https://linkedin.com/in/blank"),
+    ]
+    return [
+        InboundLead(full_name=name, title=title, company=company, profile_url=url, source=DataSource.OFFICIAL_API)
+        for name, title, company, url in rows
+    ]
+
+
+def test_score_many_matches_score_lead() -> None:
+    configs = [
+        ICPRuleConfig(),
+        ICPRuleConfig(title_keywords=(), company_keywords=("",), max_score=50),
+        ICPRuleConfig(title_keywords=("sales (vp)", "engineer"), min_score=30),
+    ]
+    leads = _leads()
+    for config in configs:
+        scorer = RuleBasedScorer(config)
+        assert list(scorer.score_many(leads)) == [scorer.score_lead(lead).score for lead in leads]
+
+
+def test_score_many_recompiles_when_config_changes() -> None:
+    scorer = RuleBasedScorer()
+    leads = _leads()
+    assert list(scorer.score_many(leads)) == [100, 50, 75, 75]
+
+    scorer.config.title_keywords = ("engineer",)
+    assert list(scorer.score_many(leads)) == [65, 85, 40, 40]
+
+
+def test_score_lead_builds_breakdown_lazily_from_mask() -> None:
+    scorer = RuleBasedScorer()
+    lead = _leads()[2]
+
+    result = scorer.score_lead(lead)
+
+    assert result.score == scorer.score_value(lead) == 75
+    assert result._breakdown is None
+    assert [(item.rule, item.points, item.matched) for item in result.breakdown] == [
+        ("title_keyword_match", 35, True),
+        ("company_keyword_match", 0, False),
+        ("linkedin_profile_detected", 15, True),
+        ("record_completeness", 25, True),
+    ]
+    assert result.breakdown[1].reason == "No ICP company keywords matched"
+    assert result.breakdown is result.breakdown
+
+
+def test_score_cache_hits_evicts_and_invalidates_on_config_change() -> None:
+    scorer = RuleBasedScorer(cache=ScoreCache(max_entries=3))
+    leads = _leads()
+    expected = list(RuleBasedScorer().score_many(leads))
+
+    assert list(scorer.score_many(leads[:3])) == expected[:3]
+    assert scorer.score_value(leads[3]) == expected[3]
+    assert scorer.score_value(leads[3]) == expected[3]
+    stats = scorer.cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 4, 1, 3)
+
+    # A scan larger than the cache would only churn it, so it skips the cache entirely.
+    assert list(scorer.score_many(leads)) == expected
+    stats = scorer.cache.stats()
+    assert (stats.hits, stats.misses, stats.bypassed, stats.size) == (1, 4, 4, 3)
+
+    scorer.config.company_match_points = 5
+    assert scorer.score_lead(leads[3]).score == 55
+    stats = scorer.cache.stats()
+    assert (stats.misses, stats.size) == (5, 1)
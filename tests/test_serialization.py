@@ -0,0 +1,72 @@
+import json
+from dataclasses import asdict
+from datetime import date, datetime, timezone
+from enum import Enum
+
+from app.delivery import DeliveryEventType, OutboundChannel
+from app.main import LeadIngestionService
+from app.messaging import MessageCTA, MessageGenerationControls, MessageTemplate, MessageTone
+from app.models import DataSource, InboundLead
+from app.quality import summarize_quality
+from app.reporting import RepDailyActivity
+from app.serialization import dumps, dumps_lines
+
+
+def _reference(value: object) -> bytes:
+    # What FastAPI sent before: asdict, then enums and dates flattened by jsonable_encoder.
+    def plain(item: object) -> object:
+        if isinstance(item, Enum):
+            return item.value
+        if isinstance(item, (datetime, date)):
+            return item.isoformat()
+        if isinstance(item, dict):
+            return {key: plain(child) for key, child in item.items()}
+        if isinstance(item, (list, tuple)):
+            return [plain(child) for child in item]
+        return item
+
+    return json.dumps(plain(asdict(value)), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def test_encoders_match_asdict_output() -> None:
+    service = LeadIngestionService()
+    response = service.ingest(
+        provider_name="proxycurl",
+        leads=[
+            InboundLead("Zoë Müller", "Head of Sales", "Acme B2B", "https://www.linkedin.com/in/zoe", DataSource.OFFICIAL_API),
+            InboundLead("X", "VP Sales", "Beta", "not-a-url", DataSource.VETTED_PROVIDER),
+        ],
+    )
+    lead = service.get_lead(response.lead_ids[0])
+    draft = service.generate_message_draft(
+        lead.id, MessageGenerationControls(MessageTone.DIRECT, MessageTemplate.FOLLOW_UP, MessageCTA.BOOK_CALL)
+    )
+    event = service.delivery.record_event(
+        lead.id, OutboundChannel.EMAIL, "zoe@acme.com", draft.subject, DeliveryEventType.SENT
+    )
+    report = summarize_quality([90, 40], [1, 0], [100.0, 0.0])
+    rep_day = RepDailyActivity(date(2026, 1, 2), "manager@acme.com", 3, 2, 1)
+
+    for value in (response, lead, draft, event, report, rep_day, service.explain_score(lead.id).breakdown[0]):
+        assert dumps(value) == _reference(value)
+
+
+def test_dumps_handles_nested_containers_and_ndjson() -> None:
+    service = LeadIngestionService()
+    service.ingest(
+        provider_name="proxycurl",
+        leads=[
+            InboundLead(f"Lead {index}", "Head of Sales", "Acme", f"https://linkedin.com/in/{index}", DataSource.OFFICIAL_API)
+            for index in range(2)
+        ],
+    )
+    leads = service.list_leads()
+
+    page = json.loads(dumps({"items": leads, "next_after_id": None}))
+    assert [item["id"] for item in page["items"]] == [lead.id for lead in leads]
+    assert page["items"][0]["created_at"] == leads[0].created_at.isoformat()
+
+    lines = dumps_lines(leads).splitlines()
+    assert [json.loads(line)["source"] for line in lines] == ["official_api", "official_api"]
+    assert dumps_lines([]) == b""
+    assert dumps(datetime(2026, 1, 2, tzinfo=timezone.utc)) == b'"2026-01-02T00:00:00+00:00"'
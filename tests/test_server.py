@@ -0,0 +1,275 @@
+import json
+from dataclasses import asdict
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app import server
+from app.crm import OutcomeStatus
+from app.crm_connector import CRMOutcomePuller
+from app.main import LeadIngestionService
+from app.persistence import FileCursorStore
+
+
+@pytest.fixture
+def service(monkeypatch) -> LeadIngestionService:
+    service = LeadIngestionService()
+    monkeypatch.setattr(server, "service", service)
+    return service
+
+
+@pytest.fixture
+def client(service) -> TestClient:
+    # No ``with`` block: the lifespan would shut down the module-level executors and backends.
+    return TestClient(server.app)
+
+
+def _lead(slug: str, **overrides) -> dict:
+    return {
+        "full_name": "Jane Doe",
+        "title": "Head of Sales",
+        "company": "Acme Inc",
+        "profile_url": f"https://www.linkedin.com/in/{slug}",
+        "source": "official_api",
+        **overrides,
+    }
+
+
+def _ingest(client: TestClient, *slugs: str) -> list[int]:
+    response = client.post("/v1/leads/ingest", json={"provider_name": "proxycurl", "leads": list(map(_lead, slugs))})
+    return response.json()["lead_ids"]
+
+
+CONTROLS = {"tone": "friendly", "template": "intro", "cta": "reply"}
+
+
+def _label(client: TestClient, service: LeadIngestionService) -> None:
+    """Two leads that fit the default ICP won, two that don't were lost."""
+    _ingest(client, "a", "b")
+    misfits = [_lead(slug, title="Intern", company="Garden Club") for slug in ("c", "d")]
+    client.post("/v1/leads/ingest", json={"provider_name": "proxycurl", "leads": misfits})
+    for lead_id in (1, 2):
+        service.crm.sync_outcome(lead_id, OutcomeStatus.WON, deal_value=1_000.0)
+    for lead_id in (3, 4):
+        service.crm.sync_outcome(lead_id, OutcomeStatus.LOST)
+
+
+def test_ingest_stream_commits_ndjson_in_chunks(client, service) -> None:
+    body = "\n".join([json.dumps(_lead("a")), "{not json", json.dumps(_lead("b")), json.dumps(_lead("a"))])
+
+    response = client.post(
+        "/v1/leads/ingest/stream",
+        params={"provider_name": "proxycurl", "chunk_size": 2},
+        content=body.encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    summary = response.json()
+    assert (summary["chunks_committed"], summary["rows_processed"]) == (2, 4)
+    assert (summary["accepted"], summary["rejected"], summary["duplicates"]) == (2, 1, 1)
+    assert "line 2" in summary["rejections"][0]["reason"]
+    assert len(service.list_leads()) == 2
+    assert client.post("/v1/leads/ingest/stream", params={"provider_name": "proxycurl"}, content=b"").status_code == 400
+
+
+def test_ingest_accepts_valid_rows_and_reports_the_rest(client) -> None:
+    leads = [_lead("a"), _lead("b", profile_url="not-a-url"), _lead("a"), _lead("c", source="scraped")]
+
+    response = client.post("/v1/leads/ingest", json={"provider_name": "proxycurl", "leads": leads})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["accepted"], body["rejected"], body["duplicates"], body["lead_ids"]) == (1, 2, 1, [1])
+    assert [rejection["row"] for rejection in body["rejections"]] == [1, 3]
+    assert client.post("/v1/leads/ingest", json={"provider_name": "  ", "leads": leads}).status_code == 400
+
+
+def test_campaign_drafts_stream_one_line_per_batch(client, service) -> None:
+    lead_ids = _ingest(client, "a", "b", "c")
+
+    response = client.post(
+        "/v1/campaigns/drafts",
+        json={"lead_ids": [*lead_ids, 99], "controls": CONTROLS, "submit_for_approval": True, "batch_size": 2},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    batches = [json.loads(line)["drafts"] for line in response.text.splitlines()]
+    assert [[draft["lead_id"] for draft in batch] for batch in batches] == [[1, 2], [3]]
+    assert [draft["revision_id"] for batch in batches for draft in batch] == [1, 2, 3]
+    assert "Acme Inc" in batches[0][0]["subject"] + batches[0][0]["body"]
+    assert service.approvals.pending_count() == 3
+
+
+def test_approval_queue_pages_and_reviews_in_bulk(client, service) -> None:
+    lead_ids = _ingest(client, "a", "b", "c")
+    client.post("/v1/campaigns/drafts", json={"lead_ids": lead_ids, "controls": CONTROLS, "submit_for_approval": True})
+
+    first = client.get("/v1/approvals/pending", params={"limit": 2}).json()
+    assert (first["pending_total"], first["next_after_revision_id"]) == (3, 2)
+    assert [item["revision_id"] for item in first["items"]] == [1, 2]
+
+    review = {"revision_ids": [1, 3], "reviewer": "manager", "approve": True}
+    reviewed = client.post("/v1/approvals/review", json=review)
+    assert [item["status"] for item in reviewed.json()] == ["approved", "approved"]
+    assert service.approvals.is_send_allowed(1) and not service.approvals.is_send_allowed(2)
+
+    rest = client.get("/v1/approvals/pending", params={"after_revision_id": 1}).json()
+    assert ([item["revision_id"] for item in rest["items"]], rest["next_after_revision_id"]) == ([2], None)
+    assert client.post("/v1/approvals/review", json=review).status_code == 409
+
+
+def test_send_route_emails_approved_drafts(client, monkeypatch) -> None:
+    class RecordingTransport:
+        def __init__(self) -> None:
+            self.sent: list = []
+
+        async def send(self, email) -> None:
+            self.sent.append(email)
+
+        async def close(self) -> None:
+            pass
+
+    payload = {"recipients": [{"lead_id": 1, "recipient": "jane@example.com"}]}
+    assert client.post("/v1/delivery/send", json=payload).status_code == 404
+
+    transport = RecordingTransport()
+    monkeypatch.setattr(server, "service", LeadIngestionService(email_transport=transport))
+    lead_ids = _ingest(client, "a", "b")
+    client.post("/v1/campaigns/drafts", json={"lead_ids": lead_ids, "controls": CONTROLS, "submit_for_approval": True})
+    client.post("/v1/approvals/review", json={"revision_ids": [1], "reviewer": "manager", "approve": True})
+    payload["recipients"].append({"lead_id": 2, "recipient": "joe@example.com"})
+
+    report = client.post("/v1/delivery/send", json=payload).json()
+
+    assert (report["sent"], report["skipped_unapproved"], report["failures"]) == (1, 1, [])
+    assert [email.recipient for email in transport.sent] == ["jane@example.com"]
+
+
+def test_webhook_route_deduplicates_and_drops_unknown_leads(client, service) -> None:
+    _ingest(client, "a")
+    event = {"provider_message_id": "m-1", "lead_id": 1, "recipient": "jane@example.com", "event_type": "delivered"}
+    late = {**event, "provider_message_id": "m-2", "lead_id": 7, "event_type": "bounced"}
+
+    first = client.post("/v1/delivery/webhooks", json={"events": [event, event, late]})
+    retry = client.post("/v1/delivery/webhooks", json={"events": [event]})
+
+    assert first.json() == {"accepted": 1, "duplicates": 1, "unknown_leads": 1}
+    assert retry.json() == {"accepted": 0, "duplicates": 1, "unknown_leads": 0}
+    assert [item.lead_id for item in service.delivery.list_events()] == [1]
+    assert client.post("/v1/delivery/webhooks", json={"events": []}).status_code == 422
+
+
+def test_erase_route_cascades_and_is_repeatable(client, service) -> None:
+    lead_ids = _ingest(client, "a", "b")
+    client.post("/v1/campaigns/drafts", json={"lead_ids": lead_ids, "controls": CONTROLS, "submit_for_approval": True})
+    payload = {"lead_ids": [1, 99], "requested_by": "dpo@example.com"}
+
+    erased = client.post("/v1/leads/erase", json=payload)
+
+    assert erased.json() == [
+        {"lead_id": 1, "drafts_removed": 1, "delivery_events_removed": 0, "crm_outcomes_removed": 0}
+    ]
+    assert client.get("/v1/leads/1").status_code == 404
+    assert [item.lead_id for item in service.approvals.list_approvals()] == [2]
+    assert client.post("/v1/leads/erase", json=payload).json() == []
+    assert client.post("/v1/leads/erase", json={**payload, "requested_by": "  "}).status_code == 400
+
+
+def test_crm_pull_route_resumes_from_the_saved_cursor(client, service, monkeypatch, tmp_path) -> None:
+    class FeedPool:
+        def __init__(self) -> None:
+            self.cursors: list = []
+
+        def get_json(self, path: str, params: dict) -> dict:
+            self.cursors.append(params.get("cursor"))
+            change = {"id": "deal-1", "lead_id": 1, "status": "won", "deal_value": 500.0}
+            return {"changes": [change], "next_cursor": "1", "has_more": False}
+
+    monkeypatch.setattr(server, "crm_puller", None)
+    assert client.post("/v1/crm/pull").status_code == 404
+
+    _ingest(client, "a")
+    pool = FeedPool()
+    puller = CRMOutcomePuller(service.crm, pool, FileCursorStore(tmp_path / "crm.cursor"))
+    monkeypatch.setattr(server, "crm_puller", puller)
+
+    first = client.post("/v1/crm/pull").json()
+    client.post("/v1/crm/pull")
+    client.post("/v1/crm/pull", params={"full": "true"})
+
+    assert (first["created"], first["cursor"]) == (1, "1")
+    assert pool.cursors == [None, "1", None]
+    assert [record.deal_value for record in service.crm.list_outcomes()] == [500.0]
+
+
+def test_quality_and_backtest_routes_join_crm_labels(client, service) -> None:
+    _label(client, service)
+
+    report = client.get("/v1/scoring/quality").json()
+    assert report["snapshot"]["total_labeled"] == 4 and report["snapshot"]["won_count"] == 2
+    assert report["auc"] == 1.0
+
+    candidate = {"title_keywords": ["intern"], "company_keywords": ["garden"]}
+    backtest = client.post("/v1/scoring/backtest", json=candidate).json()
+    assert backtest["current"] == report
+    assert backtest["candidate"]["auc"] == 0.0
+    assert client.post("/v1/scoring/backtest", json={**candidate, "title_keywords": []}).status_code == 422
+
+
+def test_model_routes_train_compare_and_score_side_by_side(client, service, monkeypatch) -> None:
+    monkeypatch.setattr(server, "_model_path", None)
+    _label(client, service)
+
+    assert client.post("/v1/leads/scores", json={"include_model": True}).status_code == 409
+    assert client.get("/v1/scoring/model/compare").status_code == 409
+
+    trained = client.post("/v1/scoring/model/train", json={"epochs": 3})
+    assert trained.status_code == 200
+    assert trained.json()["rules"]["snapshot"]["total_labeled"] == 4
+    assert client.get("/v1/scoring/model/compare").json() == trained.json()
+
+    scores = client.post("/v1/leads/scores", json={"lead_ids": [1, 3], "include_model": True}).json()
+    assert [row["lead_id"] for row in scores] == [1, 3]
+    assert scores[0]["score"] > scores[1]["score"]
+    assert all(0 <= row["model_score"] <= 100 for row in scores)
+    rules_only = client.post("/v1/leads/scores", json={"lead_ids": [1]}).json()
+    assert rules_only == [{"lead_id": 1, "score": scores[0]["score"]}]
+
+
+def test_leads_route_pages_filters_and_streams(client) -> None:
+    leads = [_lead(f"lead-{index}", source="vetted_provider" if index % 2 else "official_api") for index in range(5)]
+    client.post("/v1/leads/ingest", json={"provider_name": "proxycurl", "leads": leads})
+
+    first = client.get("/v1/leads", params={"limit": 2}).json()
+    second = client.get("/v1/leads", params={"limit": 2, "after_id": first["next_after_id"]}).json()
+    assert ([lead["id"] for lead in first["items"]], first["next_after_id"]) == ([1, 2], 2)
+    assert [lead["id"] for lead in second["items"]] == [3, 4]
+
+    vetted = client.get("/v1/leads", params={"source": "vetted_provider"}).json()
+    assert ([lead["id"] for lead in vetted["items"]], vetted["next_after_id"]) == ([2, 4], None)
+    assert client.get("/v1/leads", params={"min_score": 101}).json()["items"] == []
+    assert client.get("/v1/leads", params={"limit": 0}).status_code == 422
+
+    streamed = client.get("/v1/leads/stream", params={"source": "official_api"})
+    assert streamed.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["id"] for line in streamed.text.splitlines()] == [1, 3, 5]
+
+
+def test_responses_match_fastapis_default_encoding(client, service) -> None:
+    _ingest(client, "a")
+    client.post("/v1/campaigns/drafts", json={"lead_ids": [1], "controls": CONTROLS, "submit_for_approval": True})
+
+    def default(value: object) -> bytes:
+        return JSONResponse(jsonable_encoder(value)).body
+
+    assert client.get("/v1/leads/1").content == default(asdict(service.get_lead(1)))
+    assert client.get("/v1/compliance").content == default(asdict(service.compliance.snapshot()))
+    assert client.get("/v1/dashboard").content == default(asdict(service.dashboard.build()))
+    score = client.get("/v1/leads/1/score")
+    assert score.headers["content-type"] == "application/json"
+    result = service.explain_score(1)
+    assert score.content == default({"lead_id": 1, "score": result.score, "breakdown": result.breakdown})
@@ -0,0 +1,127 @@
+import multiprocessing
+
+from app.approval import ApprovalWorkflow
+from app.delivery import DeliveryEventType, DeliveryTelemetry, OutboundChannel, ProviderDeliveryEvent
+from app.governance import AuditLog
+from app.main import LeadIngestionService
+from app.messaging import MessageCTA, MessageGenerationControls, MessageTemplate, MessageTone
+from app.models import DataSource, InboundLead
+from app.shared_state import (
+    SharedStateDatabase,
+    SQLiteApprovalBackend,
+    SQLiteAuditBackend,
+    SQLiteDeliveryBackend,
+    SQLiteLeadBackend,
+    SQLiteLease,
+)
+from app.store import LeadStore
+
+CONTROLS = MessageGenerationControls(MessageTone.DIRECT, MessageTemplate.FOLLOW_UP, MessageCTA.BOOK_CALL)
+
+
+def _worker(path) -> LeadIngestionService:
+    database = SharedStateDatabase(path)
+    return LeadIngestionService(
+        store=LeadStore(backend=SQLiteLeadBackend(database)),
+        approvals=ApprovalWorkflow(backend=SQLiteApprovalBackend(database)),
+        delivery=DeliveryTelemetry(backend=SQLiteDeliveryBackend(database)),
+        audit=AuditLog(backend=SQLiteAuditBackend(database)),
+    )
+
+
+def _lead(slug: str) -> InboundLead:
+    return InboundLead("Jane Doe", "Head of Sales", "Acme B2B", f"https://www.linkedin.com/in/{slug}", DataSource.OFFICIAL_API)
+
+
+def _ingest_one_at_a_time(path, prefix: str, count: int) -> None:
+    service = _worker(path)
+    for index in range(count):
+        service.ingest("proxycurl", [_lead(f"{prefix}-{index}")])
+
+
+def test_workers_share_leads_and_allocate_distinct_ids(tmp_path) -> None:
+    first, second = _worker(tmp_path / "state.db"), _worker(tmp_path / "state.db")
+
+    assert first.ingest("proxycurl", [_lead("a"), _lead("b")]).lead_ids == [1, 2]
+    # Writers catch up before allocating, even without an explicit refresh.
+    response = second.ingest("proxycurl", [_lead("a"), _lead("c")])
+    assert response.lead_ids == [3]
+    assert response.duplicates == 1
+
+    first.refresh()
+    assert [lead.id for lead in first.list_leads()] == [1, 2, 3]
+    assert first.store.get_by_profile_url("https://linkedin.com/in/c").id == 3
+    assert [lead.id for lead in _worker(tmp_path / "state.db").list_leads()] == [1, 2, 3]
+
+
+def test_approvals_delivery_and_erasure_propagate_between_workers(tmp_path) -> None:
+    first, second = _worker(tmp_path / "state.db"), _worker(tmp_path / "state.db")
+    lead_id = first.ingest("proxycurl", [_lead("a")]).lead_ids[0]
+    revision = first.approvals.submit(lead_id, first.generate_message_draft(lead_id, CONTROLS))
+
+    second.refresh()
+    assert second.approvals.pending_count() == 1
+    second.approvals.review(revision.revision_id, "manager@acme.com", approve=True)
+    webhook = ProviderDeliveryEvent("msg-1", lead_id, "jane@acme.com", "Hi", DeliveryEventType.BOUNCED)
+    assert second.delivery.record_provider_events([webhook]).accepted == 1
+
+    first.refresh()
+    assert first.approvals.is_send_allowed(lead_id)
+    assert first.approvals.get(revision.revision_id).draft == revision.draft
+    assert first.delivery.is_suppressed("Jane@Acme.com")
+    assert first.delivery.record_provider_events([webhook]).duplicates == 1
+    sent = first.delivery.record_event(lead_id, OutboundChannel.EMAIL, "ops@acme.com", "Hi", DeliveryEventType.SENT)
+    assert sent.event_id == 2
+
+    first.erase_leads([lead_id], requested_by="dpo@acme.com")
+    second.refresh()
+    assert second.list_leads() == []
+    assert second.approvals.list_approvals() == []
+    assert second.delivery.list_events() == []
+    assert second.delivery.is_suppressed("jane@acme.com")
+    assert [event.payload["lead_id"] for event in second.audit.query(actions=["lead_deleted"])] == [lead_id]
+    assert second.audit.append("retention_policy_enforced", {}).event_id == 2
+
+
+def test_replayed_erasures_clear_the_other_workers_caches(tmp_path) -> None:
+    first, second = _worker(tmp_path / "state.db"), _worker(tmp_path / "state.db")
+    lead_id = first.ingest("proxycurl", [_lead("a")]).lead_ids[0]
+    second.refresh()
+    second.score_leads()
+    second.generate_message_draft(lead_id, CONTROLS)
+
+    first.erase_leads([lead_id], requested_by="dpo@acme.com")
+    second.refresh()
+    assert second.scorer.cache.stats().size == 0
+    assert lead_id not in second.draft_generator._evidence
+
+
+def test_one_worker_holds_a_lease_until_it_expires_or_is_released(tmp_path) -> None:
+    now = [1000.0]
+    first, second = (
+        SQLiteLease(SharedStateDatabase(tmp_path / "state.db"), "retention-sweeper", 60, clock=lambda: now[0])
+        for _ in range(2)
+    )
+
+    assert first.acquire() and first.acquire()
+    assert not second.acquire()
+    now[0] += 61
+    assert second.acquire()
+    assert not first.acquire()
+    second.release()
+    assert first.acquire()
+
+
+def test_separate_processes_never_reuse_lead_ids(tmp_path) -> None:
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_ingest_one_at_a_time, args=(tmp_path / "state.db", prefix, 20))
+        for prefix in ("x", "y")
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    assert [lead.id for lead in _worker(tmp_path / "state.db").list_leads()] == list(range(1, 41))
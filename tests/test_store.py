@@ -0,0 +1,98 @@
+import pytest
+
+from app.main import LeadIngestionService
+from app.messaging import MessageCTA, MessageGenerationControls, MessageTemplate, MessageTone
+from app.models import DataSource, DuplicatePolicy, InboundLead, normalize_profile_url
+from app.store import LeadFilter, LeadStore
+
+
+def _lead(name: str, company: str, slug: str) -> InboundLead:
+    return InboundLead(
+        full_name=name,
+        title="Head of Sales",
+        company=company,
+        profile_url=f"https://www.linkedin.com/in/{slug}",
+        source=DataSource.OFFICIAL_API,
+    )
+
+
+def test_store_indexes_by_id_profile_url_and_company() -> None:
+    store = LeadStore()
+    created = store.add_many(
+        [
+            _lead("Jane Doe", "Acme Inc", "jane-doe"),
+            _lead("John Smith", "Beta Labs", "john-smith"),
+            _lead("Ann Lee", "acme inc ", "ann-lee"),
+        ]
+    )
+
+    assert store.get(created[1].id) is created[1]
+    assert store.get(999) is None
+    assert store.get_many([created[2].id, 999, created[0].id]) == [created[2], created[0]]
+    assert store.get_by_profile_url("HTTPS://linkedin.com/in/Jane-Doe/?trk=x") is created[0]
+    assert [lead.full_name for lead in store.find_by_company("ACME INC")] == ["Jane Doe", "Ann Lee"]
+    assert store.find_by_company("Unknown") == []
+    assert len(store) == 3
+
+
+def test_company_scan_pages_stay_in_id_order_after_merges() -> None:
+    store = LeadStore()
+    store.add_many([_lead("Jane Doe", "Beta Labs", "jane-doe"), _lead("Ann Lee", "Acme Inc", "ann-lee")])
+    store.add_many([_lead("Bob Ray", "Acme Inc", "bob-ray")])
+    store.upsert_many([_lead("Jane Doe", "ACME Inc", "jane-doe")], DuplicatePolicy.MERGE)
+
+    acme = LeadFilter(company="acme inc")
+    first, cursor = store.scan(None, 2, acme)
+    rest, end = store.scan(cursor, 2, acme)
+
+    assert ([lead.id for lead in first], cursor) == ([1, 2], 2)
+    assert ([lead.id for lead in rest], end) == ([3], None)
+    assert store.scan(None, 2, LeadFilter(company="beta labs")) == ([], None)
+
+
+def test_normalize_profile_url() -> None:
+    assert normalize_profile_url("https://www.LinkedIn.com/in/jane/") == "linkedin.com/in/jane"
+    assert normalize_profile_url("http://linkedin.com/in/jane?utm=1#top") == "linkedin.com/in/jane"
+
+
+def test_generate_message_draft_looks_up_lead_by_id() -> None:
+    service = LeadIngestionService()
+    response = service.ingest(provider_name="proxycurl", leads=[_lead("Jane Doe", "Acme Inc", "jane-doe")])
+    controls = MessageGenerationControls(
+        tone=MessageTone.FRIENDLY,
+        template=MessageTemplate.INTRO,
+        cta=MessageCTA.REPLY,
+    )
+
+    draft = service.generate_message_draft(response.lead_ids[0], controls)
+
+    assert draft.subject == "Intro idea for Acme Inc"
+    assert draft.body.startswith("Hi Jane Doe,")
+    with pytest.raises(ValueError, match="not found"):
+        service.generate_message_draft(42, controls)
+
+
+def test_snapshots_are_copy_on_write_across_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("app.store.SNAPSHOT_CHUNK_SIZE", 4)
+    store = LeadStore()
+    created = store.add_many([_lead(f"Lead {index}", "Acme", f"lead-{index}") for index in range(10)])
+    before = store.snapshot()
+
+    store.add_many([_lead("Late Lead", "Beta", "late")])
+    store.upsert_many([_lead("Renamed", "Acme", "lead-5")], policy=DuplicatePolicy.MERGE)
+    store.remove_many([created[0].id, created[4].id, created[7].id])
+    after = store.snapshot()
+
+    assert before.leads() == created and len(before) == 10
+    assert after.version > before.version
+    assert after.leads() == store.list_all() == sorted(store.get_many(range(1, 12)), key=lambda lead: lead.id)
+    assert [lead.full_name for lead in after if lead.id == created[5].id] == ["Renamed"]
+
+    ids: list[int] = []
+    cursor = None
+    while True:
+        page, cursor = store.scan(cursor, max_rows=3)
+        ids.extend(lead.id for lead in page)
+        if cursor is None:
+            break
+    assert ids == [lead.id for lead in after]